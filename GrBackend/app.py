@@ -3,23 +3,65 @@ Product Video Service - Gradio Application
 """
 
 import functools
+import inspect
 import json
+import time
+from collections.abc import Generator
 from pathlib import Path
 from typing import Any
 
 import gradio as gr
 
 from src.blender_renderer import BlenderRenderer
+from src.composition import CompositionBuilder
 from src.config import (
+    DELIVERY_BASE_URL,
+    DELIVERY_DIRECTORY,
+    DELIVERY_ENABLED,
+    DELIVERY_HOST,
+    DELIVERY_LADDER,
+    DELIVERY_MAX_CONCURRENT_ENCODES,
+    DELIVERY_MAX_MB,
+    DELIVERY_PORT,
+    FFMPEG_APP,
     IS_DEBUG,
+    METRICS_HOST,
+    METRICS_PORT,
     PASSWORD,
+    RENDER_PREVIEW_FRAME_STEP,
+    RENDER_PREVIEW_RESOLUTION_PERCENTAGE,
+    RENDER_PREVIEW_SAMPLES,
+    RENDER_QUEUE_ENABLED,
+    RENDER_QUEUE_MAX_ATTEMPTS,
+    RENDER_QUEUE_MAX_FINISHED_JOBS,
+    RENDER_QUEUE_PATH,
+    RENDER_STORAGE_MAX_AGE_HOURS,
+    RENDER_STORAGE_MAX_MB,
+    RENDER_UPGRADE_TO_FINAL,
+    RENDER_UPLOAD_DIRECTORY,
+    RENDER_VIDEO_DIRECTORY,
     SERVICE_HOST,
     SERVICE_PORT,
+    TEMP_JANITOR_INTERVAL_SECONDS,
+    TEMP_MAX_AGE_HOURS,
+    THUMBNAIL_DIRECTORY,
+    THUMBNAIL_PREVIEW_DIRECTORY,
+    THUMBNAIL_SIZE,
     USERNAME,
 )
-from utils.color_utils import ColorUtils
+from src.metrics import start_metrics_server
+from src.render_client import QueueRenderClient
+from src.render_quality import with_render_quality
+from src.render_queue import SqliteRenderQueue
+from src.temp_janitor import TempDirectoryJanitor
+from src.thumbnails import ThumbnailStore
+from src.video_delivery import VideoDelivery, parse_ladder
+from src.video_server import start_video_server
+from utils.exceptions import BlenderProcessError
 from utils.logger import logger
 
+PROGRESS_POLL_INTERVAL = 0.5
+
 
 class MapsLoader:
     """Loader for movement and VFX maps."""
@@ -46,14 +88,18 @@ class VideoProcessor:
 
     def __init__(
         self,
-        blender_renderer: BlenderRenderer,
+        blender_renderer: BlenderRenderer | QueueRenderClient,
         maps_data: dict[str, Any],
+        video_delivery: VideoDelivery | None = None,
+        delivery_base_url: str = "",
     ):
-        with open("assets/assets.json") as f:
-            self.assets = json.load(f)
+        self.composition_builder = CompositionBuilder()
+        self.assets = self.composition_builder.assets
 
         self.blender_renderer = blender_renderer
         self.maps_data = maps_data
+        self.video_delivery = video_delivery
+        self.delivery_base_url = delivery_base_url.rstrip("/")
 
     def generate_video(
         self,
@@ -61,81 +107,173 @@ class VideoProcessor:
         movement_name: str,
         vfx_name: str,
         environment_color: str,
-    ) -> str:
+        upgrade_to_final: bool = False,
+    ) -> Generator[tuple[str, Any], None, None]:
         """
-        Generate video from input parameters.
+        Generate video from input parameters, streaming render progress.
+
+        A quick preview is rendered first; with `upgrade_to_final` the full
+        quality render is submitted together with it, so both render in the
+        background and the final video replaces the preview once it lands.
 
         Args:
             file_input: Uploaded GLB file
             prompt: Scene description prompt
             environment_color: Environment color
             rotation_direction: Clockwise or Counter-Clockwise rotation
+            upgrade_to_final: Render the final quality next to the preview
 
-        Returns:
-            Path to generated video file
+        Yields:
+            Progress text and, once finished, the path to the generated video
         """
         if not file_input:
             raise ValueError("No file uploaded")
 
-        movement_name = self.assets.get("Movement").get(movement_name[0].get("caption"))
-        vfx_name = self.assets.get("VFX").get(vfx_name[0].get("caption"))
+        movement_caption = movement_name[0].get("caption")
+        vfx_caption = vfx_name[0].get("caption")
         logger.debug("---Input Args---")
         logger.debug(file_input)
-        logger.debug(movement_name)
-        logger.debug(vfx_name)
+        logger.debug(movement_caption)
+        logger.debug(vfx_caption)
         logger.debug(environment_color)
         logger.debug("----------------")
 
-        composition_data = {
-            "MOVEMENT": {
-                "NAME": movement_name,
-                "SPEED": 1.2,
-                "INTERPOLATION": "None",
-                "ROTATION_DIRECTION": "CLOCKWISE",
-            },
-            "ENVIRONEMENT": {"BACKGOUND_COLOR": ColorUtils.to_hex(environment_color)},
-            "VFX_SHOT": {
-                "NAME": vfx_name,
-                "SPEED": 1.0,
-                "INTERPOLATION": "None",
-            },
-        }
+        composition_data = self.composition_builder.build(
+            movement_caption, vfx_caption, environment_color
+        )
+
+        # Both jobs are queued at once; the job manager bounds the Blender processes
+        preview_job_id = self._submit(
+            file_input, with_render_quality(composition_data, "PREVIEW"), "Preview"
+        )
+        if not upgrade_to_final:
+            preview_path = yield from self._wait(preview_job_id, "Preview")
+            yield from self._deliver(preview_path)
+            return
+        final_job_id = self._submit(
+            file_input, with_render_quality(composition_data, "FINAL"), "Final"
+        )
 
-        # Process video rendering
-        video_path = self.blender_renderer.render_video_from_glb(
+        try:
+            preview_path = yield from self._wait(preview_job_id, "Preview")
+        except Exception as e:
+            logger.warning(f"Preview render failed, waiting for the final one: {e}")
+        else:
+            yield "Preview ready · rendering final quality", preview_path
+
+        video_path = yield from self._wait(final_job_id, "Final")
+        yield from self._deliver(video_path)
+
+    def _submit(
+        self, file_input: str, composition_data: dict[str, Any], label: str
+    ) -> str:
+        """
+        Submit a render to the background jobs.
+
+        Returns:
+            ID of the render job
+        """
+        # Render in the background so the number of Blender processes stays bounded
+        job_id = self.blender_renderer.submit_render(
             glb_file_path=file_input, json_data=composition_data
         )
+        logger.info(f"Submitted {label.lower()} render job {job_id}")
+        return job_id
 
-        return video_path
+    def _wait(self, job_id: str, label: str) -> Generator[tuple[str, Any], None, str]:
+        """
+        Stream the progress of a render job until it finishes.
+
+        Returns:
+            Path of the rendered video
+        """
+        last_description = None
+        while self.blender_renderer.get_job_status(job_id) == "PENDING":
+            description = self.blender_renderer.get_job_progress(job_id).describe()
+            if description != last_description:
+                last_description = description
+                yield f"{label} · {description}", gr.update()
+            time.sleep(PROGRESS_POLL_INTERVAL)
+
+        return self.blender_renderer.get_job_result(job_id)
+
+    def _deliver(self, video_path: str) -> Generator[tuple[str, Any], None, None]:
+        """
+        Show a finished video right away, then swap in its delivery rendition
+        and links once the background encodes finish.
+        """
+        if self.video_delivery is None:
+            yield "Done", video_path
+            return
+
+        yield "Done · Preparing video for playback", video_path
+        try:
+            delivered = self.video_delivery.submit(video_path).result()
+        except (BlenderProcessError, OSError) as e:
+            logger.warning(f"Cannot prepare {video_path} for delivery: {e}")
+            yield "Done", gr.update()
+            return
+
+        links = ""
+        if self.delivery_base_url:
+            links = "".join(
+                f" · [{name}]({self.delivery_base_url}/videos/{path.name})"
+                for name, path in delivered.renditions.items()
+            )
+        yield f"Done{links}", str(delivered.primary)
 
 
 class GradioInterface:
     """Gradio interface component."""
 
-    def __init__(self, video_processor: VideoProcessor):
+    def __init__(
+        self,
+        video_processor: VideoProcessor,
+        thumbnail_store: ThumbnailStore,
+        thumbnail_base_url: str = "",
+    ):
         """
         Initializes the Gradio interface.
         Args:
             video_processor: An object with a 'generate_video' method.
+            thumbnail_store: Source of the preset thumbnails.
+            thumbnail_base_url: Public URL of the video server; without it
+                Gradio serves the thumbnails itself.
         """
 
         self.video_processor = video_processor
         self.assets = video_processor.assets
+        self.thumbnail_store = thumbnail_store
+        self.thumbnail_base_url = thumbnail_base_url.rstrip("/")
         self.interface = self._create_interface()
 
     def _sanitize_errors(self, func: callable) -> callable:
         """A wrapper to catch and sanitize exceptions for the Gradio UI."""
 
+        def sanitize(e: Exception) -> gr.Error:
+            logger.error(f"Gradio UI Error: {e}", exc_info=True)
+            # Sanitize the error message to remove local project paths
+            project_root = str(Path(__file__).parent)
+            sanitized_message = str(e).replace(project_root, "[PROJECT_ROOT]")
+            return gr.Error(sanitized_message)
+
+        if inspect.isgeneratorfunction(func):
+            # Generators raise while being iterated, so they need their own wrapper
+            @functools.wraps(func)
+            def generator_wrapper(*args, **kwargs):
+                try:
+                    yield from func(*args, **kwargs)
+                except Exception as e:
+                    raise sanitize(e) from e
+
+            return generator_wrapper
+
         @functools.wraps(func)
         def wrapper(*args, **kwargs):
             try:
                 return func(*args, **kwargs)
             except Exception as e:
-                logger.error(f"Gradio UI Error: {e}", exc_info=True)
-                # Sanitize the error message to remove local project paths
-                project_root = str(Path(__file__).parent)
-                sanitized_message = str(e).replace(project_root, "[PROJECT_ROOT]")
-                raise gr.Error(sanitized_message) from e
+                raise sanitize(e) from e
 
         return wrapper
 
@@ -165,25 +303,17 @@ class GradioInterface:
         footer { display: none !important; }
         """  # noqa: E501
 
-        # --- Define the presets and create placeholder image data ---
+        # --- Define the presets and their locally generated thumbnails ---
         animation_presets = self.assets.get("Movement", {}).items()
-        vfx_presets = self.assets.get("VFX", {}).keys()
+        vfx_presets = self.assets.get("VFX", {}).items()
 
-        # Generate placeholder images for the gallery
         animation_gallery_data = [
-            (
-                Path(__file__).parent
-                / f"assets/movement_thumbnails/{underscore_caps_name}.jpg",
-                name,
-            )
+            (self._thumbnail(underscore_caps_name, name), name)
             for name, underscore_caps_name in animation_presets
         ]
         vfx_gallery_data = [
-            (
-                f"https://placehold.co/128x128/2d3748/ffffff?text={p.replace(' ', '%0A')}",  # noqa: E501
-                p,
-            )
-            for p in vfx_presets
+            (self._thumbnail(underscore_caps_name, name), name)
+            for name, underscore_caps_name in vfx_presets
         ]
 
         # --- Build the Gradio Interface ---
@@ -193,6 +323,11 @@ class GradioInterface:
                 primary_hue="red", secondary_hue="neutral", neutral_hue="slate"
             ),
             css=custom_css,
+            # Gradio keeps its own copy of every returned video
+            delete_cache=(
+                int(TEMP_JANITOR_INTERVAL_SECONDS),
+                int(TEMP_MAX_AGE_HOURS * 3600),
+            ),
         ) as interface:
             gr.Markdown(
                 "# 3D Animation Studio "
@@ -220,6 +355,7 @@ class GradioInterface:
                         label="Generated Video",
                         elem_id="rendered_result",
                     )
+                    render_progress = gr.Markdown(elem_id="render_progress")
 
             # --- Middle Row: Controls ---
             with gr.Row(elem_id="settings_row"):
@@ -228,6 +364,17 @@ class GradioInterface:
                     value="#4c82f7",
                     elem_id="env_color_picker",
                 )
+                upgrade_to_final = gr.Checkbox(
+                    label="Upgrade to final quality",
+                    value=RENDER_UPGRADE_TO_FINAL,
+                    info=(
+                        "Unchecked, the result is a quick preview "
+                        f"({RENDER_PREVIEW_RESOLUTION_PERCENTAGE}% resolution, "
+                        f"{RENDER_PREVIEW_SAMPLES} samples, one frame in "
+                        f"{RENDER_PREVIEW_FRAME_STEP}); checked, the full quality "
+                        "video replaces it when done"
+                    ),
+                )
                 generate_button = gr.Button(
                     "Generate Video",
                     variant="primary",
@@ -292,12 +439,22 @@ class GradioInterface:
                     selected_animations,
                     selected_vfx,
                     environment_color,
+                    upgrade_to_final,
                 ],
-                outputs=output_video,
+                outputs=[render_progress, output_video],
+                # Render concurrency is bounded by the renderer's job manager
+                concurrency_limit=None,
             )
 
         return interface  # type: ignore[no-any-return]
 
+    def _thumbnail(self, code: str, caption: str) -> str:
+        """URL or file path of the thumbnail of a preset."""
+        if self.thumbnail_base_url:
+            thumbnail = self.thumbnail_store.get(code, caption)
+            return f"{self.thumbnail_base_url}/thumbnails/{thumbnail.file_name}"
+        return str(self.thumbnail_store.path(code, caption))
+
     def launch(self, **kwargs: dict[str, Any]) -> None:
         """Launch the Gradio interface."""
         self.interface.launch(**kwargs)  # type: ignore[arg-type]
@@ -308,14 +465,100 @@ class ProductVideoApp:
 
     def __init__(self) -> None:
         maps_loader = MapsLoader()
-        blender_renderer = BlenderRenderer()
-        video_processor = VideoProcessor(blender_renderer, maps_loader.maps_data)
-        self.interface = GradioInterface(video_processor)
+        # With the render queue, render nodes render and this process only serves
+        self.blender_renderer: BlenderRenderer | None = None
+        self.render_client: QueueRenderClient | None = None
+        self.storage_janitors: list[TempDirectoryJanitor] = []
+        renderer: BlenderRenderer | QueueRenderClient
+        if RENDER_QUEUE_ENABLED:
+            self.render_client = renderer = QueueRenderClient(
+                SqliteRenderQueue(
+                    RENDER_QUEUE_PATH,
+                    max_attempts=RENDER_QUEUE_MAX_ATTEMPTS,
+                    max_finished_jobs=RENDER_QUEUE_MAX_FINISHED_JOBS,
+                    max_age_seconds=RENDER_STORAGE_MAX_AGE_HOURS * 3600,
+                ),
+                upload_directory=RENDER_UPLOAD_DIRECTORY,
+                poll_seconds=PROGRESS_POLL_INTERVAL,
+            )
+            self.storage_janitors = [
+                TempDirectoryJanitor(
+                    directory,
+                    max_bytes=RENDER_STORAGE_MAX_MB * 1024 * 1024,
+                    max_age_seconds=RENDER_STORAGE_MAX_AGE_HOURS * 3600,
+                    name=name,
+                )
+                for name, directory in (
+                    ("Upload", RENDER_UPLOAD_DIRECTORY),
+                    ("Video", RENDER_VIDEO_DIRECTORY),
+                )
+            ]
+        else:
+            self.blender_renderer = renderer = BlenderRenderer()
+        self.video_delivery = (
+            VideoDelivery(
+                directory=DELIVERY_DIRECTORY,
+                max_bytes=DELIVERY_MAX_MB * 1024 * 1024,
+                ladder=parse_ladder(DELIVERY_LADDER),
+                ffmpeg_app=FFMPEG_APP,
+                max_concurrent_encodes=DELIVERY_MAX_CONCURRENT_ENCODES,
+            )
+            if DELIVERY_ENABLED
+            else None
+        )
+        video_processor = VideoProcessor(
+            renderer,
+            maps_loader.maps_data,
+            self.video_delivery,
+            DELIVERY_BASE_URL,
+        )
+        self.thumbnail_store = ThumbnailStore(
+            directory=THUMBNAIL_DIRECTORY,
+            preview_directories=[
+                THUMBNAIL_PREVIEW_DIRECTORY,
+                Path(__file__).parent / "assets" / "movement_thumbnails",
+            ],
+            size=THUMBNAIL_SIZE,
+        )
+        self.interface = GradioInterface(
+            video_processor,
+            self.thumbnail_store,
+            DELIVERY_BASE_URL if DELIVERY_PORT else "",
+        )
 
     def run(self) -> None:
         """Run the application."""
         launch_config = self._get_launch_config()
-        self.interface.launch(**launch_config)
+        metrics_server = (
+            start_metrics_server(METRICS_HOST, METRICS_PORT) if METRICS_PORT else None
+        )
+        video_server = (
+            start_video_server(
+                DELIVERY_HOST,
+                DELIVERY_PORT,
+                self.video_delivery.directory if self.video_delivery else None,
+                self.thumbnail_store,
+            )
+            if DELIVERY_PORT
+            else None
+        )
+        for storage_janitor in self.storage_janitors:
+            storage_janitor.start()
+        try:
+            if self.blender_renderer is not None:
+                self.blender_renderer.recover_interrupted_jobs()
+            self.interface.launch(**launch_config)
+        finally:
+            for storage_janitor in self.storage_janitors:
+                storage_janitor.stop()
+            if metrics_server is not None:
+                metrics_server.shutdown()
+            if video_server is not None:
+                video_server.shutdown()
+            if self.video_delivery is not None:
+                self.video_delivery.shutdown()
+            if self.blender_renderer is not None:
+                self.blender_renderer.shutdown()
 
     def _get_launch_config(self) -> dict[str, Any]:
         """Get launch configuration based on environment."""
@@ -326,6 +569,13 @@ class ProductVideoApp:
             "server_name": SERVICE_HOST,
             "show_api": False,
         }
+        allowed_paths = [str(self.thumbnail_store.directory)]
+        if self.video_delivery is not None:
+            allowed_paths.append(str(self.video_delivery.directory))
+        if self.render_client is not None:
+            # Only the videos: the uploads next to them are customers' models
+            allowed_paths.append(RENDER_VIDEO_DIRECTORY)
+        base_config["allowed_paths"] = allowed_paths
 
         if IS_DEBUG:
             base_config["share"] = True
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Product Video Service - Fake Blender
+
+Stands in for BLENDER_APP in benchmarks, so the backend's own overhead can be
+measured without Blender or minutes-long renders:
+
+    BLENDER_APP=benchmarks/fake_blender.py python app.py
+
+It follows the command line contract of `ProductVideo/scripts/process.py`:
+the options after `--` select the function, the composition JSON is read,
+the phase, scene_info and frame_timing events are printed, every frame gets
+a `Fra:` progress line, and the output video or frame images are written.
+The serve function speaks the warm worker protocol on stdin and stdout.
+
+Behaviour is set through the environment:
+
+    FAKE_BLENDER_FRAMES          frames of a full render (default 48)
+    FAKE_BLENDER_FRAME_SECONDS   render time per frame (default 0.02)
+    FAKE_BLENDER_STARTUP_SECONDS start-up time of the process (default 0.2)
+    FAKE_BLENDER_OUTPUT_BYTES    size of the written video (default 1048576)
+    FAKE_BLENDER_FAIL_RATE       share of renders that exit with an error
+    FAKE_BLENDER_HANG_RATE       share of renders that stop printing and hang
+    FAKE_BLENDER_SEED            seed of the failure and hang draws, which are
+                                 then the same for the same composition
+"""
+
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, NoReturn
+
+# Prefix of the machine-readable lines the backend picks out of Blender's stdout
+EVENT_PREFIX = "@@PRODUCTVIDEO"
+FRAME_PLACEHOLDER = "#####"
+SETUP_PHASES = ["import_animation", "import_object", "apply_movement", "apply_vfx"]
+
+FRAMES = int(os.getenv("FAKE_BLENDER_FRAMES", "48"))
+FRAME_SECONDS = float(os.getenv("FAKE_BLENDER_FRAME_SECONDS", "0.02"))
+STARTUP_SECONDS = float(os.getenv("FAKE_BLENDER_STARTUP_SECONDS", "0.2"))
+OUTPUT_BYTES = int(os.getenv("FAKE_BLENDER_OUTPUT_BYTES", str(1024 * 1024)))
+FAIL_RATE = float(os.getenv("FAKE_BLENDER_FAIL_RATE", "0"))
+HANG_RATE = float(os.getenv("FAKE_BLENDER_HANG_RATE", "0"))
+SEED = os.getenv("FAKE_BLENDER_SEED")
+
+
+class FakeRenderError(Exception):
+    """A render failure drawn by FAKE_BLENDER_FAIL_RATE."""
+
+
+def emit_event(event: str, **payload: Any) -> None:
+    """Print a single JSON event line for the backend."""
+    payload["event"] = event
+    print(f"{EVENT_PREFIX} {json.dumps(payload)}", flush=True)
+
+
+def parse_options(argv: list[str]) -> dict[str, str]:
+    """The `--name=value` options after `--`, as a dict."""
+    if "--" not in argv:
+        return {}
+    options = {}
+    for argument in argv[argv.index("--") + 1 :]:
+        name, _, value = argument.lstrip("-").partition("=")
+        options[name] = value
+    return options
+
+
+def frame_range(options: dict[str, str]) -> tuple[int, int]:
+    """First and last frame to render, honouring shard and preview options."""
+    if options.get("frame_start") and options.get("frame_end"):
+        return int(options["frame_start"]), int(options["frame_end"])
+    return 1, FRAMES
+
+
+def frame_step(composition: dict[str, Any]) -> int:
+    """Frame step of the composition's quality tier."""
+    quality = composition.get("QUALITY") or {}
+    if quality.get("TIER", "FINAL") == "FINAL":
+        return 1
+    return max(1, int(quality.get("FRAME_STEP", 1)))
+
+
+def hang() -> NoReturn:
+    """Stop printing and wait to be killed, like a stuck render."""
+    while True:
+        time.sleep(3600)
+
+
+def render(
+    glb_file_path: str,
+    json_file_path: str,
+    out_file_path: str,
+    first: int | None = None,
+    last: int | None = None,
+) -> None:
+    """
+    Pretend to render a composition into a video or a frame sequence.
+
+    Raises:
+        FakeRenderError: If the render was drawn to fail.
+    """
+    if not os.path.exists(glb_file_path):
+        raise FakeRenderError(f"GLB file not found: {glb_file_path}")
+    with open(json_file_path) as json_file:
+        composition_text = json_file.read()
+    step = frame_step(json.loads(composition_text))
+    first, last = first or 1, last or FRAMES
+    draws = random.Random(f"{SEED}:{composition_text}" if SEED else None)
+
+    for phase in SETUP_PHASES:
+        emit_event("phase", phase=phase)
+        emit_event("phase_timing", phase=phase, seconds=0.0, peak_memory_bytes=None)
+    emit_event(
+        "scene_info",
+        frame_start=1,
+        frame_end=FRAMES,
+        frame_step=step,
+        fps=24 / step,
+        resolution_x=1920,
+        resolution_y=1080,
+        resolution_percentage=100,
+    )
+    emit_event("phase", phase="render")
+
+    if draws.random() < HANG_RATE:
+        hang()
+    fails_at = None
+    if draws.random() < FAIL_RATE:
+        fails_at = draws.choice(range(first, last + 1, step))
+
+    started = time.perf_counter()
+    for frame in range(first, last + 1, step):
+        frame_file = None
+        if FRAME_PLACEHOLDER in out_file_path:
+            frame_file = out_file_path.replace(FRAME_PLACEHOLDER, f"{frame:05d}")
+            frame_file += ".png"
+            if os.path.exists(frame_file):
+                continue
+        if frame == fails_at:
+            raise FakeRenderError(f"Fake render failed at frame {frame}")
+
+        time.sleep(FRAME_SECONDS)
+        elapsed = time.perf_counter() - started
+        remaining = FRAME_SECONDS * (last - frame) / step
+        print(
+            f"Fra:{frame} Mem:512.00M (Peak 640.00M) | "
+            f"Time:00:{elapsed:05.2f} | Remaining:00:{remaining:05.2f} | "
+            f"Mem:0.00M, Peak:0.00M | Scene, ViewLayer | Sample 64/64",
+            flush=True,
+        )
+        emit_event(
+            "frame_timing",
+            frame=frame,
+            seconds=FRAME_SECONDS,
+            evaluation_seconds=0.0,
+            peak_memory_bytes=None,
+        )
+        if frame_file is not None:
+            with open(frame_file, "wb") as image_file:
+                image_file.write(b"\x89PNG\r\n\x1a\n")
+
+    if FRAME_PLACEHOLDER not in out_file_path:
+        with open(out_file_path, "wb") as video_file:
+            video_file.write(b"\0" * OUTPUT_BYTES)
+    emit_event("phase_timing", phase="render", seconds=0.0, peak_memory_bytes=None)
+    emit_event("phase", phase="done")
+
+
+def write_manifest(out_file_path: str) -> None:
+    """Write a manifest that accepts every composition."""
+    with open(out_file_path, "w") as manifest_file:
+        json.dump(
+            {
+                "actions": {},
+                "collections": [],
+                "materials": ["GRADIENT"],
+                "scene": {"frame_start": 1, "frame_end": FRAMES, "fps": 24},
+                "maps": None,
+            },
+            manifest_file,
+        )
+    emit_event("manifest", path=out_file_path)
+
+
+def serve() -> None:
+    """Render jobs read from stdin, like `process.py --function=serve`."""
+    emit_event("ready", pid=os.getpid())
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        command = job.get("command", "render")
+        if command == "ping":
+            emit_event("pong")
+            continue
+        if command == "shutdown":
+            break
+
+        try:
+            render(
+                job["glb_file_path"],
+                job["json_file_path"],
+                job["out_file_path"],
+                job.get("frame_start"),
+                job.get("frame_end"),
+            )
+        except (FakeRenderError, OSError, ValueError) as e:
+            emit_event(
+                "job_done", job_id=job.get("job_id"), status="FAILED", error=str(e)
+            )
+        else:
+            emit_event("job_done", job_id=job.get("job_id"), status="SUCCESS")
+
+
+def main() -> int:
+    """Main entry point."""
+    options = parse_options(sys.argv)
+    time.sleep(STARTUP_SECONDS)
+
+    function = options.get("function")
+    try:
+        if function == "process":
+            first, last = frame_range(options)
+            render(
+                options["glb_file_path"],
+                options["json_file_path"],
+                options["out_file_path"],
+                first,
+                last,
+            )
+        elif function == "scene_info":
+            with open(options["json_file_path"]) as json_file:
+                step = frame_step(json.load(json_file))
+            emit_event(
+                "scene_info", frame_start=1, frame_end=FRAMES, frame_step=step, fps=24
+            )
+        elif function == "manifest":
+            write_manifest(options["out_file_path"])
+        elif function == "decimate_glb":
+            with open(options["glb_file_path"], "rb") as glb_file:
+                data = glb_file.read()
+            with open(options["out_file_path"], "wb") as out_file:
+                out_file.write(data)
+        elif function == "serve":
+            serve()
+        else:
+            print(f"Unknown function: {function}", file=sys.stderr)
+            return 2
+    except (FakeRenderError, OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+"""
+Product Video Service - Render Overhead Benchmark
+
+Measures what the backend adds on top of Blender, and how renders behave
+under concurrency, without Blender:
+
+    python benchmarks/render_overhead.py --concurrency 1 2 4 8 --output now.json
+    python benchmarks/render_overhead.py --baseline now.json
+
+`render_video_from_glb` is called with distinct compositions from 1..N
+threads, with `benchmarks/fake_blender.py` as BLENDER_APP. The fake renders
+every frame in a fixed time, so the latency beyond that time is the overhead
+of the backend: process start-up, event parsing, metrics, the job store and
+file handling. Failure and hang modes exercise the error paths and the
+watchdog.
+
+Every concurrency level runs in a fresh interpreter, configured through the
+environment like the service, so its peak memory is its own. The results are
+written as JSON; with a baseline the p50 latency and throughput of every level
+are compared against it.
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+GRBACKEND_DIRECTORY = Path(__file__).resolve().parent.parent
+FAKE_BLENDER = Path(__file__).resolve().parent / "fake_blender.py"
+
+# Bump when the result format changes, so results are only compared if comparable
+RESULT_VERSION = 1
+PERCENTILES = (50, 90, 99)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Measure the render overhead of the backend with a fake Blender."
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, 8],
+        help="numbers of concurrent renders to measure",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="renders per concurrent thread at each level",
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=1, help="unmeasured renders before each level"
+    )
+    parser.add_argument(
+        "--warm-workers",
+        action="store_true",
+        help="render in a warm worker pool with one worker per concurrent render",
+    )
+    parser.add_argument(
+        "--frames", type=int, default=48, help="frames of each fake render"
+    )
+    parser.add_argument(
+        "--frame-seconds", type=float, default=0.02, help="fake render time per frame"
+    )
+    parser.add_argument(
+        "--startup-seconds",
+        type=float,
+        default=0.2,
+        help="fake start-up time of a Blender process",
+    )
+    parser.add_argument(
+        "--output-mb", type=float, default=1.0, help="size of each fake video"
+    )
+    parser.add_argument(
+        "--fail-rate", type=float, default=0.0, help="share of failing fake renders"
+    )
+    parser.add_argument(
+        "--hang-rate", type=float, default=0.0, help="share of hanging fake renders"
+    )
+    parser.add_argument(
+        "--stall-timeout",
+        type=float,
+        default=2.0,
+        help="seconds of silence after which a hanging render is killed",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="seed of the failure and hang draws"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="write the results as JSON"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=Path,
+        default=None,
+        help="results of an earlier run to compare against",
+    )
+    parser.add_argument("--run-level", type=int, default=None, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """Linearly interpolated percentile of a list of values."""
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values: list[float]) -> dict[str, float] | None:
+    """Mean, maximum and percentiles of a list of seconds."""
+    if not values:
+        return None
+    summary = {"mean": statistics.fmean(values), "max": max(values)}
+    for percent in PERCENTILES:
+        summary[f"p{percent}"] = percentile(values, percent)
+    return summary
+
+
+def intrinsic_seconds(args: argparse.Namespace) -> float:
+    """Time the fake Blender itself needs for a render."""
+    seconds: float = args.frames * args.frame_seconds
+    if not args.warm_workers:
+        seconds += args.startup_seconds
+    return seconds
+
+
+def level_environment(
+    args: argparse.Namespace, concurrency: int, directory: Path
+) -> dict[str, str]:
+    """
+    Environment of a level: the fake Blender, and every cache and state file in
+    a scratch directory, so runs neither share nor leave state behind.
+    """
+    base_file = directory / "base.blend"
+    base_file.write_bytes(b"BLENDER-v400")
+    return {
+        **os.environ,
+        "BLENDER_APP": str(FAKE_BLENDER),
+        "BLENDER_SCRIPT_FILE": str(FAKE_BLENDER),
+        "BLENDER_BASE_FILE": str(base_file),
+        "PRODUCTVIDEO_ADDON_DIR": str(directory / "productvideo"),
+        "BLENDER_WORKER_POOL_SIZE": str(concurrency if args.warm_workers else 0),
+        "BLENDER_RESOURCE_SLOTS": str(concurrency),
+        "RENDER_MAX_CONCURRENT_JOBS": str(concurrency),
+        "RENDER_SHARD_COUNT": "1",
+        "RENDER_STALL_TIMEOUT_SECONDS": str(args.stall_timeout),
+        "RENDER_CACHE_ENABLED": "False",
+        "TEMP_JANITOR_ENABLED": "False",
+        "RENDER_COST_MODEL_PATH": str(directory / "cost_model.json"),
+        "JOB_STORE_PATH": str(directory / "jobs.db"),
+        "IMPORT_CACHE_DIRECTORY": str(directory / "imports"),
+        "GLB_OPTIMIZER_CACHE_DIRECTORY": str(directory / "optimized"),
+        "BLEND_MANIFEST_DIRECTORY": str(directory / "manifests"),
+        "FAKE_BLENDER_FRAMES": str(args.frames),
+        "FAKE_BLENDER_FRAME_SECONDS": str(args.frame_seconds),
+        "FAKE_BLENDER_STARTUP_SECONDS": str(args.startup_seconds),
+        "FAKE_BLENDER_OUTPUT_BYTES": str(int(args.output_mb * 1024 * 1024)),
+        "FAKE_BLENDER_FAIL_RATE": str(args.fail_rate),
+        "FAKE_BLENDER_HANG_RATE": str(args.hang_rate),
+        "FAKE_BLENDER_SEED": str(args.seed),
+    }
+
+
+def write_product(file_path: Path) -> None:
+    """Write a GLB file with a single triangle as the product."""
+    from src.glb_optimizer import GlbDocument, write_glb
+
+    positions = b"".join(
+        value.to_bytes(4, "little")
+        for value in (0, 0, 0, 0x3F800000, 0, 0, 0, 0x3F800000, 0)
+    )
+    gltf = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}}]}],
+        "accessors": [
+            {
+                "bufferView": 0,
+                "componentType": 5126,
+                "count": 3,
+                "type": "VEC3",
+                "min": [0, 0, 0],
+                "max": [1, 1, 0],
+            }
+        ],
+        "bufferViews": [{"buffer": 0, "byteLength": len(positions)}],
+        "buffers": [{"byteLength": len(positions)}],
+    }
+    write_glb(file_path, GlbDocument(gltf, positions))
+
+
+def run_level(args: argparse.Namespace, concurrency: int) -> dict[str, Any]:
+    """
+    Render with the given number of threads; runs in the level's interpreter.
+    """
+    from src.blender_renderer import BlenderRenderer
+    from src.composition import CompositionBuilder
+    from utils.logger import logger
+
+    logger.remove()
+    logger.add(sys.stderr, level="ERROR")
+
+    builder = CompositionBuilder()
+    movement = next(iter(builder.movements))
+    vfx_shot = next(iter(builder.vfx_shots))
+    job_count = concurrency * args.jobs
+    # Distinct colors, so no render joins another one in flight
+    compositions = [
+        builder.build(movement, vfx_shot, f"#{index:06x}")
+        for index in range(args.warmup + job_count)
+    ]
+
+    glb_file_path = Path(os.environ["BLENDER_BASE_FILE"]).with_name("product.glb")
+    write_product(glb_file_path)
+    renderer = BlenderRenderer()
+
+    def render(json_data: dict[str, Any]) -> tuple[float, str | None]:
+        started = time.perf_counter()
+        try:
+            video_path = renderer.render_video_from_glb(str(glb_file_path), json_data)
+        except Exception as e:
+            return time.perf_counter() - started, type(e).__name__
+        Path(video_path).unlink(missing_ok=True)
+        return time.perf_counter() - started, None
+
+    try:
+        for json_data in compositions[: args.warmup]:
+            render(json_data)
+
+        tracemalloc.start()
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            outcomes = list(executor.map(render, compositions[args.warmup :]))
+        wall_seconds = time.perf_counter() - started
+        _, peak_traced_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    finally:
+        renderer.shutdown()
+
+    latencies = [seconds for seconds, error in outcomes if error is None]
+    errors: dict[str, int] = {}
+    for _, error in outcomes:
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+    intrinsic = intrinsic_seconds(args)
+    return {
+        "concurrency": concurrency,
+        "jobs": job_count,
+        "succeeded": len(latencies),
+        "failed": job_count - len(latencies),
+        "errors": errors,
+        "wall_seconds": wall_seconds,
+        "throughput_per_second": len(latencies) / wall_seconds,
+        "latency_seconds": summarize(latencies),
+        "overhead_seconds": summarize([seconds - intrinsic for seconds in latencies]),
+        "peak_traced_bytes": peak_traced_bytes,
+        # ru_maxrss is in KiB on Linux
+        "max_rss_bytes": rss_after * 1024,
+        "max_rss_growth_bytes": (rss_after - rss_before) * 1024,
+    }
+
+
+def measure_level(args: argparse.Namespace, concurrency: int) -> dict[str, Any]:
+    """Run a level in a fresh interpreter and return its results."""
+    command = [sys.executable, str(Path(__file__).resolve())]
+    for name, value in vars(args).items():
+        if name in ("concurrency", "output", "baseline", "run_level"):
+            continue
+        option = f"--{name.replace('_', '-')}"
+        if isinstance(value, bool):
+            command += [option] if value else []
+        else:
+            command += [option, str(value)]
+    command += ["--run-level", str(concurrency)]
+
+    with tempfile.TemporaryDirectory(prefix="render_overhead_") as directory:
+        completed = subprocess.run(
+            command,
+            cwd=GRBACKEND_DIRECTORY,
+            env=level_environment(args, concurrency, Path(directory)),
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+    if completed.returncode != 0:
+        raise RuntimeError(
+            f"Level {concurrency} failed:\n{completed.stderr.strip()[-2000:]}"
+        )
+    result: dict[str, Any] = json.loads(completed.stdout.strip().splitlines()[-1])
+    return result
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Print the change of every level against the same level of a baseline."""
+    if baseline.get("version") != RESULT_VERSION:
+        print(f"Baseline has result version {baseline.get('version')}, not compared")
+        return
+    differences = sorted(
+        name
+        for name, value in report["config"].items()
+        if name != "concurrency" and baseline["config"].get(name) != value
+    )
+    if differences:
+        print(f"Baseline was run with different {', '.join(differences)}")
+
+    results = report["results"]
+    baseline_levels = {level["concurrency"]: level for level in baseline["results"]}
+    print("change against baseline:")
+    for level in results:
+        before = baseline_levels.get(level["concurrency"])
+        if before is None or not before["latency_seconds"]:
+            continue
+        if not level["latency_seconds"]:
+            continue
+        p50_change = level["latency_seconds"]["p50"] / before["latency_seconds"]["p50"]
+        throughput_change = (
+            level["throughput_per_second"] / before["throughput_per_second"]
+        )
+        print(
+            f"    {level['concurrency']:>3} concurrent: "
+            f"p50 latency {(p50_change - 1) * 100:+6.1f} %, "
+            f"throughput {(throughput_change - 1) * 100:+6.1f} %"
+        )
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+    if args.run_level is not None:
+        sys.path.insert(0, str(GRBACKEND_DIRECTORY))
+        print(json.dumps(run_level(args, args.run_level)))
+        return 0
+
+    config = {
+        name: value
+        for name, value in vars(args).items()
+        if name not in ("output", "baseline", "run_level")
+    }
+    config["intrinsic_seconds"] = intrinsic_seconds(args)
+    report: dict[str, Any] = {
+        "benchmark": "render_overhead",
+        "version": RESULT_VERSION,
+        "config": config,
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": [],
+    }
+
+    print(
+        f"fake render: {config['intrinsic_seconds']:.2f} s, "
+        f"{args.jobs} renders per thread"
+    )
+    for concurrency in args.concurrency:
+        level = measure_level(args, concurrency)
+        report["results"].append(level)
+        latency = level["latency_seconds"] or {}
+        overhead = level["overhead_seconds"] or {}
+        print(
+            f"{concurrency:>3} concurrent: "
+            f"{level['throughput_per_second']:6.2f} renders/s, "
+            f"p50 {latency.get('p50', 0):6.3f} s, "
+            f"p99 {latency.get('p99', 0):6.3f} s, "
+            f"overhead p50 {overhead.get('p50', 0):6.3f} s, "
+            f"failed {level['failed']}, "
+            f"peak {level['peak_traced_bytes'] / 1024 / 1024:6.1f} MB traced, "
+            f"{level['max_rss_bytes'] / 1024 / 1024:6.1f} MB RSS"
+        )
+
+    if args.baseline is not None:
+        compare(report, json.loads(args.baseline.read_text()))
+    if args.output is not None:
+        args.output.write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Product Video Service - Start-up Benchmark
+
+Measures how long the service takes to become available after a restart:
+
+    python benchmarks/startup.py --import-budget-ms 1500 --first-request-budget 15
+
+Each entry point is imported in a fresh interpreter, and the heaviest of its
+imports are listed from `python -X importtime`. The time to first request is
+measured by starting app.py on a free local port and polling the UI until it
+answers. Configure the environment (Blender, .env) as in the deployment.
+
+The process exits with 1 when a median exceeds its budget, so the benchmark
+can gate changes that slow down the start-up.
+"""
+
+import argparse
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any
+
+GRBACKEND_DIRECTORY = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["app", "render_worker", "catalog", "src.blender_renderer"]
+
+IMPORT_SNIPPET = """
+import importlib, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+print(time.perf_counter() - start)
+"""
+
+POLL_INTERVAL_SECONDS = 0.05
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Measure the service start-up.")
+    parser.add_argument(
+        "--runs", type=int, default=5, help="measurements per entry point"
+    )
+    parser.add_argument(
+        "--modules",
+        nargs="+",
+        default=ENTRY_POINTS,
+        help="modules to time the import of",
+    )
+    parser.add_argument(
+        "--top", type=int, default=8, help="heaviest imports to list per module"
+    )
+    parser.add_argument(
+        "--import-budget-ms",
+        type=float,
+        default=0.0,
+        help="fail if the median import of a module takes longer (0: no budget)",
+    )
+    parser.add_argument(
+        "--first-request-budget",
+        type=float,
+        default=0.0,
+        help="fail if the median time to first request is longer, in seconds "
+        "(0: no budget)",
+    )
+    parser.add_argument(
+        "--first-request-timeout",
+        type=float,
+        default=120.0,
+        help="give up on a start of the service after this many seconds",
+    )
+    parser.add_argument(
+        "--skip-first-request",
+        action="store_true",
+        help="only measure the imports",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=None, help="write the results as JSON"
+    )
+    return parser.parse_args()
+
+
+def time_import(module: str) -> float:
+    """Seconds a fresh interpreter spends importing a module."""
+    completed = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET, module],
+        cwd=GRBACKEND_DIRECTORY,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Cannot import {module}:\n{completed.stderr.strip()}")
+    return float(completed.stdout.strip().splitlines()[-1])
+
+
+def heaviest_imports(module: str, top: int) -> list[tuple[str, float]]:
+    """Direct imports of a module with the longest cumulative import times."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=GRBACKEND_DIRECTORY,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1 and cumulative.strip().isdigit():
+            imports.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(imports, key=lambda item: item[1], reverse=True)[:top]
+
+
+def free_port() -> int:
+    """A local TCP port nothing listens on."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def time_to_first_request(timeout: float) -> float:
+    """
+    Seconds from starting the service to its first answered HTTP request.
+    """
+    port = free_port()
+    environment = {
+        **os.environ,
+        "SERVICE_HOST": "127.0.0.1",
+        "SERVICE_PORT": str(port),
+        # No public share link, and no clashes with a running service
+        "GRADIO_DEBUG": "False",
+        "USERNAME": os.getenv("USERNAME", "benchmark"),
+        "PASSWORD": os.getenv("PASSWORD", "benchmark"),
+        "METRICS_PORT": "0",
+        "DELIVERY_PORT": "0",
+    }
+    url = f"http://127.0.0.1:{port}/"
+
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "app.py"],
+        cwd=GRBACKEND_DIRECTORY,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"app.py exited with {process.returncode}")
+            try:
+                urllib.request.urlopen(url, timeout=1).close()
+            except urllib.error.HTTPError:
+                pass  # Any answer counts, including the login page's
+            except OSError:
+                time.sleep(POLL_INTERVAL_SECONDS)
+                continue
+            return time.perf_counter() - start
+        raise RuntimeError(f"app.py did not answer within {timeout:.0f} s")
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+    results: dict[str, Any] = {"imports": {}, "first_request": None}
+    over_budget = []
+
+    for module in args.modules:
+        times = [time_import(module) for _ in range(args.runs)]
+        median = statistics.median(times)
+        heaviest = heaviest_imports(module, args.top)
+        results["imports"][module] = {
+            "median_seconds": median,
+            "seconds": times,
+            "heaviest": dict(heaviest),
+        }
+        print(f"import {module}: {median * 1000:.0f} ms (median of {args.runs})")
+        for name, seconds in heaviest:
+            print(f"    {name:<40} {seconds * 1000:8.1f} ms")
+        if args.import_budget_ms and median * 1000 > args.import_budget_ms:
+            over_budget.append(f"import {module}")
+
+    if not args.skip_first_request:
+        times = [
+            time_to_first_request(args.first_request_timeout) for _ in range(args.runs)
+        ]
+        median = statistics.median(times)
+        results["first_request"] = {"median_seconds": median, "seconds": times}
+        print(f"first request: {median:.2f} s (median of {args.runs})")
+        if args.first_request_budget and median > args.first_request_budget:
+            over_budget.append("first request")
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Product Video Service - Catalog Renderer
+
+Renders every row of a CSV or JSON Lines manifest without the Gradio UI:
+
+    python catalog.py manifest.csv --output-dir renders/ --workers 4
+
+Manifest columns: glb_file_path, movement, vfx, color and an optional id.
+Movement and VFX use the preset captions shown in the UI.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+from src.blender_renderer import BlenderRenderer
+from src.catalog import CatalogRenderer, read_manifest, validate_manifest
+from src.composition import CompositionBuilder
+from src.config import RENDER_MAX_CONCURRENT_JOBS
+from utils.exceptions import ManifestError
+from utils.logger import logger
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Render a product catalog.")
+    parser.add_argument("manifest", type=Path, help="CSV or JSONL manifest")
+    parser.add_argument(
+        "--output-dir",
+        type=Path,
+        default=Path("catalog_output"),
+        help="directory for the rendered videos",
+    )
+    parser.add_argument(
+        "--results",
+        type=Path,
+        default=None,
+        help="results index (default: <output-dir>/results.jsonl)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=RENDER_MAX_CONCURRENT_JOBS,
+        help="number of renders running in parallel",
+    )
+    parser.add_argument(
+        "--quality",
+        choices=["PREVIEW", "FINAL"],
+        default="FINAL",
+        help="render quality tier",
+    )
+    parser.add_argument(
+        "--validate-only",
+        action="store_true",
+        help="only validate the manifest",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+
+    blender_renderer = BlenderRenderer()
+    try:
+        try:
+            items = validate_manifest(
+                read_manifest(args.manifest),
+                CompositionBuilder(),
+                args.quality,
+                blender_renderer,
+            )
+        except ManifestError as e:
+            logger.error(f"{e}:\n" + "\n".join(e.errors))
+            return 2
+        except (OSError, ValueError) as e:
+            logger.error(f"Cannot read manifest {args.manifest}: {e}")
+            return 2
+
+        logger.info(f"Manifest {args.manifest} is valid: {len(items)} items")
+        if args.validate_only:
+            return 0
+
+        catalog_renderer = CatalogRenderer(
+            blender_renderer,
+            output_directory=args.output_dir,
+            results_path=args.results or args.output_dir / "results.jsonl",
+            workers=args.workers,
+        )
+        results = catalog_renderer.run(items)
+    finally:
+        blender_renderer.shutdown()
+
+    failed = [result for result in results if result.status != "SUCCESS"]
+    logger.info(
+        f"Catalog finished: {len(results) - len(failed)} rendered, {len(failed)} failed"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+"""
+Product Video Service - Render Worker Agent
+
+Renders jobs from the shared render queue on this machine:
+
+    python render_worker.py --queue /shared/render_queue.db --video-dir /shared/videos
+
+Start one agent per render node, and the web tier with RENDER_QUEUE_ENABLED=True
+so it enqueues renders instead of running Blender. Every node needs Blender, the
+ProductVideo scripts and access to the queue and the storage directory, under the
+same paths as the web tier, which copies uploads to RENDER_UPLOAD_DIRECTORY.
+SIGTERM and SIGINT stop the agent after the job in progress.
+"""
+
+import argparse
+import signal
+import sys
+from pathlib import Path
+from types import FrameType
+
+from src.blender_renderer import BlenderRenderer
+from src.config import (
+    RENDER_QUEUE_MAX_ATTEMPTS,
+    RENDER_QUEUE_MAX_FINISHED_JOBS,
+    RENDER_QUEUE_PATH,
+    RENDER_STORAGE_MAX_AGE_HOURS,
+    RENDER_VIDEO_DIRECTORY,
+    RENDER_WORKER_HEARTBEAT_SECONDS,
+    RENDER_WORKER_LEASE_SECONDS,
+    RENDER_WORKER_POLL_SECONDS,
+)
+from src.render_agent import RenderWorkerAgent
+from src.render_queue import SqliteRenderQueue
+
+
+def parse_args() -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Render jobs from the render queue.")
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        default=Path(RENDER_QUEUE_PATH),
+        help="SQLite render queue database",
+    )
+    parser.add_argument(
+        "--video-dir",
+        type=Path,
+        default=Path(RENDER_VIDEO_DIRECTORY),
+        help="shared directory for the rendered videos",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="name of this worker in the queue (default: <hostname>-<pid>)",
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=None,
+        help="exit after taking this many jobs",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    """Main entry point."""
+    args = parse_args()
+
+    render_queue = SqliteRenderQueue(
+        args.queue,
+        max_attempts=RENDER_QUEUE_MAX_ATTEMPTS,
+        max_finished_jobs=RENDER_QUEUE_MAX_FINISHED_JOBS,
+        max_age_seconds=RENDER_STORAGE_MAX_AGE_HOURS * 3600,
+    )
+    blender_renderer = BlenderRenderer()
+    agent = RenderWorkerAgent(
+        render_queue,
+        blender_renderer,
+        storage_directory=args.video_dir,
+        worker_id=args.worker_id,
+        lease_seconds=RENDER_WORKER_LEASE_SECONDS,
+        heartbeat_seconds=RENDER_WORKER_HEARTBEAT_SECONDS,
+        poll_seconds=RENDER_WORKER_POLL_SECONDS,
+    )
+
+    def stop(signum: int, frame: FrameType | None) -> None:
+        agent.stop()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    try:
+        agent.run(max_jobs=args.max_jobs)
+    finally:
+        blender_renderer.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+"""
+Blend Manifest Module
+
+This module checks compositions against the base .blend file without
+starting Blender. Blender writes a manifest of the file's actions with their
+frame ranges, its collections and materials, and the preset maps of the
+add-on once per version of the file; the manifest is cached on disk by the
+hash of the file and the add-on's maps. The add-on's operators skip presets
+whose action or collection is missing, so without this check a broken preset
+would only show as a render without its movement or effect. Extraction
+starts Blender, so it runs in the background at start-up and requests are not
+checked until the manifest is ready.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.file_handler import FileHandler
+from src.single_flight import SingleFlight
+from utils.exceptions import BlenderProcessError, FileHandlerError
+from utils.logger import logger
+
+# Bump when the manifest changes, so older manifests are extracted again
+MANIFEST_VERSION = 1
+
+# VFX shots that intentionally show no collection
+NO_VFX_SHOTS = frozenset({"VFX_NONE", "None"})
+# Materials the movement operator writes the environment color to
+REQUIRED_MATERIALS = frozenset({"GRADIENT"})
+
+# Writes the manifest of a .blend file to a JSON file
+ExtractFunction = Callable[[Path, Path], None]
+
+
+@dataclass(frozen=True)
+class BlendManifest:
+    """What a base .blend file provides to compositions."""
+
+    actions: dict[str, tuple[float, float]]
+    collections: frozenset[str]
+    materials: frozenset[str]
+    frame_start: int
+    frame_end: int
+    fps: float
+    movement_actions: dict[str, dict[str, str | None]] | None = None
+    vfx_collections: dict[str, str] | None = None
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "BlendManifest":
+        """
+        Build a manifest from the JSON written by Blender.
+
+        Raises:
+            ValueError: If a field is missing or malformed.
+        """
+        try:
+            maps = data.get("maps") or {}
+            return cls(
+                actions={
+                    name: (float(frame_range[0]), float(frame_range[1]))
+                    for name, frame_range in data["actions"].items()
+                },
+                collections=frozenset(data["collections"]),
+                materials=frozenset(data["materials"]),
+                frame_start=int(data["scene"]["frame_start"]),
+                frame_end=int(data["scene"]["frame_end"]),
+                fps=float(data["scene"]["fps"]),
+                movement_actions=maps.get("MOVEMENT_ACTION_MAP"),
+                vfx_collections=maps.get("VFX_COLLECTION_MAP"),
+            )
+        except (KeyError, TypeError, IndexError, AttributeError) as e:
+            raise ValueError(f"Malformed blend manifest: {e!r}") from e
+
+    def validate(self, json_data: dict[str, Any]) -> list[str]:
+        """
+        Problems that would keep a composition from rendering as intended.
+
+        Returns:
+            One message per problem; empty if the composition is fine.
+        """
+        errors = [
+            f"Material {name!r} is missing from the base .blend file"
+            for name in sorted(REQUIRED_MATERIALS - self.materials)
+        ]
+
+        movement = str((json_data.get("MOVEMENT") or {}).get("NAME") or "")
+        if self.movement_actions is not None:
+            roles = self.movement_actions.get(movement)
+            if roles is None:
+                errors.append(f"Movement {movement!r} is not in the add-on's maps")
+            else:
+                for role, action in sorted(roles.items()):
+                    if action and action not in self.actions:
+                        errors.append(
+                            f"{role.title()} action {action!r} of movement "
+                            f"{movement!r} is missing from the base .blend file"
+                        )
+
+        vfx_shot = str((json_data.get("VFX_SHOT") or {}).get("NAME") or "")
+        if self.vfx_collections is not None:
+            collection = self.vfx_collections.get(vfx_shot)
+            if collection is None:
+                errors.append(f"VFX shot {vfx_shot!r} is not in the add-on's maps")
+            elif vfx_shot not in NO_VFX_SHOTS and collection not in self.collections:
+                errors.append(
+                    f"Collection {collection!r} of VFX shot {vfx_shot!r} is missing "
+                    "from the base .blend file"
+                )
+        return errors
+
+
+class BlendManifestStore:
+    """
+    Extracts and caches the manifests of .blend files.
+    """
+
+    def __init__(
+        self,
+        cache_directory: str | Path,
+        extract_function: ExtractFunction,
+        addon_maps_path: str | Path | None = None,
+    ) -> None:
+        self.cache_directory = Path(cache_directory)
+        self.extract_function = extract_function
+        self.addon_maps_path = Path(addon_maps_path) if addon_maps_path else None
+        self._manifests: dict[tuple[Any, ...], BlendManifest] = {}
+        self._failures: dict[tuple[Any, ...], str] = {}
+        self._loading: set[tuple[Any, ...]] = set()
+        self._lock = threading.Lock()
+        self._single_flight: SingleFlight[BlendManifest] = SingleFlight()
+
+    def get(self, blend_file_path: str | Path) -> BlendManifest:
+        """
+        The manifest of a .blend file, extracting it with Blender if needed.
+
+        A failed extraction is not retried until the file changes.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the manifest cannot be extracted.
+        """
+        blend_path = Path(blend_file_path)
+        version, manifest = self._lookup(blend_path)
+        if manifest is not None:
+            return manifest
+
+        try:
+            manifest = self._single_flight.do(
+                str(version), lambda: self._load(blend_path)
+            )
+        except ValueError as e:
+            logger.warning(f"{e}; compositions are not checked until it changes")
+            with self._lock:
+                self._failures[version] = str(e)
+            raise
+        with self._lock:
+            self._manifests[version] = manifest
+        return manifest
+
+    def get_if_ready(self, blend_file_path: str | Path) -> BlendManifest | None:
+        """
+        The manifest of a .blend file if it was extracted already.
+
+        Otherwise the extraction is started in the background and None is
+        returned, so callers never wait for Blender.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the manifest could not be extracted.
+        """
+        blend_path = Path(blend_file_path)
+        version, manifest = self._lookup(blend_path)
+        if manifest is None:
+            self._start_loading(version, blend_path)
+        return manifest
+
+    def prefetch(self, blend_file_path: str | Path) -> None:
+        """Extract the manifest of a .blend file in the background."""
+        blend_path = Path(blend_file_path)
+        try:
+            version, manifest = self._lookup(blend_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Not extracting the manifest of {blend_path}: {e}")
+            return
+        if manifest is None:
+            self._start_loading(version, blend_path)
+
+    def _lookup(self, blend_path: Path) -> tuple[tuple[Any, ...], BlendManifest | None]:
+        """
+        Version of a file and its manifest, if already loaded.
+
+        Raises:
+            OSError: If the file cannot be read.
+            ValueError: If the manifest of this version could not be extracted.
+        """
+        version = (*self._file_version(blend_path), *self._maps_version())
+        with self._lock:
+            manifest = self._manifests.get(version)
+            failure = self._failures.get(version)
+        if manifest is None and failure is not None:
+            raise ValueError(failure)
+        return version, manifest
+
+    def _start_loading(self, version: tuple[Any, ...], blend_path: Path) -> None:
+        """Load a manifest on a background thread unless one already does."""
+        with self._lock:
+            if version in self._loading:
+                return
+            self._loading.add(version)
+
+        def load() -> None:
+            try:
+                self.get(blend_path)
+            except (OSError, ValueError) as e:
+                logger.debug(f"Background manifest extraction failed: {e}")
+            finally:
+                with self._lock:
+                    self._loading.discard(version)
+
+        threading.Thread(target=load, name="blend-manifest", daemon=True).start()
+
+    def _load(self, blend_path: Path) -> BlendManifest:
+        """Read the cached manifest of a file, extracting it first if needed."""
+        try:
+            file_hash = FileHandler.compute_file_hash(blend_path)
+            maps_hash = self._maps_hash()
+        except FileHandlerError as e:
+            raise ValueError(f"Cannot hash {blend_path}: {e}") from e
+        key = hashlib.sha256(
+            f"{file_hash}:{maps_hash}:{MANIFEST_VERSION}".encode()
+        ).hexdigest()[:32]
+        manifest_path = self.cache_directory / f"{key}.json"
+
+        if not manifest_path.exists():
+            self.cache_directory.mkdir(parents=True, exist_ok=True)
+            staging = manifest_path.with_name(f".{key}.tmp.json")
+            try:
+                self.extract_function(blend_path, staging)
+                if not staging.exists():
+                    raise ValueError("Blender did not write the blend manifest")
+                staging.replace(manifest_path)
+            except (BlenderProcessError, OSError) as e:
+                raise ValueError(
+                    f"Cannot extract the manifest of {blend_path}: {e}"
+                ) from e
+            finally:
+                staging.unlink(missing_ok=True)
+            logger.info(f"Extracted the manifest of {blend_path} to {manifest_path}")
+
+        try:
+            data = json.loads(manifest_path.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            manifest_path.unlink(missing_ok=True)
+            raise ValueError(f"Cannot read blend manifest {manifest_path}: {e}") from e
+        return BlendManifest.from_json(data)
+
+    @staticmethod
+    def _file_version(path: Path) -> tuple[str, int, int]:
+        """Identity of a version of a file, without reading it."""
+        file_stat = os.stat(path)
+        return str(path), file_stat.st_size, file_stat.st_mtime_ns
+
+    def _maps_version(self) -> tuple[str, int, int] | tuple[()]:
+        """Identity of the add-on's maps, which the manifest includes."""
+        if self.addon_maps_path is None or not self.addon_maps_path.is_file():
+            return ()
+        return self._file_version(self.addon_maps_path)
+
+    def _maps_hash(self) -> str:
+        """Content hash of the add-on's maps, if there are any."""
+        if self.addon_maps_path is None or not self.addon_maps_path.is_file():
+            return ""
+        return FileHandler.compute_file_hash(self.addon_maps_path)
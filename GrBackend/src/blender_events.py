@@ -0,0 +1,38 @@
+"""
+Blender Events Module
+
+This module parses the machine-readable event lines that
+`ProductVideo/scripts/process.py` prints to stdout next to Blender's own output.
+Every event line is the `BLENDER_EVENT_PREFIX` followed by a JSON object with
+an "event" key.
+"""
+
+import json
+from typing import Any
+
+BLENDER_EVENT_PREFIX = "@@PRODUCTVIDEO"
+
+BlenderEvent = dict[str, Any]
+
+
+def parse_blender_event(line: str) -> BlenderEvent | None:
+    """
+    Parse a Blender stdout line into an event.
+
+    Args:
+        line: A single line of Blender output.
+
+    Returns:
+        The decoded event, or None if the line is not a valid event line.
+    """
+    if not line.startswith(BLENDER_EVENT_PREFIX):
+        return None
+
+    try:
+        event = json.loads(line[len(BLENDER_EVENT_PREFIX) :])
+    except json.JSONDecodeError:
+        return None
+
+    if not isinstance(event, dict) or "event" not in event:
+        return None
+    return event
@@ -0,0 +1,85 @@
+"""
+Blender Output Module
+
+This module captures the output of one Blender run without logging every
+line. Cycles prints several status lines per frame, so progress lines are
+sampled down to one every N frames, other output is logged up to a limit,
+and the last lines are kept in a ring buffer that is dumped only when the run
+fails.
+"""
+
+from collections import deque
+
+from src.blender_events import BLENDER_EVENT_PREFIX
+from src.render_progress import FRAME_PATTERN
+from utils.logger import logger
+
+
+class BlenderOutputLog:
+    """
+    Bounded, sampled log of a single Blender run.
+    """
+
+    def __init__(
+        self,
+        label: str,
+        tail_lines: int = 200,
+        frame_interval: int = 10,
+        max_logged_lines: int = 200,
+    ) -> None:
+        self.label = label
+        self.frame_interval = max(1, frame_interval)
+        self.max_logged_lines = max_logged_lines
+
+        self.lines_seen = 0
+        self.lines_logged = 0
+        self._tail: deque[str] = deque(maxlen=tail_lines)
+        self._last_logged_frame: int | None = None
+        self._other_lines_logged = 0
+
+    def record(self, line: str) -> None:
+        """Keep a line in the tail and log it if it passes sampling."""
+        self.lines_seen += 1
+        self._tail.append(line)
+
+        if line.startswith(BLENDER_EVENT_PREFIX):
+            logger.debug(f"{self.label}: {line}")
+            return
+
+        frame_match = FRAME_PATTERN.match(line)
+        if frame_match:
+            frame = int(frame_match.group(1))
+            if (
+                self._last_logged_frame is None
+                or frame < self._last_logged_frame
+                or frame - self._last_logged_frame >= self.frame_interval
+            ):
+                self._last_logged_frame = frame
+                self._log(line)
+            return
+
+        if self._other_lines_logged < self.max_logged_lines:
+            self._other_lines_logged += 1
+            self._log(line)
+            if self._other_lines_logged == self.max_logged_lines:
+                logger.info(f"{self.label}: output limit reached, logging stopped")
+
+    def summarize(self) -> None:
+        """Log how much output the run produced."""
+        logger.info(
+            f"{self.label}: {self.lines_seen} output lines, "
+            f"{self.lines_seen - self.lines_logged} not logged"
+        )
+
+    def dump_tail(self, reason: object) -> None:
+        """Log the buffered tail of the output after a failure."""
+        tail = "\n".join(self._tail)
+        logger.error(
+            f"{self.label} failed: {reason}\n"
+            f"Last {len(self._tail)} of {self.lines_seen} output lines:\n{tail}"
+        )
+
+    def _log(self, line: str) -> None:
+        """Write a line to the application log."""
+        self.lines_logged += 1
+        logger.info(f"{self.label}: {line}")
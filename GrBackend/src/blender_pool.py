@@ -0,0 +1,427 @@
+"""
+Blender Worker Pool Module
+
+This module keeps a set of warm Blender processes running `process.py` in
+server mode, so a render no longer pays Blender start-up and add-on
+registration. Jobs are written to a worker's stdin as JSON lines and the
+worker's stdout is streamed back until the worker reports the job as done.
+Workers are health-checked before every job and recycled after a configurable
+number of jobs or once their resident memory grows past a threshold. Each
+worker slot can carry a resource profile pinning its CPUs and capping memory.
+"""
+
+import json
+import queue
+import subprocess
+import threading
+import time
+import uuid
+from collections.abc import Callable, Generator, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from src.blender_events import BlenderEvent, parse_blender_event
+from src.blender_output import BlenderOutputLog
+from src.render_watchdog import RenderWatchdog, kill_process_group
+from src.resource_profile import ResourceProfile
+from utils.exceptions import BlenderProcessError, BlenderProcessTimeoutError
+from utils.logger import logger
+
+WORKER_STOP_TIMEOUT = 10.0
+
+
+class BlenderWorker:
+    """
+    A single long-lived Blender process running `process.py` in server mode.
+
+    Output is read by a background thread into a queue, so waiting for an
+    event can be bounded by a timeout.
+    """
+
+    def __init__(
+        self,
+        slot: int,
+        command: list[str],
+        resource_profile: ResourceProfile | None = None,
+    ) -> None:
+        self.slot = slot
+        self.command = command
+        self.resource_profile = resource_profile
+        self.jobs_completed = 0
+        self.busy = False
+        self._process: subprocess.Popen[str] | None = None
+        self._lines: queue.Queue[str | None] = queue.Queue()
+
+    @property
+    def pid(self) -> int | None:
+        """Process id of the Blender worker, if started."""
+        return self._process.pid if self._process else None
+
+    def is_alive(self) -> bool:
+        """Check whether the Blender process is still running."""
+        return self._process is not None and self._process.poll() is None
+
+    def start(self, timeout: float) -> None:
+        """
+        Launch Blender and wait until the script reports it is ready.
+        """
+        logger.info(f"🔥 Starting Blender worker {self.slot}...")
+        logger.debug(f"Command: {' '.join(self.command)}")
+
+        try:
+            self._process = subprocess.Popen(
+                self.command,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                bufsize=1,
+                start_new_session=True,
+            )
+        except FileNotFoundError as e:
+            raise BlenderProcessError(
+                f"Blender executable not found: {self.command[0]}"
+            ) from e
+
+        if self.resource_profile is not None:
+            self.resource_profile.apply(self._process.pid)
+
+        threading.Thread(
+            target=self._read_output,
+            name=f"blender-worker-{self.slot}",
+            daemon=True,
+        ).start()
+
+        try:
+            self._wait_for("ready", timeout)
+        except BlenderProcessError:
+            self.stop()
+            raise
+
+        logger.info(f"Blender worker {self.slot} ready (pid {self.pid})")
+
+    def stop(self) -> None:
+        """Ask the worker to shut down, killing it if it does not comply."""
+        process = self._process
+        if process is None or process.poll() is not None:
+            return
+
+        try:
+            self._send({"command": "shutdown"})
+            process.wait(timeout=WORKER_STOP_TIMEOUT)
+        except (BlenderProcessError, subprocess.TimeoutExpired):
+            logger.warning(f"Killing unresponsive Blender worker {self.slot}")
+            kill_process_group(process)
+
+    def ping(self, timeout: float) -> bool:
+        """Health-check the worker with a ping/pong round trip."""
+        if not self.is_alive() or self.busy:
+            return False
+        try:
+            self._wait_for("pong", timeout, request={"command": "ping"})
+            return True
+        except BlenderProcessError as e:
+            logger.warning(f"Blender worker {self.slot} failed health check: {e}")
+            return False
+
+    def rss_bytes(self) -> int | None:
+        """
+        Resident memory of the worker, read from /proc (None where unavailable).
+        """
+        if not self.is_alive():
+            return None
+        try:
+            status = Path(f"/proc/{self.pid}/status").read_text()
+        except OSError:
+            return None
+        for line in status.splitlines():
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+        return None
+
+    def run_job(
+        self,
+        job: dict[str, Any],
+        watchdog: RenderWatchdog | None = None,
+        output_log: BlenderOutputLog | None = None,
+    ) -> Generator[str, None, None]:
+        """
+        Send a render job to the worker and yield its output lines.
+
+        A worker that trips the watchdog is killed; the pool replaces it.
+        """
+        job_id = job.setdefault("job_id", uuid.uuid4().hex)
+
+        self.busy = True
+        try:
+            self._send({"command": "render", **job})
+            event = yield from self._read_until(
+                "job_done", None, job_id, watchdog, output_log
+            )
+        except BlenderProcessError as e:
+            if output_log is not None:
+                output_log.dump_tail(e)
+            raise
+        self.busy = False
+        self.jobs_completed += 1
+
+        if event.get("status") != "SUCCESS":
+            error = BlenderProcessError(
+                f"Blender worker {self.slot} failed job {job_id}: {event.get('error')}"
+            )
+            if output_log is not None:
+                output_log.dump_tail(error)
+            raise error
+
+        if output_log is not None:
+            output_log.summarize()
+
+    def _send(self, message: dict[str, Any]) -> None:
+        """Write a single JSON line to the worker's stdin."""
+        if not self._process or not self._process.stdin:
+            raise BlenderProcessError(f"Blender worker {self.slot} is not running")
+        try:
+            self._process.stdin.write(json.dumps(message) + "\n")
+            self._process.stdin.flush()
+        except OSError as e:
+            raise BlenderProcessError(
+                f"Cannot send command to Blender worker {self.slot}: {e}",
+                self._process.poll(),
+            ) from e
+
+    def _read_output(self) -> None:
+        """Pump the worker's stdout into the line queue until EOF."""
+        process = self._process
+        if process is None or process.stdout is None:
+            return
+        for line in iter(process.stdout.readline, ""):
+            line = line.rstrip()
+            if line:
+                self._lines.put(line)
+        self._lines.put(None)
+
+    def _read_until(
+        self,
+        event_name: str,
+        timeout: float | None,
+        job_id: str | None = None,
+        watchdog: RenderWatchdog | None = None,
+        output_log: BlenderOutputLog | None = None,
+    ) -> Generator[str, None, BlenderEvent]:
+        """
+        Yield output lines until the given event arrives, then return it.
+
+        Lines go to `output_log` when given, otherwise straight to the log.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise BlenderProcessError(
+                    f"Blender worker {self.slot} did not report '{event_name}' "
+                    f"within {timeout}s"
+                )
+
+            if watchdog is not None:
+                try:
+                    watchdog.check()
+                except BlenderProcessTimeoutError as e:
+                    logger.error(f"Killing Blender worker {self.slot}: {e}")
+                    if self._process is not None:
+                        kill_process_group(self._process)
+                        e.return_code = self._process.returncode
+                    raise
+                watchdog_left = watchdog.time_left()
+                if watchdog_left is not None:
+                    remaining = (
+                        watchdog_left
+                        if remaining is None
+                        else min(remaining, watchdog_left)
+                    )
+
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+
+            if line is None:
+                raise BlenderProcessError(
+                    f"Blender worker {self.slot} exited unexpectedly",
+                    self._process.poll() if self._process else None,
+                )
+
+            event = parse_blender_event(line)
+            if (
+                event is not None
+                and event["event"] == event_name
+                and (job_id is None or event.get("job_id") == job_id)
+            ):
+                return event
+
+            if watchdog is not None:
+                watchdog.feed(line)
+            if output_log is not None:
+                output_log.record(line)
+            else:
+                logger.info(f"Blender[{self.slot}]: {line}")
+            yield line
+
+    def _wait_for(
+        self,
+        event_name: str,
+        timeout: float,
+        request: dict[str, Any] | None = None,
+    ) -> BlenderEvent:
+        """Optionally send a request, then drain output until the event arrives."""
+        if request is not None:
+            self._send(request)
+
+        reader = self._read_until(event_name, timeout)
+        while True:
+            try:
+                next(reader)
+            except StopIteration as stop:
+                return stop.value  # type: ignore[no-any-return]
+
+
+class BlenderWorkerPool:
+    """
+    Dispatches render jobs to a fixed number of warm Blender workers.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        command_factory: Callable[[ResourceProfile | None], list[str]],
+        max_jobs_per_worker: int,
+        max_rss_bytes: int,
+        start_timeout: float,
+        ping_timeout: float,
+        profile_factory: Callable[[int], ResourceProfile] | None = None,
+    ) -> None:
+        if size < 1:
+            raise ValueError("Worker pool size must be at least 1")
+
+        self.size = size
+        self.command_factory = command_factory
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.max_rss_bytes = max_rss_bytes
+        self.start_timeout = start_timeout
+        self.ping_timeout = ping_timeout
+        self.profile_factory = profile_factory
+
+        self._idle: queue.Queue[BlenderWorker] = queue.Queue()
+        self._workers: dict[int, BlenderWorker] = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Boot all workers in parallel and wait until they are ready."""
+        workers = [self._new_worker(slot) for slot in range(self.size)]
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            for worker, error in zip(
+                workers, executor.map(self._try_start, workers), strict=True
+            ):
+                if error is not None:
+                    logger.error(
+                        f"Blender worker {worker.slot} failed to start: {error}"
+                    )
+                self._register(worker)
+
+        logger.info(f"Blender worker pool started with {self.size} workers")
+
+    def shutdown(self) -> None:
+        """Stop every worker of the pool."""
+        with self._lock:
+            workers = list(self._workers.values())
+        for worker in workers:
+            worker.stop()
+        logger.info("Blender worker pool stopped")
+
+    def render(
+        self,
+        job: dict[str, Any],
+        watchdog_factory: Callable[[], RenderWatchdog] | None = None,
+        output_log: BlenderOutputLog | None = None,
+    ) -> Generator[str, None, None]:
+        """
+        Run a job on the next idle worker and yield its output lines.
+
+        The watchdog is created once a worker is checked out, so time spent
+        waiting for an idle worker does not count against its budget.
+        """
+        with self._checkout() as worker:
+            watchdog = watchdog_factory() if watchdog_factory is not None else None
+            if output_log is not None:
+                output_log.label = f"Blender[{worker.slot}]"
+            yield from worker.run_job(job, watchdog, output_log)
+
+    @contextmanager
+    def _checkout(self) -> Iterator[BlenderWorker]:
+        """Borrow a healthy worker and return or recycle it afterwards."""
+        worker = self._idle.get()
+
+        if not worker.ping(self.ping_timeout):
+            logger.warning(f"Restarting unhealthy Blender worker {worker.slot}")
+            worker = self._restart(worker)
+            error = self._try_start(worker)
+            if error is not None:
+                self._idle.put(worker)
+                raise error
+
+        try:
+            yield worker
+        finally:
+            if worker.busy or not worker.is_alive() or self._should_recycle(worker):
+                logger.info(
+                    f"Recycling Blender worker {worker.slot} after "
+                    f"{worker.jobs_completed} jobs"
+                )
+                worker = self._restart(worker)
+                error = self._try_start(worker)
+                if error is not None:
+                    logger.error(
+                        f"Blender worker {worker.slot} failed to restart: {error}"
+                    )
+            self._idle.put(worker)
+
+    def _should_recycle(self, worker: BlenderWorker) -> bool:
+        """Check the job count and memory thresholds of a worker."""
+        if worker.jobs_completed >= self.max_jobs_per_worker:
+            return True
+        rss_bytes = worker.rss_bytes()
+        return rss_bytes is not None and rss_bytes >= self.max_rss_bytes
+
+    def _restart(self, worker: BlenderWorker) -> BlenderWorker:
+        """Stop a worker and register an unstarted replacement in its slot."""
+        worker.stop()
+        replacement = self._new_worker(worker.slot)
+        with self._lock:
+            self._workers[worker.slot] = replacement
+        return replacement
+
+    def _new_worker(self, slot: int) -> BlenderWorker:
+        """Create an unstarted worker for a slot with the slot's resource profile."""
+        resource_profile = self.profile_factory(slot) if self.profile_factory else None
+        return BlenderWorker(
+            slot, self.command_factory(resource_profile), resource_profile
+        )
+
+    def _register(self, worker: BlenderWorker) -> None:
+        """Track a worker and mark it idle."""
+        with self._lock:
+            self._workers[worker.slot] = worker
+        self._idle.put(worker)
+
+    def _try_start(self, worker: BlenderWorker) -> BlenderProcessError | None:
+        """Start a worker, returning the error instead of raising it."""
+        try:
+            worker.start(self.start_timeout)
+        except BlenderProcessError as e:
+            return e
+        return None
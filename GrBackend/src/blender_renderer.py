@@ -6,29 +6,141 @@ It provides functionality to execute Blender commands and render images/videos
 from GLB files and JSON configurations.
 """
 
+import hashlib
+import os
+import queue
 import random
+import shutil
+import signal
+import sqlite3
 import string
 import subprocess
-from collections.abc import Generator
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Iterable
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import replace
 from pathlib import Path
 from typing import Any, Literal
 
+from src.blend_manifest import BlendManifest, BlendManifestStore
+from src.blender_events import BlenderEvent, parse_blender_event
+from src.blender_output import BlenderOutputLog
+from src.blender_pool import BlenderWorkerPool
 from src.config import (
     BLEND_BASE_FILE,
+    BLEND_MANIFEST_DIRECTORY,
+    BLEND_MANIFEST_ENABLED,
     BLENDER_APP,
+    BLENDER_CGROUP_ROOT,
+    BLENDER_DECIMATE_FUNCTION_NAME,
     BLENDER_FUNCTION_NAME,
+    BLENDER_LOG_FRAME_INTERVAL,
+    BLENDER_LOG_MAX_LINES,
+    BLENDER_LOG_TAIL_LINES,
+    BLENDER_MANIFEST_FUNCTION_NAME,
+    BLENDER_MEMORY_LIMIT_MB,
+    BLENDER_MEMORY_LIMIT_MODE,
+    BLENDER_NICE,
+    BLENDER_PIN_CPUS,
+    BLENDER_RESOURCE_SLOTS,
+    BLENDER_SCENE_INFO_FUNCTION_NAME,
     BLENDER_SCRIPT_FILE,
+    BLENDER_SERVE_FUNCTION_NAME,
+    BLENDER_THREADS,
+    BLENDER_WORKER_MAX_JOBS,
+    BLENDER_WORKER_MAX_RSS_MB,
+    BLENDER_WORKER_PING_TIMEOUT,
+    BLENDER_WORKER_POOL_SIZE,
+    BLENDER_WORKER_START_TIMEOUT,
+    FFMPEG_APP,
+    GLB_MAX_FILE_MB,
+    GLB_MAX_VERTICES,
+    GLB_OPTIMIZER_CACHE_DIRECTORY,
+    GLB_OPTIMIZER_CACHE_MAX_MB,
+    GLB_OPTIMIZER_ENABLED,
+    GLB_OPTIMIZER_FRAME_SIZE,
+    GLB_OPTIMIZER_MAX_TRIANGLES,
+    GLB_OPTIMIZER_MIN_TEXTURE_SIZE,
+    GLB_OPTIMIZER_SCREEN_COVERAGE,
+    GLB_OPTIMIZER_TEXEL_DENSITY,
+    IMPORT_CACHE_DIRECTORY,
+    IMPORT_CACHE_ENABLED,
+    IMPORT_CACHE_MAX_MB,
+    JOB_MAX_RECOVERIES,
+    JOB_STORE_ENABLED,
+    JOB_STORE_MAX_AGE_DAYS,
+    JOB_STORE_MAX_FINISHED_JOBS,
+    JOB_STORE_PATH,
+    PRODUCTVIDEO_ADDON_DIR,
+    RENDER_CACHE_DIRECTORY,
+    RENDER_CACHE_ENABLED,
+    RENDER_CACHE_MAX_MB,
+    RENDER_COST_DEFAULT_FRAMES,
+    RENDER_COST_FRAME_SECONDS,
+    RENDER_COST_IMPORT_SECONDS_PER_MB,
+    RENDER_COST_MODEL_PATH,
+    RENDER_COST_OVERHEAD_SECONDS,
+    RENDER_JOB_HISTORY_SIZE,
+    RENDER_MAX_CONCURRENT_JOBS,
+    RENDER_SCHEDULER_AGING,
+    RENDER_SHARD_COUNT,
+    RENDER_SHARD_MIN_FRAMES,
+    RENDER_SHARD_VIDEO_CODEC,
+    RENDER_STALL_TIMEOUT_SECONDS,
+    RENDER_TIMEOUT_SECONDS,
+    TEMP_JANITOR_ENABLED,
+    TEMP_JANITOR_INTERVAL_SECONDS,
+    TEMP_MAX_AGE_HOURS,
+    TEMP_MAX_MB,
 )
 from src.file_handler import FileHandler
-from utils.exceptions import BlenderProcessError
+from src.frame_sharding import (
+    FRAME_FILE_PATTERN,
+    FRAME_FILE_PREFIX,
+    FrameShardScheduler,
+    assemble_image_sequence,
+    collect_frame_files,
+)
+from src.glb_inspector import GlbStats, inspect_glb
+from src.glb_optimizer import GlbOptimizer
+from src.job_manager import JobStatus, RenderJob, RenderJobManager
+from src.job_store import JobStore, process_start_ticks
+from src.metrics import (
+    REGISTRY,
+    RENDER_DURATION_SECONDS,
+    RENDER_FAILURES_TOTAL,
+    RENDER_JOBS_IN_FLIGHT,
+    RENDER_PHASE_SECONDS,
+    Gauge,
+    PhaseTimer,
+    composition_labels,
+)
+from src.render_cache import RenderCache, build_render_key, canonical_json
+from src.render_cost import CostFeatures, RenderCostModel
+from src.render_progress import ProgressCallback, RenderProgress, RenderProgressParser
+from src.render_timeline import RenderTimeline
+from src.render_watchdog import RenderWatchdog, kill_process_group
+from src.resource_profile import ResourceGovernor, ResourceProfile
+from src.single_flight import SingleFlight
+from src.temp_janitor import TempDirectoryJanitor
+from utils.exceptions import (
+    BlenderProcessError,
+    BlenderProcessTimeoutError,
+    CompositionError,
+    GlbFileError,
+)
 from utils.logger import logger
 
 # Constants
 TEMP_DIRECTORY = Path(__file__).parent.parent / "temp_dir"
 UNIQUE_FILENAME_LENGTH = 12
+GLB_STATS_CACHE_SIZE = 256
+SCENE_INFO_CACHE_SIZE = 64
 
 RenderEnvironment = Literal["local", "gcp"]
-JobStatus = Literal["SUCCESS", "FAILED", "PENDING"]
+FrameRange = tuple[int, int]
 
 
 class BlenderRenderer:
@@ -36,9 +148,335 @@ class BlenderRenderer:
     Handles Blender rendering operations.
 
     This class encapsulates all Blender-related functionality including
-    command execution and file processing.
+    command execution and file processing. When `BLENDER_WORKER_POOL_SIZE` is
+    set, renders are dispatched to warm Blender workers instead of launching
+    Blender for every render. Finished renders are kept in a content-addressed
+    cache, so identical requests are answered without running Blender, and
+    identical requests arriving while a render is running share that render.
+    With `RENDER_SHARD_COUNT` above 1, the frames of one video are split across
+    several Blender processes and assembled into the video afterwards. Every
+    Blender process runs in a resource slot that limits its threads, CPUs,
+    memory and priority, and is killed by a watchdog when it exceeds its time
+    budget or stops printing output. Uploaded GLB files are first fitted to the
+    output resolution by the GLB optimizer. Temporary files are evicted by age and
+    quota, except those of renders still in flight. Phase durations, failures
+    and disk usage are recorded as metrics, and the timing events Blender prints
+    are kept as a per-render timeline. Queued renders are scheduled by their
+    expected duration, which a cost model learns from finished renders and
+    which gives users an ETA before their render starts. Jobs, Blender
+    processes and temporary files are recorded in a job store, so after a
+    restart orphaned processes are killed and interrupted jobs are requeued;
+    sharded renders resume from the frames already rendered. Compositions are
+    checked against a manifest of the base .blend file before Blender starts.
     """
 
+    def __init__(
+        self,
+        worker_pool: BlenderWorkerPool | None = None,
+        render_cache: RenderCache | None = None,
+        resource_governor: ResourceGovernor | None = None,
+        temp_janitor: TempDirectoryJanitor | None = None,
+        glb_optimizer: GlbOptimizer | None = None,
+        cost_model: RenderCostModel | None = None,
+        job_store: JobStore | None = None,
+        blend_manifest_store: BlendManifestStore | None = None,
+    ) -> None:
+        if resource_governor is None:
+            resource_slots = BLENDER_RESOURCE_SLOTS
+            if resource_slots <= 0:
+                resource_slots = BLENDER_WORKER_POOL_SIZE + (
+                    RENDER_MAX_CONCURRENT_JOBS * max(1, RENDER_SHARD_COUNT)
+                )
+            resource_governor = ResourceGovernor(
+                slots=resource_slots,
+                threads=BLENDER_THREADS,
+                pin_cpus=BLENDER_PIN_CPUS,
+                memory_limit_mb=BLENDER_MEMORY_LIMIT_MB,
+                memory_limit_mode=BLENDER_MEMORY_LIMIT_MODE,  # type: ignore[arg-type]
+                cgroup_root=BLENDER_CGROUP_ROOT,
+                nice=BLENDER_NICE,
+            )
+        self.resource_governor = resource_governor
+
+        if worker_pool is None and BLENDER_WORKER_POOL_SIZE > 0:
+            worker_profiles = resource_governor.reserve(BLENDER_WORKER_POOL_SIZE)
+            worker_pool = BlenderWorkerPool(
+                size=BLENDER_WORKER_POOL_SIZE,
+                command_factory=lambda resource_profile: self._build_worker_command(
+                    resource_profile=resource_profile
+                ),
+                max_jobs_per_worker=BLENDER_WORKER_MAX_JOBS,
+                max_rss_bytes=BLENDER_WORKER_MAX_RSS_MB * 1024 * 1024,
+                start_timeout=BLENDER_WORKER_START_TIMEOUT,
+                ping_timeout=BLENDER_WORKER_PING_TIMEOUT,
+                profile_factory=worker_profiles.__getitem__,
+            )
+            worker_pool.start()
+        self.worker_pool = worker_pool
+
+        if render_cache is None and RENDER_CACHE_ENABLED:
+            render_cache = RenderCache(
+                directory=RENDER_CACHE_DIRECTORY,
+                max_bytes=RENDER_CACHE_MAX_MB * 1024 * 1024,
+                script_file_path=BLENDER_SCRIPT_FILE,
+                addon_directory=PRODUCTVIDEO_ADDON_DIR,
+            )
+        self.render_cache = render_cache
+
+        if temp_janitor is None and TEMP_JANITOR_ENABLED:
+            temp_janitor = TempDirectoryJanitor(
+                directory=TEMP_DIRECTORY,
+                max_bytes=TEMP_MAX_MB * 1024 * 1024,
+                max_age_seconds=TEMP_MAX_AGE_HOURS * 3600,
+                interval_seconds=TEMP_JANITOR_INTERVAL_SECONDS,
+            )
+            temp_janitor.start()
+        self.temp_janitor = temp_janitor
+
+        if glb_optimizer is None and GLB_OPTIMIZER_ENABLED:
+            glb_optimizer = GlbOptimizer(
+                cache_directory=GLB_OPTIMIZER_CACHE_DIRECTORY,
+                max_cache_bytes=GLB_OPTIMIZER_CACHE_MAX_MB * 1024 * 1024,
+                frame_size=GLB_OPTIMIZER_FRAME_SIZE,
+                screen_coverage=GLB_OPTIMIZER_SCREEN_COVERAGE,
+                texel_density=GLB_OPTIMIZER_TEXEL_DENSITY,
+                min_texture_size=GLB_OPTIMIZER_MIN_TEXTURE_SIZE,
+                max_triangles=GLB_OPTIMIZER_MAX_TRIANGLES,
+                decimate_function=self._decimate_glb,
+            )
+        self.glb_optimizer = glb_optimizer
+
+        if cost_model is None:
+            cost_model = RenderCostModel(
+                overhead_seconds=RENDER_COST_OVERHEAD_SECONDS,
+                import_seconds_per_mb=RENDER_COST_IMPORT_SECONDS_PER_MB,
+                frame_seconds=RENDER_COST_FRAME_SECONDS,
+                default_frames=RENDER_COST_DEFAULT_FRAMES,
+                state_path=RENDER_COST_MODEL_PATH,
+            )
+        self.cost_model = cost_model
+
+        if job_store is None and JOB_STORE_ENABLED:
+            job_store = JobStore(
+                JOB_STORE_PATH,
+                max_finished_jobs=JOB_STORE_MAX_FINISHED_JOBS,
+                max_age_seconds=JOB_STORE_MAX_AGE_DAYS * 86400,
+            )
+        self.job_store = job_store
+
+        if blend_manifest_store is None and BLEND_MANIFEST_ENABLED and BLENDER_APP:
+            blend_manifest_store = BlendManifestStore(
+                cache_directory=BLEND_MANIFEST_DIRECTORY,
+                extract_function=self._extract_blend_manifest,
+                addon_maps_path=(
+                    Path(PRODUCTVIDEO_ADDON_DIR) / "properties" / "maps.json"
+                    if PRODUCTVIDEO_ADDON_DIR
+                    else None
+                ),
+            )
+        self.blend_manifest_store = blend_manifest_store
+        self._register_disk_usage_metrics()
+        self._single_flight: SingleFlight[str] = SingleFlight()
+        self._progress_listeners: dict[str, list[ProgressCallback]] = {}
+        self._progress_lock = threading.Lock()
+        self._scene_info_cache: OrderedDict[tuple[str, int, int, str], BlenderEvent] = (
+            OrderedDict()
+        )
+        self._scene_info_lock = threading.Lock()
+        self._phase_timers: dict[str, PhaseTimer] = {}
+        self._timelines: OrderedDict[str, RenderTimeline] = OrderedDict()
+        self._glb_stats: OrderedDict[tuple[str, int, int], GlbStats] = OrderedDict()
+        self._glb_stats_lock = threading.Lock()
+
+        max_concurrent_jobs = RENDER_MAX_CONCURRENT_JOBS
+        if worker_pool is not None:
+            max_concurrent_jobs = min(max_concurrent_jobs, worker_pool.size)
+        self.job_manager = RenderJobManager(
+            render_function=self.render_video_from_glb,
+            max_concurrent_jobs=max_concurrent_jobs,
+            max_finished_jobs=RENDER_JOB_HISTORY_SIZE,
+            cost_function=self._estimate_render_seconds,
+            aging=RENDER_SCHEDULER_AGING,
+            job_store=job_store,
+        )
+
+        if self.blend_manifest_store is not None and BLEND_BASE_FILE:
+            # Blender writes the manifest while the service starts up
+            self.blend_manifest_store.prefetch(BLEND_BASE_FILE)
+
+    def shutdown(self) -> None:
+        """Release long-lived resources such as the job executor and workers."""
+        self.job_manager.shutdown(wait=False)
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
+        if self.temp_janitor is not None:
+            self.temp_janitor.stop()
+
+    def recover_interrupted_jobs(self) -> int:
+        """
+        Clean up after a previous run of the service and requeue its jobs.
+
+        Blender processes it left behind are killed and its temporary files
+        removed, except the frames of sharded renders, which the requeued
+        render resumes from. Interrupted jobs whose video is in the render
+        cache are finalized instead, and jobs interrupted too often or whose
+        GLB file is gone are failed.
+
+        Returns:
+            Number of requeued jobs.
+        """
+        job_store = self.job_store
+        if job_store is None:
+            return 0
+
+        for pid, started in job_store.orphaned_processes():
+            # Skip processes that exited and pids taken over by other processes
+            current = process_start_ticks(pid)
+            if current is None or started is None or current not in (started, 0):
+                continue
+            try:
+                os.killpg(pid, signal.SIGKILL)
+                logger.warning(f"Killed orphaned Blender process {pid}")
+            except OSError as e:
+                logger.warning(f"Cannot kill orphaned Blender process {pid}: {e}")
+
+        for render in job_store.orphaned_renders():
+            for temp_path in map(Path, render.temp_paths):
+                if temp_path.is_dir():
+                    self._discard_placeholder_frames(temp_path)
+                else:
+                    temp_path.unlink(missing_ok=True)
+
+        requeued = 0
+        for job in job_store.interrupted_jobs():
+            if job.recoveries >= JOB_MAX_RECOVERIES:
+                job_store.record_finished(
+                    job.job_id,
+                    "FAILED",
+                    error=f"Interrupted by {job.recoveries + 1} restarts",
+                )
+                continue
+            if not Path(job.glb_file_path).exists():
+                job_store.record_finished(
+                    job.job_id, "FAILED", error="GLB file no longer exists"
+                )
+                continue
+
+            render_key = self._build_render_key(
+                job.glb_file_path, job.json_data, job.blend_file_path
+            )
+            cached_video_path = (
+                self.render_cache.get(render_key)
+                if self.render_cache is not None
+                else None
+            )
+            if cached_video_path is not None:
+                job_store.record_finished(
+                    job.job_id, "SUCCESS", output_path=cached_video_path
+                )
+                continue
+
+            job_store.record_interrupted(job.job_id)
+            self.job_manager.submit(
+                job.glb_file_path,
+                job.json_data,
+                job.blend_file_path,
+                dedupe_key=render_key,
+                job_id=job.job_id,
+            )
+            requeued += 1
+
+        if requeued:
+            logger.info(f"Requeued {requeued} render jobs interrupted by a restart")
+        return requeued
+
+    def _record_in_job_store(self, write: Callable[[JobStore], None]) -> None:
+        """Write to the job store, logging instead of failing the render."""
+        if self.job_store is None:
+            return
+        try:
+            write(self.job_store)
+        except sqlite3.Error as e:
+            logger.warning(f"Cannot write to the job store: {e}")
+
+    def _register_disk_usage_metrics(self) -> None:
+        """Expose the disk usage of temporary files and the render cache."""
+        temp_janitor = self.temp_janitor
+        if temp_janitor is not None:
+            REGISTRY.register(
+                Gauge(
+                    "productvideo_temp_directory_bytes",
+                    "Bytes used by temporary render files as of the last sweep.",
+                    function=lambda: temp_janitor.stats()["bytes"],
+                )
+            )
+
+        render_cache = self.render_cache
+        if render_cache is not None:
+            REGISTRY.register(
+                Gauge(
+                    "productvideo_render_cache_bytes",
+                    "Bytes used by cached videos.",
+                    function=lambda: render_cache.stats()["size_bytes"],
+                )
+            )
+
+    def submit_render(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+    ) -> str:
+        """
+        Queue a render in the background and return its job id.
+        """
+        self._validate_file_paths(glb_file_path, json_data)
+        self.validate_composition(json_data, blend_file_path)
+        return self.job_manager.submit(
+            glb_file_path,
+            json_data,
+            blend_file_path,
+            dedupe_key=self._build_render_key(
+                glb_file_path, json_data, blend_file_path
+            ),
+        )
+
+    def get_job_status(self, job_id: str) -> JobStatus:
+        """
+        Get the status of a submitted render.
+        """
+        return self.job_manager.status(job_id)
+
+    def get_job_progress(self, job_id: str) -> RenderProgress:
+        """
+        Get the latest progress of a submitted render.
+
+        Until Blender reports an ETA of its own, the ETA is that of the cost
+        model, which also covers the time left in the queue.
+        """
+        progress = self.job_manager.get_job(job_id).progress
+        if progress.eta_seconds is None:
+            eta_seconds = self.job_manager.estimate_eta(job_id)
+            if eta_seconds is not None:
+                progress = replace(progress, eta_seconds=eta_seconds)
+        return progress
+
+    def get_job_timeline(self, job_id: str) -> RenderTimeline | None:
+        """
+        Get the phase and frame timings of a submitted render.
+
+        Renders answered from the cache have no timeline.
+        """
+        render_key = self.job_manager.get_job(job_id).dedupe_key
+        with self._progress_lock:
+            return self._timelines.get(render_key) if render_key else None
+
+    def get_job_result(self, job_id: str, timeout: float | None = None) -> str:
+        """
+        Wait for a submitted render and return the video path.
+        """
+        return self.job_manager.result(job_id, timeout)
+
     def _ensure_temp_directory(self) -> None:
         """Ensure the temporary directory exists."""
         try:
@@ -48,16 +486,21 @@ class BlenderRenderer:
             logger.error(f"Failed to create temporary directory: {e}")
             raise BlenderProcessError(f"Cannot create temporary directory: {e}") from e
 
-    def _execute_command(self, command: list[str]) -> Generator[str, None, None]:
+    def _execute_command(
+        self, command: list[str], resource_profile: ResourceProfile | None = None
+    ) -> Generator[str, None, None]:
         """
-        Execute a command
+        Execute a command under the render watchdog.
+
+        The process runs in its own session, so a timed-out or abandoned run
+        is killed together with everything it spawned.
         """
         command_str = " ".join(command)
         logger.info("🎬 Starting local Blender process...")
         logger.debug(f"Command: {command_str}")
 
         try:
-            with subprocess.Popen(
+            process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
@@ -65,27 +508,97 @@ class BlenderRenderer:
                 encoding="utf-8",
                 errors="replace",
                 bufsize=1,
-            ) as process:
-                if process.stdout:
-                    for line in iter(process.stdout.readline, ""):
-                        line = line.rstrip()
-                        if line:
-                            logger.info(f"Blender: {line}")
-                            yield line
-                return_code = process.wait()
-                if return_code != 0:
-                    raise BlenderProcessError(
-                        f"Blender process failed with return code {return_code}",
-                        return_code,
-                    )
+                start_new_session=True,
+            )
         except FileNotFoundError as e:
             raise BlenderProcessError(
                 f"Blender executable not found: {command[0]}"
             ) from e
+
+        if resource_profile is not None:
+            resource_profile.apply(process.pid)
+        pid = process.pid
+        self._record_in_job_store(lambda job_store: job_store.register_process(pid))
+
+        watchdog = self._new_watchdog()
+        output_log = self._new_output_log(f"Blender[{process.pid}]")
+        lines: queue.Queue[str | None] = queue.Queue()
+        threading.Thread(
+            target=self._read_output,
+            args=(process, lines),
+            name=f"blender-output-{process.pid}",
+            daemon=True,
+        ).start()
+
+        try:
+            while True:
+                watchdog.check()
+                try:
+                    line = lines.get(timeout=watchdog.time_left())
+                except queue.Empty:
+                    continue
+                if line is None:
+                    break
+                watchdog.feed(line)
+                output_log.record(line)
+                yield line
+
+            return_code = process.wait()
+            if return_code != 0:
+                raise BlenderProcessError(
+                    f"Blender process failed with return code {return_code}",
+                    return_code,
+                )
+            output_log.summarize()
+        except BlenderProcessTimeoutError as e:
+            logger.error(f"Killing Blender process {process.pid}: {e}")
+            kill_process_group(process)
+            e.return_code = process.returncode
+            output_log.dump_tail(e)
+            raise
+        except BlenderProcessError as e:
+            output_log.dump_tail(e)
+            raise
         except Exception as e:
+            output_log.dump_tail(e)
             raise BlenderProcessError(
                 f"Unexpected error executing Blender command: {e}"
             ) from e
+        finally:
+            kill_process_group(process)
+            if process.stdout:
+                process.stdout.close()
+            self._record_in_job_store(lambda job_store: job_store.forget_process(pid))
+
+    @staticmethod
+    def _read_output(
+        process: subprocess.Popen[str], lines: queue.Queue[str | None]
+    ) -> None:
+        """Pump a process's output into a queue until EOF."""
+        if process.stdout is None:
+            lines.put(None)
+            return
+        try:
+            for line in iter(process.stdout.readline, ""):
+                line = line.rstrip()
+                if line:
+                    lines.put(line)
+        except (OSError, ValueError):
+            pass
+        lines.put(None)
+
+    def _new_output_log(self, label: str = "Blender") -> BlenderOutputLog:
+        """Create a sampled log for the output of one Blender run."""
+        return BlenderOutputLog(
+            label,
+            tail_lines=BLENDER_LOG_TAIL_LINES,
+            frame_interval=BLENDER_LOG_FRAME_INTERVAL,
+            max_logged_lines=BLENDER_LOG_MAX_LINES,
+        )
+
+    def _new_watchdog(self) -> RenderWatchdog:
+        """Create a watchdog with the configured time budget."""
+        return RenderWatchdog(RENDER_TIMEOUT_SECONDS, RENDER_STALL_TIMEOUT_SECONDS)
 
     def _build_blender_command(
         self,
@@ -93,6 +606,8 @@ class BlenderRenderer:
         json_file_path: str,
         output_file_path: str,
         blend_file_path: str | None = None,
+        frame_range: FrameRange | None = None,
+        resource_profile: ResourceProfile | None = None,
     ) -> list[str]:
         """
         Build the Blender command arguments.
@@ -104,6 +619,7 @@ class BlenderRenderer:
             BLENDER_APP,
             blend_file_path,
             "--background",
+            *(resource_profile.blender_args() if resource_profile else []),
             "--python",
             BLENDER_SCRIPT_FILE,
             "--",
@@ -111,9 +627,144 @@ class BlenderRenderer:
             f"--glb_file_path={glb_file_path}",
             f"--out_file_path={output_file_path}",
             f"--function={BLENDER_FUNCTION_NAME}",
+            *self._import_cache_args(),
         ]
+        if frame_range is not None:
+            command += [
+                f"--frame_start={frame_range[0]}",
+                f"--frame_end={frame_range[1]}",
+            ]
         return [str(arg) for arg in command if arg is not None]
 
+    def _build_scene_info_command(
+        self,
+        json_file_path: str,
+        blend_file_path: str | None = None,
+        resource_profile: ResourceProfile | None = None,
+    ) -> list[str]:
+        """
+        Build the command reporting the frame range of a composition.
+        """
+        if not blend_file_path:
+            blend_file_path = BLEND_BASE_FILE
+
+        command = [
+            BLENDER_APP,
+            blend_file_path,
+            "--background",
+            *(resource_profile.blender_args() if resource_profile else []),
+            "--python",
+            BLENDER_SCRIPT_FILE,
+            "--",
+            f"--json_file_path={json_file_path}",
+            f"--function={BLENDER_SCENE_INFO_FUNCTION_NAME}",
+        ]
+        return [str(arg) for arg in command if arg is not None]
+
+    def _build_worker_command(
+        self,
+        blend_file_path: str | None = None,
+        resource_profile: ResourceProfile | None = None,
+    ) -> list[str]:
+        """
+        Build the command of a warm Blender worker running in server mode.
+        """
+        if not blend_file_path:
+            blend_file_path = BLEND_BASE_FILE
+
+        command = [
+            BLENDER_APP,
+            blend_file_path,
+            "--background",
+            *(resource_profile.blender_args() if resource_profile else []),
+            "--python",
+            BLENDER_SCRIPT_FILE,
+            "--",
+            f"--function={BLENDER_SERVE_FUNCTION_NAME}",
+            *self._import_cache_args(),
+        ]
+        return [str(arg) for arg in command if arg is not None]
+
+    def _build_decimate_command(
+        self,
+        glb_file_path: str,
+        output_file_path: str,
+        ratio: float,
+        resource_profile: ResourceProfile | None = None,
+    ) -> list[str]:
+        """
+        Build the command decimating the meshes of a GLB file.
+        """
+        command = [
+            BLENDER_APP,
+            "--background",
+            "--factory-startup",
+            *(resource_profile.blender_args() if resource_profile else []),
+            "--python",
+            BLENDER_SCRIPT_FILE,
+            "--",
+            f"--glb_file_path={glb_file_path}",
+            f"--out_file_path={output_file_path}",
+            f"--decimate_ratio={ratio}",
+            f"--function={BLENDER_DECIMATE_FUNCTION_NAME}",
+        ]
+        return [str(arg) for arg in command if arg is not None]
+
+    def _build_manifest_command(
+        self, blend_file_path: str, output_file_path: str
+    ) -> list[str]:
+        """
+        Build the command writing the manifest of a .blend file.
+        """
+        command = [
+            BLENDER_APP,
+            blend_file_path,
+            "--background",
+            "--python",
+            BLENDER_SCRIPT_FILE,
+            "--",
+            f"--out_file_path={output_file_path}",
+            f"--function={BLENDER_MANIFEST_FUNCTION_NAME}",
+        ]
+        return [str(arg) for arg in command if arg is not None]
+
+    def _extract_blend_manifest(self, blend_file_path: Path, output_path: Path) -> None:
+        """
+        Write the manifest of a .blend file with Blender in a resource slot.
+        """
+        with self.resource_governor.acquire() as resource_profile:
+            command = self._build_manifest_command(
+                str(blend_file_path), str(output_path)
+            )
+            for _ in self._execute_command(command, resource_profile):
+                pass
+
+    def _decimate_glb(
+        self, glb_file_path: Path, output_path: Path, ratio: float
+    ) -> None:
+        """
+        Decimate the meshes of a GLB file with Blender in a resource slot.
+        """
+        with self.resource_governor.acquire() as resource_profile:
+            command = self._build_decimate_command(
+                str(glb_file_path), str(output_path), ratio, resource_profile
+            )
+            for _ in self._execute_command(command, resource_profile):
+                pass
+        if not output_path.exists():
+            raise BlenderProcessError("Decimated GLB file not found.")
+
+    def _import_cache_args(self) -> list[str]:
+        """
+        Arguments pointing Blender at the cache of normalized product imports.
+        """
+        if not IMPORT_CACHE_ENABLED:
+            return []
+        return [
+            f"--import_cache_dir={IMPORT_CACHE_DIRECTORY}",
+            f"--import_cache_max_mb={IMPORT_CACHE_MAX_MB}",
+        ]
+
     def _validate_file_paths(
         self, glb_file_path: str, json_data: dict[str, Any]
     ) -> None:
@@ -125,6 +776,124 @@ class BlenderRenderer:
         if not json_data or not isinstance(json_data, dict):
             raise BlenderProcessError("Invalid JSON data provided")
 
+        stats = self.inspect_glb(glb_file_path)
+        if GLB_MAX_FILE_MB and stats.file_bytes > GLB_MAX_FILE_MB * 1024 * 1024:
+            raise GlbFileError(
+                f"GLB file is {stats.file_bytes / 1024 / 1024:.0f} MB, "
+                f"the limit is {GLB_MAX_FILE_MB} MB",
+                glb_file_path,
+            )
+        if GLB_MAX_VERTICES and stats.vertex_count > GLB_MAX_VERTICES:
+            raise GlbFileError(
+                f"GLB file has {stats.vertex_count} vertices, "
+                f"the limit is {GLB_MAX_VERTICES}",
+                glb_file_path,
+            )
+        if stats.external_uris:
+            logger.warning(
+                f"GLB file {glb_file_path} refers to external files Blender may not "
+                f"find: {', '.join(stats.external_uris)}"
+            )
+
+    def validate_composition(
+        self,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+        wait_for_manifest: bool = False,
+    ) -> None:
+        """
+        Check that the base .blend file has what a composition names.
+
+        Without a manifest, e.g. when Blender cannot write one or is still
+        writing it, compositions are not checked and render as before;
+        `wait_for_manifest` waits for Blender instead.
+
+        Raises:
+            CompositionError: If an action, collection or material is missing.
+        """
+        blend_file_path = blend_file_path or BLEND_BASE_FILE
+        if self.blend_manifest_store is None or not blend_file_path:
+            return
+        manifest: BlendManifest | None
+        try:
+            if wait_for_manifest:
+                manifest = self.blend_manifest_store.get(blend_file_path)
+            else:
+                manifest = self.blend_manifest_store.get_if_ready(blend_file_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Composition not checked against the .blend file: {e}")
+            return
+        if manifest is None:
+            logger.debug("Composition not checked, the blend manifest is not ready")
+            return
+
+        errors = manifest.validate(json_data)
+        if errors:
+            raise CompositionError(
+                f"The base .blend file cannot render this composition: "
+                f"{'; '.join(errors)}",
+                errors,
+            )
+
+    def inspect_glb(self, glb_file_path: str) -> GlbStats:
+        """
+        Validate a GLB file and get its contents, remembered per file version.
+
+        Raises:
+            GlbFileError: If the file is not a valid GLB file.
+        """
+        path = Path(glb_file_path).resolve()
+        file_stat = path.stat()
+        key = (str(path), file_stat.st_size, file_stat.st_mtime_ns)
+        with self._glb_stats_lock:
+            stats = self._glb_stats.get(key)
+        if stats is not None:
+            return stats
+
+        stats = inspect_glb(path)
+        logger.debug(f"Inspected {glb_file_path}: {stats}")
+        with self._glb_stats_lock:
+            self._glb_stats[key] = stats
+            while len(self._glb_stats) > GLB_STATS_CACHE_SIZE:
+                self._glb_stats.popitem(last=False)
+        return stats
+
+    def _cost_features(
+        self, glb_file_path: str, json_data: dict[str, Any]
+    ) -> CostFeatures:
+        """
+        Get the features the cost model predicts a render's duration from.
+        """
+        try:
+            glb_stats: GlbStats | None = self.inspect_glb(glb_file_path)
+        except (GlbFileError, OSError):
+            glb_stats = None
+        return self.cost_model.features(json_data, glb_stats)
+
+    def _estimate_render_seconds(self, job: RenderJob) -> float:
+        """
+        Predict the wall time of a render job for the scheduler.
+        """
+        return self.cost_model.estimate(
+            self._cost_features(job.glb_file_path, job.json_data)
+        )
+
+    def _build_render_key(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None,
+    ) -> str:
+        """
+        Build the content hash identifying a render.
+        """
+        blend_file_path = blend_file_path or BLEND_BASE_FILE
+        if self.render_cache is not None:
+            return self.render_cache.build_key(
+                glb_file_path, json_data, blend_file_path
+            )
+        return build_render_key(glb_file_path, json_data, blend_file_path)
+
     def _generate_unique_filename(self, extension: str = "") -> str:
         """
         Generate a unique filename.
@@ -142,34 +911,396 @@ class BlenderRenderer:
         glb_file_path: str,
         json_data: dict[str, Any],
         blend_file_path: str | None = None,
-    ) -> str | dict[str, Any]:
+        progress_callback: ProgressCallback | None = None,
+    ) -> str:
         """
         Render a video from a GLB file and JSON configuration.
+
+        Identical renders already in flight are joined instead of started again;
+        every caller's `progress_callback` receives the shared render's progress.
         """
         self._validate_file_paths(glb_file_path, json_data)
+        self.validate_composition(json_data, blend_file_path)
+
+        render_key = self._build_render_key(glb_file_path, json_data, blend_file_path)
+        if self.render_cache is not None:
+            cached_video_path = self.render_cache.get(render_key)
+            if cached_video_path is not None:
+                return cached_video_path
 
+        if progress_callback is not None:
+            with self._progress_lock:
+                self._progress_listeners.setdefault(render_key, []).append(
+                    progress_callback
+                )
+        try:
+            return self._single_flight.do(
+                render_key,
+                lambda: self._render(
+                    glb_file_path, json_data, blend_file_path, render_key
+                ),
+            )
+        finally:
+            if progress_callback is not None:
+                with self._progress_lock:
+                    listeners = self._progress_listeners.get(render_key, [])
+                    listeners.remove(progress_callback)
+                    if not listeners:
+                        self._progress_listeners.pop(render_key, None)
+
+    def _publish_progress(self, render_key: str, progress: RenderProgress) -> None:
+        """
+        Hand a progress update to everyone waiting on the render.
+        """
+        with self._progress_lock:
+            listeners = list(self._progress_listeners.get(render_key, []))
+            phase_timer = self._phase_timers.get(render_key)
+        if phase_timer is not None:
+            phase_timer.enter(progress.phase)
+        for listener in listeners:
+            try:
+                listener(progress)
+            except Exception as e:
+                logger.warning(f"Progress listener failed: {e}")
+
+    def _render(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None,
+        render_key: str,
+    ) -> str:
+        """
+        Run Blender for a single render, cache its output and record metrics.
+        """
         unique_filename = self._generate_unique_filename()
         json_file_path = TEMP_DIRECTORY / f"in_{unique_filename}.json"
         video_output_path = TEMP_DIRECTORY / f"out_{unique_filename}.mov"
+        # Named by the render, so a render interrupted by a restart resumes
+        frames_directory = TEMP_DIRECTORY / f"frames_{render_key[:32]}"
+        temp_paths = [
+            str(json_file_path),
+            str(video_output_path),
+            str(frames_directory),
+        ]
+        self._record_in_job_store(
+            lambda job_store: job_store.register_render(render_key, temp_paths)
+        )
+
+        labels = composition_labels(json_data)
+        cost_features = self._cost_features(glb_file_path, json_data)
+        phase_timer = PhaseTimer(RENDER_PHASE_SECONDS, labels)
+        timeline = RenderTimeline()
+        with self._progress_lock:
+            self._phase_timers[render_key] = phase_timer
+            self._timelines[render_key] = timeline
+            self._timelines.move_to_end(render_key)
+            while len(self._timelines) > RENDER_JOB_HISTORY_SIZE:
+                self._timelines.popitem(last=False)
+        RENDER_JOBS_IN_FLIGHT.inc()
+        started_at = time.monotonic()
+        status = "FAILED"
 
         try:
-            FileHandler.write_json_file(str(json_file_path), json_data)
-            command = self._build_blender_command(
-                glb_file_path,
-                str(json_file_path),
-                str(video_output_path),
-                blend_file_path,
+            with self._pinned_temp_files(
+                json_file_path, video_output_path, frames_directory
+            ):
+                output_path = self._render_to(
+                    glb_file_path,
+                    json_data,
+                    blend_file_path,
+                    render_key,
+                    json_file_path,
+                    video_output_path,
+                    frames_directory,
+                    timeline,
+                )
+            status = "SUCCESS"
+            return output_path
+        except Exception as e:
+            RENDER_FAILURES_TOTAL.inc(
+                return_code=str(getattr(e, "return_code", None)),
+                error=type(e).__name__,
             )
+            raise
+        finally:
+            phase_timer.finish()
+            self._record_in_job_store(
+                lambda job_store: job_store.forget_render(render_key)
+            )
+            with self._progress_lock:
+                self._phase_timers.pop(render_key, None)
+            RENDER_JOBS_IN_FLIGHT.dec()
+            duration = time.monotonic() - started_at
+            RENDER_DURATION_SECONDS.observe(duration, status=status, **labels)
+            if status == "SUCCESS":
+                self.cost_model.observe(
+                    cost_features, duration, frames=len(timeline.frames) or None
+                )
+            logger.info(f"Render timeline ({status}): {timeline.summary()}")
 
-            for _ in self._execute_command(command):
-                pass
+    def _pinned_temp_files(self, *paths: Path) -> AbstractContextManager[None]:
+        """
+        Protect the temporary files of a render from the janitor.
+        """
+        if self.temp_janitor is None:
+            return nullcontext()
+        return self.temp_janitor.pinned(*paths)
+
+    def _render_to(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None,
+        render_key: str,
+        json_file_path: Path,
+        video_output_path: Path,
+        frames_directory: Path,
+        timeline: RenderTimeline,
+    ) -> str:
+        """
+        Render into the given temporary paths.
+        """
+        try:
+            FileHandler.write_json_file(str(json_file_path), json_data)
+
+            if self.glb_optimizer is not None:
+                self._publish_progress(render_key, RenderProgress(phase="optimize_glb"))
+                glb_file_path = self.glb_optimizer.optimize(glb_file_path, json_data)
+
+            if RENDER_SHARD_COUNT > 1:
+                self._render_sharded(
+                    glb_file_path,
+                    json_data,
+                    str(json_file_path),
+                    video_output_path,
+                    frames_directory,
+                    blend_file_path,
+                    render_key,
+                    timeline,
+                )
+            else:
+                progress_parser = RenderProgressParser()
+                self._publish_progress(render_key, progress_parser.progress)
+                for line in timeline.record(
+                    self._run_blender(
+                        glb_file_path,
+                        str(json_file_path),
+                        str(video_output_path),
+                        blend_file_path,
+                    )
+                ):
+                    progress = progress_parser.feed(line)
+                    if progress is not None:
+                        self._publish_progress(render_key, progress)
+                self._publish_progress(render_key, RenderProgress(phase="post_process"))
 
             if not video_output_path.exists():
                 raise BlenderProcessError("Rendered video file not found.")
 
+            if self.render_cache is not None:
+                self.render_cache.put(render_key, str(video_output_path))
+
             return str(video_output_path)
 
         finally:
             # Clean up temporary JSON file
             if json_file_path.exists():
                 json_file_path.unlink()
+
+    def _run_blender(
+        self,
+        glb_file_path: str,
+        json_file_path: str,
+        output_file_path: str,
+        blend_file_path: str | None,
+        frame_range: FrameRange | None = None,
+    ) -> Iterable[str]:
+        """
+        Run one render on a warm worker or a fresh Blender process.
+        """
+        if self.worker_pool is not None:
+            job: dict[str, Any] = {
+                "glb_file_path": glb_file_path,
+                "json_file_path": json_file_path,
+                "out_file_path": output_file_path,
+                "blend_file_path": blend_file_path,
+            }
+            if frame_range is not None:
+                job["frame_start"], job["frame_end"] = frame_range
+            return self.worker_pool.render(
+                job, self._new_watchdog, self._new_output_log()
+            )
+
+        return self._run_blender_process(
+            glb_file_path,
+            json_file_path,
+            output_file_path,
+            blend_file_path,
+            frame_range,
+        )
+
+    def _run_blender_process(
+        self,
+        glb_file_path: str,
+        json_file_path: str,
+        output_file_path: str,
+        blend_file_path: str | None,
+        frame_range: FrameRange | None,
+    ) -> Generator[str, None, None]:
+        """
+        Run a fresh Blender process inside a resource slot.
+        """
+        with self.resource_governor.acquire() as resource_profile:
+            command = self._build_blender_command(
+                glb_file_path,
+                json_file_path,
+                output_file_path,
+                blend_file_path,
+                frame_range,
+                resource_profile,
+            )
+            yield from self._execute_command(command, resource_profile)
+
+    @staticmethod
+    def _discard_placeholder_frames(frames_directory: Path) -> int:
+        """
+        Delete the empty placeholders of frames that were never finished.
+
+        Returns:
+            Number of finished frames left in the directory.
+        """
+        finished_frames = 0
+        for frame_file in frames_directory.glob(f"{FRAME_FILE_PREFIX}*"):
+            try:
+                if frame_file.stat().st_size == 0:
+                    frame_file.unlink()
+                else:
+                    finished_frames += 1
+            except OSError as e:
+                logger.warning(f"Cannot check frame {frame_file}: {e}")
+        return finished_frames
+
+    def _probe_scene_info(
+        self,
+        json_data: dict[str, Any],
+        json_file_path: str,
+        blend_file_path: str | None,
+    ) -> BlenderEvent:
+        """
+        Get the frame range and frame rate of a composition from Blender.
+
+        Blender runs in a resource slot like the shards it plans. Results are
+        remembered for the most recent base .blend files and compositions.
+        """
+        blend_file_path = blend_file_path or BLEND_BASE_FILE
+        if not blend_file_path:
+            raise BlenderProcessError("No .blend file to probe the scene from.")
+        blend_stat = Path(blend_file_path).stat()
+        cache_key = (
+            blend_file_path,
+            blend_stat.st_size,
+            blend_stat.st_mtime_ns,
+            hashlib.sha256(canonical_json(json_data).encode()).hexdigest(),
+        )
+        with self._scene_info_lock:
+            scene_info = self._scene_info_cache.get(cache_key)
+            if scene_info is not None:
+                self._scene_info_cache.move_to_end(cache_key)
+                return scene_info
+
+        with self.resource_governor.acquire() as resource_profile:
+            command = self._build_scene_info_command(
+                json_file_path, blend_file_path, resource_profile
+            )
+            for line in self._execute_command(command, resource_profile):
+                event = parse_blender_event(line)
+                if event is not None and event["event"] == "scene_info":
+                    scene_info = event
+        if scene_info is None:
+            raise BlenderProcessError("Blender did not report the scene frame range.")
+
+        with self._scene_info_lock:
+            self._scene_info_cache[cache_key] = scene_info
+            while len(self._scene_info_cache) > SCENE_INFO_CACHE_SIZE:
+                self._scene_info_cache.popitem(last=False)
+        return scene_info
+
+    def _render_sharded(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        json_file_path: str,
+        video_output_path: Path,
+        frames_directory: Path,
+        blend_file_path: str | None,
+        render_key: str,
+        timeline: RenderTimeline,
+    ) -> None:
+        """
+        Render the frames of one video in parallel shards and assemble them.
+        """
+        self._publish_progress(render_key, RenderProgress(phase="starting"))
+        scene_info = self._probe_scene_info(json_data, json_file_path, blend_file_path)
+        frames = list(
+            range(
+                int(scene_info["frame_start"]),
+                int(scene_info["frame_end"]) + 1,
+                max(1, int(scene_info.get("frame_step", 1))),
+            )
+        )
+        if not frames:
+            raise BlenderProcessError("The composition has no frames to render.")
+
+        frames_directory.mkdir(parents=True, exist_ok=True)
+        resumed_frames = self._discard_placeholder_frames(frames_directory)
+        if resumed_frames:
+            logger.info(f"Resuming render with {resumed_frames} frames already done")
+        render_started_at = time.monotonic()
+        self._publish_progress(
+            render_key, RenderProgress(phase="render", total_frames=len(frames))
+        )
+
+        def publish_frame(started_frames: int, total_frames: int) -> None:
+            frames_done = started_frames - 1
+            eta_seconds = None
+            if frames_done > 0:
+                elapsed = time.monotonic() - render_started_at
+                eta_seconds = elapsed / frames_done * (total_frames - frames_done)
+            self._publish_progress(
+                render_key,
+                RenderProgress(
+                    phase="render",
+                    frame=started_frames,
+                    total_frames=total_frames,
+                    eta_seconds=eta_seconds,
+                ),
+            )
+
+        try:
+            FrameShardScheduler(
+                frames,
+                workers=RENDER_SHARD_COUNT,
+                min_chunk_frames=RENDER_SHARD_MIN_FRAMES,
+                run_shard=lambda frame_start, frame_end: timeline.record(
+                    self._run_blender(
+                        glb_file_path,
+                        json_file_path,
+                        str(frames_directory / FRAME_FILE_PATTERN),
+                        blend_file_path,
+                        (frame_start, frame_end),
+                    )
+                ),
+                on_frame=publish_frame,
+            ).run()
+
+            self._publish_progress(render_key, RenderProgress(phase="post_process"))
+            assemble_image_sequence(
+                collect_frame_files(frames_directory, frames),
+                fps=float(scene_info.get("fps", 24)),
+                output_path=video_output_path,
+                ffmpeg_app=FFMPEG_APP,
+                codec_args=RENDER_SHARD_VIDEO_CODEC.split(),
+            )
+        finally:
+            shutil.rmtree(frames_directory, ignore_errors=True)
@@ -0,0 +1,287 @@
+"""
+Catalog Module
+
+This module renders a whole product catalog from a manifest. Each manifest
+row names a GLB file, a movement and VFX preset and an environment color, in
+CSV or JSON Lines form. Rows are validated before anything renders, rows that
+would produce the same video are rendered once, and every finished video is
+appended to a JSON Lines results index, so an interrupted run resumes where
+it stopped.
+"""
+
+import csv
+import json
+import re
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from src.blender_renderer import BlenderRenderer
+from src.composition import CompositionBuilder
+from src.glb_inspector import inspect_glb
+from src.render_cache import build_render_key
+from src.render_quality import RenderQuality, with_render_quality
+from utils.exceptions import CompositionError, GlbFileError, ManifestError
+from utils.logger import logger
+
+MANIFEST_FIELDS = ("glb_file_path", "movement", "vfx", "color")
+SAFE_NAME_PATTERN = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+@dataclass
+class CatalogItem:
+    """A validated manifest row."""
+
+    item_id: str
+    glb_file_path: str
+    movement: str
+    vfx: str
+    color: str
+    composition: dict[str, Any] = field(repr=False)
+    render_key: str = ""
+
+
+@dataclass
+class CatalogResult:
+    """A line of the results index."""
+
+    item_id: str
+    render_key: str
+    glb_file_path: str
+    movement: str
+    vfx: str
+    color: str
+    status: str
+    output_path: str | None = None
+    error: str | None = None
+    duration_seconds: float | None = None
+
+
+def read_manifest(manifest_path: str | Path) -> list[Any]:
+    """
+    Read manifest rows from a CSV file with a header or a JSON Lines file.
+
+    JSON Lines rows are returned as parsed; `validate_manifest` checks them.
+    """
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, newline="", encoding="utf-8") as f:
+        if manifest_path.suffix.lower() == ".csv":
+            return [dict(row) for row in csv.DictReader(f)]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def validate_manifest(
+    rows: list[Any],
+    composition_builder: CompositionBuilder,
+    quality: RenderQuality = "FINAL",
+    blender_renderer: BlenderRenderer | None = None,
+) -> list[CatalogItem]:
+    """
+    Validate every row and build its composition.
+
+    With a renderer, compositions are also checked against its base .blend
+    file, as web submissions are, waiting for Blender to extract its manifest.
+
+    Raises:
+        ManifestError: Listing every invalid row.
+    """
+    items = []
+    errors = []
+    seen_ids: set[str] = set()
+
+    for line_number, raw_row in enumerate(rows, start=1):
+        if not isinstance(raw_row, dict):
+            errors.append(
+                f"Row {line_number}: expected an object, got {type(raw_row).__name__}"
+            )
+            continue
+        row = {
+            name: "" if value is None else str(value) for name, value in raw_row.items()
+        }
+
+        missing = [name for name in MANIFEST_FIELDS if not row.get(name)]
+        if missing:
+            errors.append(f"Row {line_number}: missing {', '.join(missing)}")
+            continue
+
+        glb_file_path = str(Path(row["glb_file_path"]).expanduser().resolve())
+        if not Path(glb_file_path).is_file():
+            errors.append(f"Row {line_number}: GLB file not found: {glb_file_path}")
+            continue
+        try:
+            inspect_glb(glb_file_path)
+        except GlbFileError as e:
+            errors.append(f"Row {line_number}: {e}")
+            continue
+
+        try:
+            composition = composition_builder.build(
+                row["movement"], row["vfx"], row["color"]
+            )
+        except ValueError as e:
+            errors.append(f"Row {line_number}: {e}")
+            continue
+        composition = with_render_quality(composition, quality)
+
+        if blender_renderer is not None:
+            try:
+                blender_renderer.validate_composition(
+                    composition, wait_for_manifest=True
+                )
+            except CompositionError as e:
+                errors.append(f"Row {line_number}: {e}")
+                continue
+
+        item_id = row.get("id") or f"{Path(glb_file_path).stem}_{line_number}"
+        if item_id in seen_ids:
+            errors.append(f"Row {line_number}: duplicate id {item_id!r}")
+            continue
+        seen_ids.add(item_id)
+
+        items.append(
+            CatalogItem(
+                item_id=item_id,
+                glb_file_path=glb_file_path,
+                movement=row["movement"],
+                vfx=row["vfx"],
+                color=row["color"],
+                composition=composition,
+            )
+        )
+
+    if errors:
+        raise ManifestError(f"{len(errors)} invalid manifest rows", errors)
+    return items
+
+
+class CatalogRenderer:
+    """
+    Renders validated catalog items in parallel with a shared renderer.
+    """
+
+    def __init__(
+        self,
+        blender_renderer: BlenderRenderer,
+        output_directory: str | Path,
+        results_path: str | Path,
+        workers: int,
+    ) -> None:
+        self.blender_renderer = blender_renderer
+        self.output_directory = Path(output_directory)
+        self.results_path = Path(results_path)
+        self.workers = max(1, workers)
+        self._results_lock = threading.Lock()
+
+    def run(self, items: list[CatalogItem]) -> list[CatalogResult]:
+        """
+        Render all items not already in the results index.
+
+        Returns:
+            The results written during this run.
+        """
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        for item in items:
+            item.render_key = build_render_key(
+                item.glb_file_path, item.composition, None
+            )
+
+        finished = self._load_finished()
+        groups: dict[str, list[CatalogItem]] = {}
+        for item in items:
+            if item.item_id in finished:
+                continue
+            groups.setdefault(item.render_key, []).append(item)
+
+        resumed = sum(item.item_id in finished for item in items)
+        logger.info(
+            f"Catalog: {len(items)} items, {resumed} already done, "
+            f"{len(groups)} unique renders on {self.workers} workers"
+        )
+
+        results: list[CatalogResult] = []
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="catalog"
+        ) as executor:
+            futures = [
+                executor.submit(self._render, group) for group in groups.values()
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                group_results = future.result()
+                results.extend(group_results)
+                logger.info(
+                    f"Catalog: {done}/{len(futures)} renders finished "
+                    f"({group_results[0].item_id}: {group_results[0].status})"
+                )
+
+        return results
+
+    def _render(self, group: list[CatalogItem]) -> list[CatalogResult]:
+        """Render one unique video and record it for every item sharing it."""
+        leader = group[0]
+        output_path = self.output_directory / (
+            f"{SAFE_NAME_PATTERN.sub('_', leader.item_id)}.mov"
+        )
+        started_at = time.monotonic()
+
+        status = "SUCCESS"
+        error: str | None = None
+        result_path: str | None = str(output_path)
+        try:
+            video_path = self.blender_renderer.render_video_from_glb(
+                leader.glb_file_path, leader.composition
+            )
+            shutil.copyfile(video_path, output_path)
+        except Exception as e:
+            logger.error(f"Catalog item {leader.item_id} failed: {e}")
+            status, error, result_path = "FAILED", str(e), None
+
+        duration = time.monotonic() - started_at
+        results = [
+            CatalogResult(
+                item_id=item.item_id,
+                render_key=item.render_key,
+                glb_file_path=item.glb_file_path,
+                movement=item.movement,
+                vfx=item.vfx,
+                color=item.color,
+                status=status,
+                output_path=result_path,
+                error=error,
+                duration_seconds=round(duration, 3),
+            )
+            for item in group
+        ]
+        self._append_results(results)
+        return results
+
+    def _load_finished(self) -> set[str]:
+        """Ids of items whose video was rendered by an earlier run and still exists."""
+        if not self.results_path.exists():
+            return set()
+
+        finished = set()
+        with open(self.results_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a line cut short by an interrupted run
+                if (
+                    result.get("status") == "SUCCESS"
+                    and result.get("output_path")
+                    and Path(result["output_path"]).exists()
+                ):
+                    finished.add(result["item_id"])
+        return finished
+
+    def _append_results(self, results: list[CatalogResult]) -> None:
+        """Append results to the index as soon as a render finishes."""
+        self.results_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._results_lock, open(self.results_path, "a", encoding="utf-8") as f:
+            for result in results:
+                f.write(json.dumps(asdict(result)) + "\n")
+            f.flush()
@@ -0,0 +1,64 @@
+"""
+Composition Module
+
+This module builds the composition JSON that `process.py` imports into
+Blender from the preset names shown in the UI, so the Gradio app and the
+catalog renderer produce identical renders for the same choices.
+"""
+
+import json
+from pathlib import Path
+from typing import Any
+
+from utils.color_utils import ColorUtils
+
+ASSETS_FILE = Path(__file__).parent.parent / "assets" / "assets.json"
+
+
+class CompositionBuilder:
+    """Turns movement, VFX and color choices into composition data."""
+
+    def __init__(self, assets_path: str | Path = ASSETS_FILE) -> None:
+        with open(assets_path) as f:
+            self.assets: dict[str, dict[str, str]] = json.load(f)
+
+    @property
+    def movements(self) -> dict[str, str]:
+        """Movement preset captions mapped to their Blender action names."""
+        return self.assets.get("Movement", {})
+
+    @property
+    def vfx_shots(self) -> dict[str, str]:
+        """VFX preset captions mapped to their Blender collection names."""
+        return self.assets.get("VFX", {})
+
+    def build(
+        self, movement_caption: str, vfx_caption: str, environment_color: str
+    ) -> dict[str, Any]:
+        """
+        Build the composition data for a set of preset captions.
+
+        Raises:
+            ValueError: If a preset is unknown or the color cannot be parsed.
+        """
+        movement_name = self.movements.get(movement_caption)
+        if movement_name is None:
+            raise ValueError(f"Unknown movement preset: {movement_caption!r}")
+        vfx_name = self.vfx_shots.get(vfx_caption)
+        if vfx_name is None:
+            raise ValueError(f"Unknown VFX preset: {vfx_caption!r}")
+
+        return {
+            "MOVEMENT": {
+                "NAME": movement_name,
+                "SPEED": 1.2,
+                "INTERPOLATION": "None",
+                "ROTATION_DIRECTION": "CLOCKWISE",
+            },
+            "ENVIRONEMENT": {"BACKGOUND_COLOR": ColorUtils.to_hex(environment_color)},
+            "VFX_SHOT": {
+                "NAME": vfx_name,
+                "SPEED": 1.0,
+                "INTERPOLATION": "None",
+            },
+        }
@@ -1,9 +1,12 @@
 import os
 from pathlib import Path
 
-from dotenv import load_dotenv
+# Deployments set the environment directly; dotenv is only imported for a .env file
+ENV_FILE_PATH = Path(__file__).parent.parent / ".env"
+if ENV_FILE_PATH.is_file():
+    from dotenv import load_dotenv
 
-load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
+    load_dotenv(dotenv_path=ENV_FILE_PATH)
 
 IS_DEBUG = os.getenv("GRADIO_DEBUG", "True") == "True"
 SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8030"))
@@ -14,3 +17,200 @@ BLENDER_APP = os.getenv("BLENDER_APP")
 BLENDER_SCRIPT_FILE = os.getenv("BLENDER_SCRIPT_FILE")
 BLEND_BASE_FILE = os.getenv("BLENDER_BASE_FILE")
 BLENDER_FUNCTION_NAME = "process"
+BLENDER_SERVE_FUNCTION_NAME = "serve"
+BLENDER_SCENE_INFO_FUNCTION_NAME = "scene_info"
+BLENDER_DECIMATE_FUNCTION_NAME = "decimate_glb"
+BLENDER_MANIFEST_FUNCTION_NAME = "manifest"
+FFMPEG_APP = os.getenv("FFMPEG_APP", "ffmpeg")
+
+# Warm Blender worker pool (0 disables the pool and launches Blender per render)
+BLENDER_WORKER_POOL_SIZE = int(os.getenv("BLENDER_WORKER_POOL_SIZE", "0"))
+BLENDER_WORKER_MAX_JOBS = int(os.getenv("BLENDER_WORKER_MAX_JOBS", "25"))
+BLENDER_WORKER_MAX_RSS_MB = int(os.getenv("BLENDER_WORKER_MAX_RSS_MB", "4096"))
+BLENDER_WORKER_START_TIMEOUT = float(os.getenv("BLENDER_WORKER_START_TIMEOUT", "120"))
+BLENDER_WORKER_PING_TIMEOUT = float(os.getenv("BLENDER_WORKER_PING_TIMEOUT", "10"))
+
+# Background render jobs (concurrency is capped at the number of CPU cores)
+RENDER_MAX_CONCURRENT_JOBS = int(
+    os.getenv("RENDER_MAX_CONCURRENT_JOBS", str(os.cpu_count() or 1))
+)
+RENDER_JOB_HISTORY_SIZE = int(os.getenv("RENDER_JOB_HISTORY_SIZE", "200"))
+
+# Render cost model: queued jobs run shortest expected first, and every second a
+# job waits counts as this many seconds off its expected render time (0 is pure
+# shortest-first, large values approach first-come first-served)
+RENDER_SCHEDULER_AGING = float(os.getenv("RENDER_SCHEDULER_AGING", "1.0"))
+RENDER_COST_OVERHEAD_SECONDS = float(os.getenv("RENDER_COST_OVERHEAD_SECONDS", "15"))
+RENDER_COST_IMPORT_SECONDS_PER_MB = float(
+    os.getenv("RENDER_COST_IMPORT_SECONDS_PER_MB", "0.2")
+)
+RENDER_COST_FRAME_SECONDS = float(os.getenv("RENDER_COST_FRAME_SECONDS", "2.0"))
+RENDER_COST_DEFAULT_FRAMES = int(os.getenv("RENDER_COST_DEFAULT_FRAMES", "120"))
+RENDER_COST_MODEL_PATH = os.getenv(
+    "RENDER_COST_MODEL_PATH",
+    str(Path(__file__).parent.parent / "cache" / "cost_model.json"),
+)
+
+# Preview quality tier, the default output; with the upgrade the final render is
+# submitted alongside it and replaces it when done
+RENDER_PREVIEW_RESOLUTION_PERCENTAGE = int(
+    os.getenv("RENDER_PREVIEW_RESOLUTION_PERCENTAGE", "50")
+)
+RENDER_PREVIEW_SAMPLES = int(os.getenv("RENDER_PREVIEW_SAMPLES", "16"))
+RENDER_PREVIEW_FRAME_STEP = int(os.getenv("RENDER_PREVIEW_FRAME_STEP", "2"))
+RENDER_UPGRADE_TO_FINAL = os.getenv("RENDER_UPGRADE_TO_FINAL", "False") == "True"
+
+# Render watchdog: total time budget and allowed silence of a Blender run (0 disables)
+RENDER_TIMEOUT_SECONDS = float(os.getenv("RENDER_TIMEOUT_SECONDS", "3600"))
+RENDER_STALL_TIMEOUT_SECONDS = float(os.getenv("RENDER_STALL_TIMEOUT_SECONDS", "600"))
+
+# Blender output logging: one progress line per N frames, a capped number of other
+# lines, and a tail of the output that is dumped when a render fails
+BLENDER_LOG_FRAME_INTERVAL = int(os.getenv("BLENDER_LOG_FRAME_INTERVAL", "10"))
+BLENDER_LOG_MAX_LINES = int(os.getenv("BLENDER_LOG_MAX_LINES", "200"))
+BLENDER_LOG_TAIL_LINES = int(os.getenv("BLENDER_LOG_TAIL_LINES", "200"))
+
+# Prometheus metrics endpoint of the render pipeline (port 0 disables it)
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
+# Temporary render files (also bounds the age of Gradio's copies of the videos)
+TEMP_JANITOR_ENABLED = os.getenv("TEMP_JANITOR_ENABLED", "True") == "True"
+TEMP_MAX_MB = int(os.getenv("TEMP_MAX_MB", "20480"))
+TEMP_MAX_AGE_HOURS = float(os.getenv("TEMP_MAX_AGE_HOURS", "24"))
+TEMP_JANITOR_INTERVAL_SECONDS = float(os.getenv("TEMP_JANITOR_INTERVAL_SECONDS", "60"))
+
+# Frame-range sharding of one render across Blender processes (1 disables it)
+RENDER_SHARD_COUNT = int(os.getenv("RENDER_SHARD_COUNT", "1"))
+RENDER_SHARD_MIN_FRAMES = int(os.getenv("RENDER_SHARD_MIN_FRAMES", "4"))
+RENDER_SHARD_VIDEO_CODEC = os.getenv(
+    "RENDER_SHARD_VIDEO_CODEC", "-c:v libx264 -pix_fmt yuv420p -crf 18"
+)
+
+# Per-process resource governance of Blender (0 leaves a setting to Blender/the OS).
+# Slots default to one per warm worker plus one per concurrent Blender process;
+# CPUs are split between them. Warm workers keep their slots, so set at least one
+# slot more than BLENDER_WORKER_POOL_SIZE for probes, decimation and manifests.
+BLENDER_RESOURCE_SLOTS = int(os.getenv("BLENDER_RESOURCE_SLOTS", "0"))
+BLENDER_THREADS = int(os.getenv("BLENDER_THREADS", "0"))
+BLENDER_PIN_CPUS = os.getenv("BLENDER_PIN_CPUS", "False") == "True"
+BLENDER_MEMORY_LIMIT_MB = int(os.getenv("BLENDER_MEMORY_LIMIT_MB", "0"))
+BLENDER_MEMORY_LIMIT_MODE = os.getenv("BLENDER_MEMORY_LIMIT_MODE", "rlimit")
+BLENDER_CGROUP_ROOT = os.getenv("BLENDER_CGROUP_ROOT", "/sys/fs/cgroup/productvideo")
+BLENDER_NICE = int(os.getenv("BLENDER_NICE", "0"))
+
+# Cache of normalized product imports, stored by Blender as .blend libraries
+IMPORT_CACHE_ENABLED = os.getenv("IMPORT_CACHE_ENABLED", "True") == "True"
+IMPORT_CACHE_DIRECTORY = os.getenv(
+    "IMPORT_CACHE_DIRECTORY", str(Path(__file__).parent.parent / "cache" / "imports")
+)
+IMPORT_CACHE_MAX_MB = int(os.getenv("IMPORT_CACHE_MAX_MB", "10240"))
+
+# Pre-flight limits of uploaded GLB files (0 disables a limit)
+GLB_MAX_FILE_MB = int(os.getenv("GLB_MAX_FILE_MB", "2048"))
+GLB_MAX_VERTICES = int(os.getenv("GLB_MAX_VERTICES", "0"))
+
+# GLB optimizer: textures are downscaled to the product's on-screen size, the
+# frame size being the long side of the output in pixels; meshes above the triangle
+# budget are decimated (0 disables decimation)
+GLB_OPTIMIZER_ENABLED = os.getenv("GLB_OPTIMIZER_ENABLED", "True") == "True"
+GLB_OPTIMIZER_CACHE_DIRECTORY = os.getenv(
+    "GLB_OPTIMIZER_CACHE_DIRECTORY",
+    str(Path(__file__).parent.parent / "cache" / "optimized"),
+)
+GLB_OPTIMIZER_CACHE_MAX_MB = int(os.getenv("GLB_OPTIMIZER_CACHE_MAX_MB", "10240"))
+GLB_OPTIMIZER_FRAME_SIZE = int(os.getenv("GLB_OPTIMIZER_FRAME_SIZE", "1920"))
+GLB_OPTIMIZER_SCREEN_COVERAGE = float(os.getenv("GLB_OPTIMIZER_SCREEN_COVERAGE", "0.5"))
+GLB_OPTIMIZER_TEXEL_DENSITY = float(os.getenv("GLB_OPTIMIZER_TEXEL_DENSITY", "2.0"))
+GLB_OPTIMIZER_MIN_TEXTURE_SIZE = int(os.getenv("GLB_OPTIMIZER_MIN_TEXTURE_SIZE", "256"))
+GLB_OPTIMIZER_MAX_TRIANGLES = int(os.getenv("GLB_OPTIMIZER_MAX_TRIANGLES", "0"))
+
+# Content-addressed cache of rendered videos
+RENDER_CACHE_ENABLED = os.getenv("RENDER_CACHE_ENABLED", "True") == "True"
+RENDER_CACHE_DIRECTORY = os.getenv(
+    "RENDER_CACHE_DIRECTORY", str(Path(__file__).parent.parent / "cache" / "renders")
+)
+RENDER_CACHE_MAX_MB = int(os.getenv("RENDER_CACHE_MAX_MB", "10240"))
+PRODUCTVIDEO_ADDON_DIR = os.getenv(
+    "PRODUCTVIDEO_ADDON_DIR",
+    str(Path(BLENDER_SCRIPT_FILE).parent.parent / "productvideo")
+    if BLENDER_SCRIPT_FILE
+    else "",
+)
+
+# Distributed rendering: render worker agents pull jobs from a shared SQLite queue
+# and copy the videos to shared storage; a job whose worker stops renewing its lease
+# is requeued until it was attempted RENDER_QUEUE_MAX_ATTEMPTS times. With the queue
+# enabled the web tier only enqueues renders, copying uploads to shared storage.
+# Finished queue jobs are kept up to a count and an age, and the web tier deletes
+# uploads and videos past the same age or over RENDER_STORAGE_MAX_MB per directory
+RENDER_QUEUE_ENABLED = os.getenv("RENDER_QUEUE_ENABLED", "False") == "True"
+RENDER_QUEUE_PATH = os.getenv(
+    "RENDER_QUEUE_PATH", str(Path(__file__).parent.parent / "queue" / "render_queue.db")
+)
+RENDER_QUEUE_MAX_ATTEMPTS = int(os.getenv("RENDER_QUEUE_MAX_ATTEMPTS", "3"))
+RENDER_QUEUE_MAX_FINISHED_JOBS = int(
+    os.getenv("RENDER_QUEUE_MAX_FINISHED_JOBS", "10000")
+)
+RENDER_STORAGE_DIRECTORY = os.getenv(
+    "RENDER_STORAGE_DIRECTORY", str(Path(__file__).parent.parent / "storage")
+)
+RENDER_UPLOAD_DIRECTORY = os.getenv(
+    "RENDER_UPLOAD_DIRECTORY", str(Path(RENDER_STORAGE_DIRECTORY) / "uploads")
+)
+RENDER_VIDEO_DIRECTORY = os.getenv(
+    "RENDER_VIDEO_DIRECTORY", str(Path(RENDER_STORAGE_DIRECTORY) / "videos")
+)
+RENDER_STORAGE_MAX_AGE_HOURS = float(os.getenv("RENDER_STORAGE_MAX_AGE_HOURS", "168"))
+RENDER_STORAGE_MAX_MB = int(os.getenv("RENDER_STORAGE_MAX_MB", "51200"))
+RENDER_WORKER_LEASE_SECONDS = float(os.getenv("RENDER_WORKER_LEASE_SECONDS", "60"))
+RENDER_WORKER_HEARTBEAT_SECONDS = float(
+    os.getenv("RENDER_WORKER_HEARTBEAT_SECONDS", "15")
+)
+RENDER_WORKER_POLL_SECONDS = float(os.getenv("RENDER_WORKER_POLL_SECONDS", "2"))
+
+# Durable job store: jobs interrupted by a restart are requeued on startup, unless
+# they were already interrupted JOB_MAX_RECOVERIES times. Finished jobs are
+# kept up to a count and an age (0 disables a limit); keep more than
+# RENDER_JOB_HISTORY_SIZE, so results of jobs are found after a restart
+JOB_STORE_ENABLED = os.getenv("JOB_STORE_ENABLED", "True") == "True"
+JOB_STORE_PATH = os.getenv(
+    "JOB_STORE_PATH", str(Path(__file__).parent.parent / "state" / "jobs.db")
+)
+JOB_MAX_RECOVERIES = int(os.getenv("JOB_MAX_RECOVERIES", "2"))
+JOB_STORE_MAX_FINISHED_JOBS = int(os.getenv("JOB_STORE_MAX_FINISHED_JOBS", "1000"))
+JOB_STORE_MAX_AGE_DAYS = float(os.getenv("JOB_STORE_MAX_AGE_DAYS", "30"))
+
+# Delivery encoding of rendered videos into faststart H.264 MP4s, one per ladder
+# step "name:crf:preset[:max_height]", best first; the files have content-hashed
+# names and are served with range support (port 0 disables the server); encodes
+# run in the background after the Blender output is shown, a few at a time
+DELIVERY_ENABLED = os.getenv("DELIVERY_ENABLED", "True") == "True"
+DELIVERY_DIRECTORY = os.getenv(
+    "DELIVERY_DIRECTORY", str(Path(__file__).parent.parent / "cache" / "delivery")
+)
+DELIVERY_MAX_MB = int(os.getenv("DELIVERY_MAX_MB", "10240"))
+DELIVERY_LADDER = os.getenv("DELIVERY_LADDER", "1080p:20:medium:1080,540p:26:fast:540")
+DELIVERY_MAX_CONCURRENT_ENCODES = int(os.getenv("DELIVERY_MAX_CONCURRENT_ENCODES", "1"))
+DELIVERY_HOST = os.getenv("DELIVERY_HOST", "127.0.0.1")
+DELIVERY_PORT = int(os.getenv("DELIVERY_PORT", "8031"))
+DELIVERY_BASE_URL = os.getenv("DELIVERY_BASE_URL", "")
+
+# Preset thumbnails of the gallery: preview images named after the preset code
+# (e.g. VFX_SNOW.jpg) are downscaled to the size, other presets get a placeholder
+THUMBNAIL_DIRECTORY = os.getenv(
+    "THUMBNAIL_DIRECTORY", str(Path(__file__).parent.parent / "cache" / "thumbnails")
+)
+THUMBNAIL_PREVIEW_DIRECTORY = os.getenv(
+    "THUMBNAIL_PREVIEW_DIRECTORY",
+    str(Path(__file__).parent.parent / "assets" / "preset_previews"),
+)
+THUMBNAIL_SIZE = int(os.getenv("THUMBNAIL_SIZE", "256"))
+
+# Manifest of the actions, collections and materials of the base .blend file,
+# extracted by Blender once per file version; compositions are checked against it
+BLEND_MANIFEST_ENABLED = os.getenv("BLEND_MANIFEST_ENABLED", "True") == "True"
+BLEND_MANIFEST_DIRECTORY = os.getenv(
+    "BLEND_MANIFEST_DIRECTORY",
+    str(Path(__file__).parent.parent / "cache" / "manifests"),
+)
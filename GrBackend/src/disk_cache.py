@@ -0,0 +1,182 @@
+"""
+Disk Cache Module
+
+This module provides a content-addressed file cache bounded by total size.
+Entries are files named after their key, and the least recently used entries
+are evicted first. Recency is kept in the file modification time, which is
+refreshed on every hit, so the eviction order survives restarts.
+"""
+
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from utils.logger import logger
+
+
+class DiskCache:
+    """
+    Size-bounded LRU cache of files in a single directory.
+
+    Keys must be safe file name stems, such as hex digests.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int, name: str) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.name = name
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._entries: OrderedDict[str, tuple[Path, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._lock = threading.Lock()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._load_entries()
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all cached files."""
+        return self._size_bytes
+
+    def get(self, key: str) -> Path | None:
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            Path of the cached file, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry[0].exists():
+                self._drop(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            path = entry[0]
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+
+        try:
+            os.utime(path)
+        except OSError as e:
+            logger.debug(f"Cannot refresh {self.name} cache entry {path}: {e}")
+        return path
+
+    def put(self, key: str, source_path: str | Path) -> Path | None:
+        """
+        Store a file under a key without touching the source file.
+
+        The entry is hard-linked where possible and copied otherwise.
+
+        Returns:
+            Path of the cached file, or None if the file does not fit the cache.
+        """
+        source = Path(source_path)
+        size = source.stat().st_size
+        if size > self.max_bytes:
+            logger.warning(
+                f"Not caching {source} in {self.name} cache: {size} bytes exceeds "
+                f"the {self.max_bytes} byte limit"
+            )
+            return None
+
+        target = self.path_for(key, source.suffix)
+        staging = target.with_name(f".{target.name}.tmp")
+        try:
+            os.link(source, staging)
+        except OSError:
+            shutil.copy2(source, staging)
+        os.replace(staging, target)
+
+        self.register(key, target)
+        return target
+
+    def path_for(self, key: str, suffix: str = "") -> Path:
+        """Path an entry with the given key and suffix is stored at."""
+        return self.directory / f"{key}{suffix}"
+
+    def register(self, key: str, path: str | Path) -> None:
+        """
+        Track a file written directly into the cache directory and evict
+        older entries if the cache is over its size limit.
+        """
+        path = Path(path)
+        with self._lock:
+            if key in self._entries:
+                previous_path = self._drop(key)
+                if previous_path != path:
+                    previous_path.unlink(missing_ok=True)
+            size = self._file_size(path)
+            self._entries[key] = (path, size)
+            self._size_bytes += size
+            self._evict()
+
+    def stats(self) -> dict[str, Any]:
+        """Counters and usage of the cache."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _load_entries(self) -> None:
+        """Index existing cache files, oldest first."""
+        files = [
+            path
+            for path in self.directory.iterdir()
+            if path.is_file() and not path.name.startswith(".")
+        ]
+        files.sort(key=lambda path: path.stat().st_mtime)
+
+        for path in files:
+            size = self._file_size(path)
+            self._entries[path.name.split(".", 1)[0]] = (path, size)
+            self._size_bytes += size
+
+        self._evict()
+        logger.info(
+            f"{self.name} cache loaded {len(self._entries)} entries "
+            f"({self._size_bytes} bytes) from {self.directory}"
+        )
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits."""
+        while self._size_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            path = self._drop(key)
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Cannot evict {self.name} cache entry {path}: {e}")
+            self.evictions += 1
+            logger.debug(f"Evicted {self.name} cache entry {key}")
+
+    def _drop(self, key: str) -> Path:
+        """Forget an entry and its size, returning the entry's path."""
+        path, size = self._entries.pop(key)
+        self._size_bytes -= size
+        return path
+
+    @staticmethod
+    def _file_size(path: Path) -> int:
+        """Size of a file, or 0 if it is gone."""
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
@@ -8,6 +8,7 @@ This module provides comprehensive file handling utilities including:
 - JSON file operations (read/write)
 - Directory traversal and file discovery
 - Base64 encoding/decoding for file data
+- Content hashing of files
 
 The module is designed to handle various file formats and provides
 robust error handling and validation for file operations.
@@ -15,21 +16,26 @@ robust error handling and validation for file operations.
 
 import base64
 import binascii  # Import binascii directly
+import hashlib
 import json
 import os
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from zipfile import BadZipFile, ZipFile
 
-import numpy as np
-import numpy.typing as npt
-
 from utils.exceptions import FileHandlerError
 from utils.logger import logger
 
+if TYPE_CHECKING:
+    # numpy is imported by the array helpers only, the render path never needs it
+    import numpy as np
+    import numpy.typing as npt
+
 # Type aliases for better readability
 JsonData = dict[str, Any] | list[Any] | str | int | float | bool | None
 
+HASH_CHUNK_SIZE = 1024 * 1024
+
 
 class FileHandler:
     """
@@ -352,7 +358,7 @@ class FileHandler:
 
     # Binary File Operations
     @staticmethod
-    def read_binary_file(file_path: str | Path) -> npt.NDArray[np.uint8]:
+    def read_binary_file(file_path: str | Path) -> "npt.NDArray[np.uint8]":
         """
         Read a binary file as numpy array.
 
@@ -365,6 +371,7 @@ class FileHandler:
         Raises:
             FileHandlerError: If reading fails.
         """
+        import numpy as np
 
         try:
             data = np.fromfile(file_path, dtype="uint8")
@@ -379,7 +386,7 @@ class FileHandler:
             raise FileHandlerError(error_msg, str(file_path)) from e
 
     @staticmethod
-    def write_binary_file(file_path: str | Path, data: npt.NDArray[np.uint8]) -> None:
+    def write_binary_file(file_path: str | Path, data: "npt.NDArray[np.uint8]") -> None:
         """
         Write numpy array data to a binary file.
 
@@ -390,6 +397,8 @@ class FileHandler:
         Raises:
             FileHandlerError: If writing fails.
         """
+        import numpy as np
+
         if not isinstance(data, np.ndarray):
             raise FileHandlerError("Data must be a numpy array")
 
@@ -412,7 +421,7 @@ class FileHandler:
 
     # CSV File Operations
     @staticmethod
-    def read_csv_file(file_path: str | Path) -> np.ndarray:
+    def read_csv_file(file_path: str | Path) -> "np.ndarray":
         """
         Read a CSV file as numpy array.
 
@@ -425,6 +434,7 @@ class FileHandler:
         Raises:
             FileHandlerError: If reading fails.
         """
+        import numpy as np
 
         try:
             data = np.genfromtxt(file_path, delimiter=",", dtype=int)
@@ -438,7 +448,7 @@ class FileHandler:
 
     @staticmethod
     def write_csv_file(
-        file_path: str | Path, data: np.ndarray, reshape_size: tuple | None = None
+        file_path: str | Path, data: "np.ndarray", reshape_size: tuple | None = None
     ) -> None:
         """
         Write numpy array data to a CSV file.
@@ -451,6 +461,8 @@ class FileHandler:
         Raises:
             FileHandlerError: If writing fails.
         """
+        import numpy as np
+
         if not isinstance(data, np.ndarray):
             raise FileHandlerError("Data must be a numpy array")
 
@@ -544,3 +556,32 @@ class FileHandler:
             error_msg = f"Failed to write JSON file {file_path}: {e}"
             logger.error(error_msg)
             raise FileHandlerError(error_msg, str(file_path)) from e
+
+    # Hashing Operations
+    @staticmethod
+    def compute_file_hash(file_path: str | Path, algorithm: str = "sha256") -> str:
+        """
+        Compute the hex digest of a file's content, reading it in chunks.
+
+        Args:
+            file_path: Path to the file to hash.
+            algorithm: Name of a hashlib algorithm (default: sha256).
+
+        Returns:
+            Hex digest of the file content.
+
+        Raises:
+            FileHandlerError: If reading fails.
+        """
+
+        try:
+            digest = hashlib.new(algorithm)
+            with open(file_path, "rb") as file_handle:
+                while chunk := file_handle.read(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+            return digest.hexdigest()
+
+        except Exception as e:
+            error_msg = f"Failed to hash file {file_path}: {e}"
+            logger.error(error_msg)
+            raise FileHandlerError(error_msg, str(file_path)) from e
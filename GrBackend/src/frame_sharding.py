@@ -0,0 +1,274 @@
+"""
+Frame Sharding Module
+
+This module splits the frame range of one video across several Blender
+processes. Frames are handed out in chunks that shrink as the range runs out,
+and once nothing is left to hand out, idle processes help the slowest shard by
+taking the upper half of its remaining frames, repeatedly if needed. Shards
+render PNG sequences with Blender's placeholder/no-overwrite settings, so
+overlapping shards skip frames another process already claimed. The finished
+sequence is assembled into a video with ffmpeg.
+"""
+
+import math
+import shutil
+import subprocess
+import threading
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.render_progress import FRAME_PATTERN
+from utils.exceptions import BlenderProcessError
+from utils.logger import logger
+
+FRAME_FILE_PREFIX = "frame_"
+FRAME_FILE_PATTERN = f"{FRAME_FILE_PREFIX}#####"
+FRAME_FILE_EXTENSION = ".png"
+
+ShardRunner = Callable[[int, int], Generator[str, None, None]]
+FrameCallback = Callable[[int, int], None]
+
+
+@dataclass
+class FrameShard:
+    """A contiguous frame range rendered by one Blender process."""
+
+    shard_id: int
+    first_index: int
+    last_index: int
+    current_index: int | None = None
+    finished: bool = False
+
+    def remaining_frames(self) -> int:
+        """Frames of the shard not started yet by this shard's process."""
+        start = (
+            self.first_index if self.current_index is None else self.current_index + 1
+        )
+        return max(0, self.last_index - start + 1)
+
+
+class FrameShardScheduler:
+    """
+    Renders a list of frames with a fixed number of parallel shard processes.
+    """
+
+    def __init__(
+        self,
+        frames: list[int],
+        workers: int,
+        min_chunk_frames: int,
+        run_shard: ShardRunner,
+        on_frame: FrameCallback | None = None,
+    ) -> None:
+        self.frames = frames
+        self.workers = max(1, min(workers, len(frames)))
+        self.min_chunk_frames = max(1, min_chunk_frames)
+        self.run_shard = run_shard
+        self.on_frame = on_frame
+
+        self._frame_indexes = {frame: index for index, frame in enumerate(frames)}
+        self._next_index = 0
+        self._shards: list[FrameShard] = []
+        self._started_frames: set[int] = set()
+        self._errors: list[Exception] = []
+        self._failed = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self) -> None:
+        """
+        Render all frames, blocking until every shard has finished.
+
+        Raises:
+            BlenderProcessError: If any shard failed.
+        """
+        threads = [
+            threading.Thread(
+                target=self._worker_loop, name=f"frame-shard-{worker}", daemon=True
+            )
+            for worker in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            error = self._errors[0]
+            if isinstance(error, BlenderProcessError):
+                raise error
+            raise BlenderProcessError(f"Frame shard failed: {error}") from error
+
+        logger.info(
+            f"Rendered {len(self.frames)} frames in {len(self._shards)} shards "
+            f"on {self.workers} processes"
+        )
+
+    def _worker_loop(self) -> None:
+        """Keep taking shards until there is nothing left to render or help with."""
+        while (shard := self._next_shard()) is not None:
+            first_frame = self.frames[shard.first_index]
+            last_frame = self.frames[shard.last_index]
+            logger.debug(
+                f"Shard {shard.shard_id} rendering frames {first_frame}-{last_frame}"
+            )
+
+            lines = self.run_shard(first_frame, last_frame)
+            try:
+                for line in lines:
+                    if self._failed.is_set():
+                        logger.info(
+                            f"Stopping shard {shard.shard_id}, another shard failed"
+                        )
+                        return
+                    frame_match = FRAME_PATTERN.match(line)
+                    if frame_match:
+                        self._record_frame(shard, int(frame_match.group(1)))
+            except Exception as e:
+                logger.error(f"Shard {shard.shard_id} failed: {e}")
+                with self._lock:
+                    self._errors.append(e)
+                self._failed.set()
+                return
+            finally:
+                shard.finished = True
+                # Closing the output stops the shard's Blender process
+                lines.close()
+
+    def _next_shard(self) -> FrameShard | None:
+        """
+        Hand out the next chunk of unassigned frames, or split the slowest
+        running shard once all frames are assigned.
+        """
+        with self._lock:
+            if self._errors:
+                return None
+
+            remaining = len(self.frames) - self._next_index
+            if remaining > 0:
+                chunk = max(
+                    self.min_chunk_frames, math.ceil(remaining / (2 * self.workers))
+                )
+                shard = self._add_shard(
+                    self._next_index,
+                    min(len(self.frames), self._next_index + chunk) - 1,
+                )
+                self._next_index = shard.last_index + 1
+                return shard
+
+            stragglers = [
+                shard
+                for shard in self._shards
+                if not shard.finished and shard.remaining_frames() >= 2
+            ]
+            if not stragglers:
+                return None
+
+            straggler = max(stragglers, key=FrameShard.remaining_frames)
+            helper_first = straggler.last_index - straggler.remaining_frames() // 2 + 1
+            helper_last = straggler.last_index
+            # The straggler keeps running to its original end but skips the
+            # frames the helper claims; it only owns the lower half from now on.
+            straggler.last_index = helper_first - 1
+            logger.info(
+                f"Splitting straggler shard {straggler.shard_id} at frame "
+                f"{self.frames[helper_first]}"
+            )
+            return self._add_shard(helper_first, helper_last)
+
+    def _add_shard(self, first_index: int, last_index: int) -> FrameShard:
+        """Create and track a shard (the caller holds the lock)."""
+        shard = FrameShard(len(self._shards), first_index, last_index)
+        self._shards.append(shard)
+        return shard
+
+    def _record_frame(self, shard: FrameShard, frame: int) -> None:
+        """Track the frame a shard has started and report overall progress."""
+        index = self._frame_indexes.get(frame)
+        if index is None:
+            return
+        with self._lock:
+            shard.current_index = index
+            self._started_frames.add(frame)
+            started = len(self._started_frames)
+        if self.on_frame is not None:
+            self.on_frame(started, len(self.frames))
+
+
+def collect_frame_files(frames_directory: Path, frames: list[int]) -> list[Path]:
+    """
+    Return the rendered frame files in order.
+
+    Raises:
+        BlenderProcessError: If frames are missing or only placeholders.
+    """
+    frame_files = [
+        frames_directory / f"{FRAME_FILE_PREFIX}{frame:05d}{FRAME_FILE_EXTENSION}"
+        for frame in frames
+    ]
+    missing = [
+        frame
+        for frame, path in zip(frames, frame_files, strict=True)
+        if not path.exists() or path.stat().st_size == 0
+    ]
+    if missing:
+        raise BlenderProcessError(
+            f"{len(missing)} frames were not rendered, first missing frame {missing[0]}"
+        )
+    return frame_files
+
+
+def assemble_image_sequence(
+    frame_files: list[Path],
+    fps: float,
+    output_path: Path,
+    ffmpeg_app: str,
+    codec_args: list[str],
+) -> None:
+    """
+    Encode ordered frame files into a video with ffmpeg.
+
+    Frames are linked into a contiguous sequence next to them first, so frame
+    steps and gaps in the numbering do not matter.
+    """
+    sequence_directory = frame_files[0].parent / "sequence"
+    sequence_directory.mkdir(parents=True, exist_ok=True)
+
+    try:
+        for index, frame_file in enumerate(frame_files):
+            sequence_file = sequence_directory / f"{index:06d}{FRAME_FILE_EXTENSION}"
+            try:
+                sequence_file.hardlink_to(frame_file)
+            except OSError:
+                shutil.copy2(frame_file, sequence_file)
+
+        command = [
+            ffmpeg_app,
+            "-y",
+            "-loglevel",
+            "error",
+            "-framerate",
+            f"{fps:g}",
+            "-i",
+            str(sequence_directory / f"%06d{FRAME_FILE_EXTENSION}"),
+            *codec_args,
+            str(output_path),
+        ]
+        logger.debug(f"Command: {' '.join(command)}")
+
+        try:
+            completed = subprocess.run(
+                command, capture_output=True, text=True, check=False
+            )
+        except FileNotFoundError as e:
+            raise BlenderProcessError(
+                f"ffmpeg executable not found: {ffmpeg_app}"
+            ) from e
+
+        if completed.returncode != 0:
+            raise BlenderProcessError(
+                f"Video assembly failed: {completed.stderr.strip()}",
+                completed.returncode,
+            )
+    finally:
+        shutil.rmtree(sequence_directory, ignore_errors=True)
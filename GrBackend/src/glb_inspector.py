@@ -0,0 +1,310 @@
+"""
+GLB Inspector Module
+
+This module validates a GLB file and summarizes its contents without
+decoding its buffers. Only the header, the JSON chunk and the first bytes of
+each embedded image are read, through a memory map, so a corrupt file is
+rejected in milliseconds instead of after Blender has started, and the
+counts are cheap enough to feed scheduling and quality decisions.
+"""
+
+import json
+import mmap
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from utils.exceptions import GlbFileError
+
+GLB_MAGIC = b"glTF"
+GLB_CHUNK_JSON = 0x4E4F534A
+GLB_CHUNK_BIN = 0x004E4942
+GLB_HEADER = struct.Struct("<4sII")
+GLB_CHUNK_HEADER = struct.Struct("<II")
+
+TRIANGLE_MODES = (4, 5, 6)  # triangles, triangle strip, triangle fan
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+@dataclass(frozen=True)
+class TextureInfo:
+    """An image of the GLB file."""
+
+    mime_type: str
+    width: int | None
+    height: int | None
+    byte_length: int
+    embedded: bool
+
+
+@dataclass(frozen=True)
+class GlbStats:
+    """What a GLB file contains, as declared by its JSON chunk."""
+
+    file_bytes: int
+    json_bytes: int
+    buffer_bytes: int
+    mesh_count: int
+    primitive_count: int
+    vertex_count: int
+    index_count: int
+    triangle_count: int
+    textures: tuple[TextureInfo, ...] = ()
+    animation_count: int = 0
+    skin_count: int = 0
+    external_uris: tuple[str, ...] = ()
+
+    @property
+    def texture_count(self) -> int:
+        """Number of images."""
+        return len(self.textures)
+
+    @property
+    def max_texture_size(self) -> int:
+        """Longest side of the largest image whose size is known."""
+        return max(
+            (
+                max(texture.width, texture.height)
+                for texture in self.textures
+                if texture.width is not None and texture.height is not None
+            ),
+            default=0,
+        )
+
+    @property
+    def has_animations(self) -> bool:
+        """Whether the file carries animations."""
+        return self.animation_count > 0
+
+    @property
+    def has_skins(self) -> bool:
+        """Whether the file carries skinned meshes."""
+        return self.skin_count > 0
+
+
+def count_triangles(gltf: dict[str, Any]) -> int:
+    """Number of triangles drawn by the scene, counting every mesh instance."""
+    accessors = gltf.get("accessors", [])
+    meshes = gltf.get("meshes", [])
+
+    def mesh_triangles(mesh: dict[str, Any]) -> int:
+        triangles = 0
+        for primitive in mesh.get("primitives", []):
+            mode = primitive.get("mode", 4)
+            if mode not in TRIANGLE_MODES:
+                continue
+            accessor_index = primitive.get("indices")
+            if accessor_index is None:
+                accessor_index = primitive.get("attributes", {}).get("POSITION")
+            if accessor_index is None:
+                continue
+            count = int(accessors[accessor_index].get("count", 0))
+            triangles += count // 3 if mode == 4 else max(0, count - 2)
+        return triangles
+
+    instances = [node["mesh"] for node in gltf.get("nodes", []) if "mesh" in node]
+    if not instances:
+        instances = list(range(len(meshes)))
+    return sum(mesh_triangles(meshes[index]) for index in instances)
+
+
+def inspect_glb(file_path: str | Path) -> GlbStats:
+    """
+    Validate a GLB file and count what it contains.
+
+    Raises:
+        GlbFileError: If the file is not a valid glTF 2.0 binary file.
+    """
+    file_path = Path(file_path)
+    try:
+        file_bytes = file_path.stat().st_size
+    except OSError as e:
+        raise GlbFileError(f"Cannot read GLB file: {e}", str(file_path)) from e
+    if file_bytes < GLB_HEADER.size + GLB_CHUNK_HEADER.size:
+        raise GlbFileError("File is too short to be a GLB file", str(file_path))
+
+    try:
+        with (
+            open(file_path, "rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            return _inspect(data, file_bytes, str(file_path))
+    except OSError as e:
+        raise GlbFileError(f"Cannot read GLB file: {e}", str(file_path)) from e
+    except (
+        AttributeError,
+        TypeError,
+        ValueError,
+        KeyError,
+        IndexError,
+        struct.error,
+    ) as e:
+        raise GlbFileError(f"Malformed GLB file: {e!r}", str(file_path)) from e
+
+
+def _inspect(data: mmap.mmap, file_bytes: int, file_path: str) -> GlbStats:
+    """Parse the header and JSON chunk of a mapped GLB file."""
+
+    def fail(message: str) -> GlbFileError:
+        return GlbFileError(message, file_path)
+
+    magic, version, length = GLB_HEADER.unpack_from(data)
+    if magic != GLB_MAGIC:
+        raise fail("Not a GLB file")
+    if version != 2:
+        raise fail(f"Unsupported glTF version {version}")
+    if length != file_bytes:
+        raise fail(f"GLB header declares {length} bytes, the file has {file_bytes}")
+
+    json_length, json_type = GLB_CHUNK_HEADER.unpack_from(data, GLB_HEADER.size)
+    json_start = GLB_HEADER.size + GLB_CHUNK_HEADER.size
+    if json_type != GLB_CHUNK_JSON:
+        raise fail("The first GLB chunk is not JSON")
+    if json_start + json_length > length:
+        raise fail("The JSON chunk runs past the end of the file")
+
+    try:
+        gltf = json.loads(data[json_start : json_start + json_length])
+    except ValueError as e:
+        raise fail(f"Invalid GLB JSON chunk: {e}") from e
+    if not isinstance(gltf, dict):
+        raise fail("The GLB JSON chunk is not an object")
+    if not str(gltf.get("asset", {}).get("version", "")).startswith("2"):
+        raise fail("The GLB file is not glTF 2.0")
+
+    binary_start = binary_length = 0
+    binary_header_at = json_start + json_length
+    if binary_header_at + GLB_CHUNK_HEADER.size <= length:
+        binary_length, binary_type = GLB_CHUNK_HEADER.unpack_from(
+            data, binary_header_at
+        )
+        binary_start = binary_header_at + GLB_CHUNK_HEADER.size
+        if binary_type != GLB_CHUNK_BIN:
+            binary_length = 0
+        elif binary_start + binary_length > length:
+            raise fail("The binary chunk runs past the end of the file")
+
+    buffers = gltf.get("buffers", [])
+    buffer_views = gltf.get("bufferViews", [])
+    accessors = gltf.get("accessors", [])
+    meshes = gltf.get("meshes", [])
+
+    external_uris = []
+    for index, buffer in enumerate(buffers):
+        uri = buffer.get("uri")
+        if uri is None:
+            if index != 0:
+                raise fail(f"Buffer {index} has no URI")
+            if buffer.get("byteLength", 0) > binary_length:
+                raise fail("Buffer 0 is larger than the binary chunk")
+        elif not uri.startswith("data:"):
+            external_uris.append(uri)
+
+    for index, view in enumerate(buffer_views):
+        buffer_index = view.get("buffer", -1)
+        if not 0 <= buffer_index < len(buffers):
+            raise fail(f"Buffer view {index} refers to a missing buffer")
+        end = view.get("byteOffset", 0) + view.get("byteLength", 0)
+        if end > buffers[buffer_index].get("byteLength", 0):
+            raise fail(f"Buffer view {index} runs past the end of its buffer")
+
+    for index, accessor in enumerate(accessors):
+        view_index = accessor.get("bufferView")
+        if view_index is not None and not 0 <= view_index < len(buffer_views):
+            raise fail(f"Accessor {index} refers to a missing buffer view")
+
+    primitive_count = vertex_count = index_count = 0
+    for mesh in meshes:
+        for primitive in mesh.get("primitives", []):
+            primitive_count += 1
+            referenced = [
+                primitive.get("indices"),
+                *primitive.get("attributes", {}).values(),
+            ]
+            if any(
+                accessor_index is not None and not 0 <= accessor_index < len(accessors)
+                for accessor_index in referenced
+            ):
+                raise fail("A mesh primitive refers to a missing accessor")
+
+            position = primitive.get("attributes", {}).get("POSITION")
+            if position is not None:
+                vertex_count += int(accessors[position].get("count", 0))
+            if primitive.get("indices") is not None:
+                index_count += int(accessors[primitive["indices"]].get("count", 0))
+
+    for index, node in enumerate(gltf.get("nodes", [])):
+        if "mesh" in node and not 0 <= node["mesh"] < len(meshes):
+            raise fail(f"Node {index} refers to a missing mesh")
+
+    textures = []
+    for index, image in enumerate(gltf.get("images", [])):
+        view_index = image.get("bufferView")
+        if view_index is None:
+            uri = image.get("uri", "")
+            if uri and not uri.startswith("data:"):
+                external_uris.append(uri)
+            textures.append(
+                TextureInfo(image.get("mimeType", ""), None, None, 0, embedded=False)
+            )
+            continue
+
+        if not 0 <= view_index < len(buffer_views):
+            raise fail(f"Image {index} refers to a missing buffer view")
+        view = buffer_views[view_index]
+        width = height = None
+        if view.get("buffer", 0) == 0 and binary_length:
+            image_start = binary_start + view.get("byteOffset", 0)
+            width, height = _image_size(
+                data, image_start, image_start + view.get("byteLength", 0)
+            )
+        textures.append(
+            TextureInfo(
+                image.get("mimeType", ""),
+                width,
+                height,
+                view.get("byteLength", 0),
+                embedded=True,
+            )
+        )
+
+    return GlbStats(
+        file_bytes=file_bytes,
+        json_bytes=json_length,
+        buffer_bytes=sum(buffer.get("byteLength", 0) for buffer in buffers),
+        mesh_count=len(meshes),
+        primitive_count=primitive_count,
+        vertex_count=vertex_count,
+        index_count=index_count,
+        triangle_count=count_triangles(gltf),
+        textures=tuple(textures),
+        animation_count=len(gltf.get("animations", [])),
+        skin_count=len(gltf.get("skins", [])),
+        external_uris=tuple(external_uris),
+    )
+
+
+def _image_size(data: mmap.mmap, start: int, end: int) -> tuple[int | None, int | None]:
+    """Read the size of a PNG or JPEG image from its header."""
+    if data[start : start + 8] == PNG_SIGNATURE and end - start >= 24:
+        width, height = struct.unpack(">II", data[start + 16 : start + 24])
+        return width, height
+
+    if data[start : start + 2] == b"\xff\xd8":
+        position = start + 2
+        while position + 9 <= end:
+            if data[position] != 0xFF:
+                return None, None
+            marker = data[position + 1]
+            if marker == 0xFF:  # fill byte
+                position += 1
+                continue
+            if marker in JPEG_SOF_MARKERS:
+                height, width = struct.unpack(">HH", data[position + 5 : position + 9])
+                return width, height
+            (segment_length,) = struct.unpack(">H", data[position + 2 : position + 4])
+            position += 2 + segment_length
+
+    return None, None
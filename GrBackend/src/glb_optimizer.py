@@ -0,0 +1,339 @@
+"""
+GLB Optimizer Module
+
+This module fits uploaded GLB files to what the render can actually show
+before Blender imports them. Embedded textures are downscaled to a budget
+derived from the output resolution and the share of the frame the product
+covers, and meshes above a triangle budget are decimated by Blender. The
+optimized file is cached by the hash of the input and the budgets; the
+uploaded original is never modified.
+"""
+
+import importlib.util
+import io
+import json
+import math
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.disk_cache import DiskCache
+from src.file_handler import FileHandler
+from src.glb_inspector import (
+    GLB_CHUNK_BIN,
+    GLB_CHUNK_HEADER,
+    GLB_CHUNK_JSON,
+    GLB_HEADER,
+    GLB_MAGIC,
+    count_triangles,
+    inspect_glb,
+)
+from src.single_flight import SingleFlight
+from utils.exceptions import BlenderProcessError, FileHandlerError, GlbFileError
+from utils.logger import logger
+
+# Pillow comes with Gradio; without it textures are kept. It is only imported
+# once a texture needs downscaling, which keeps it out of the service start-up.
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+# Bump when the optimization changes, so older cache entries are not reused
+OPTIMIZER_VERSION = 1
+
+IMAGE_FORMATS = {"image/png": "PNG", "image/jpeg": "JPEG"}
+JPEG_QUALITY = 90
+
+# Decimates the meshes of a GLB file by a ratio into a new GLB file
+DecimateFunction = Callable[[Path, Path, float], None]
+
+
+@dataclass
+class GlbDocument:
+    """The JSON and binary chunk of a GLB file."""
+
+    gltf: dict[str, Any]
+    binary: bytes
+
+
+def read_glb(file_path: str | Path) -> GlbDocument:
+    """
+    Read a binary glTF 2.0 file.
+
+    Raises:
+        GlbFileError: If the file is not a valid GLB file.
+    """
+    data = Path(file_path).read_bytes()
+    if len(data) < GLB_HEADER.size:
+        raise GlbFileError("File is too short to be a GLB file", str(file_path))
+
+    magic, version, length = GLB_HEADER.unpack_from(data)
+    if magic != GLB_MAGIC or version != 2:
+        raise GlbFileError("Not a glTF 2.0 binary file", str(file_path))
+
+    gltf: dict[str, Any] | None = None
+    binary = b""
+    offset = GLB_HEADER.size
+    while offset + GLB_CHUNK_HEADER.size <= min(length, len(data)):
+        chunk_length, chunk_type = GLB_CHUNK_HEADER.unpack_from(data, offset)
+        chunk_start = offset + GLB_CHUNK_HEADER.size
+        chunk = data[chunk_start : chunk_start + chunk_length]
+        if chunk_type == GLB_CHUNK_JSON and gltf is None:
+            try:
+                gltf = json.loads(chunk)
+            except ValueError as e:
+                raise GlbFileError(
+                    f"Invalid GLB JSON chunk: {e}", str(file_path)
+                ) from e
+        elif chunk_type == GLB_CHUNK_BIN and not binary:
+            binary = chunk
+        offset = chunk_start + chunk_length
+
+    if gltf is None:
+        raise GlbFileError("GLB file has no JSON chunk", str(file_path))
+    return GlbDocument(gltf, binary)
+
+
+def write_glb(file_path: str | Path, document: GlbDocument) -> None:
+    """Write a binary glTF 2.0 file."""
+    json_chunk = _pad(json.dumps(document.gltf, separators=(",", ":")).encode(), b" ")
+    binary_chunk = _pad(document.binary, b"\0")
+
+    length = GLB_HEADER.size + GLB_CHUNK_HEADER.size + len(json_chunk)
+    if binary_chunk:
+        length += GLB_CHUNK_HEADER.size + len(binary_chunk)
+
+    with open(file_path, "wb") as f:
+        f.write(GLB_HEADER.pack(GLB_MAGIC, 2, length))
+        f.write(GLB_CHUNK_HEADER.pack(len(json_chunk), GLB_CHUNK_JSON))
+        f.write(json_chunk)
+        if binary_chunk:
+            f.write(GLB_CHUNK_HEADER.pack(len(binary_chunk), GLB_CHUNK_BIN))
+            f.write(binary_chunk)
+
+
+def _pad(data: bytes, fill: bytes) -> bytes:
+    """Pad a chunk to the 4-byte alignment GLB requires."""
+    return data + fill * (-len(data) % 4)
+
+
+class GlbOptimizer:
+    """
+    Produces render-sized copies of GLB files.
+    """
+
+    def __init__(
+        self,
+        cache_directory: str | Path,
+        max_cache_bytes: int,
+        frame_size: int,
+        screen_coverage: float,
+        texel_density: float,
+        min_texture_size: int = 256,
+        max_triangles: int = 0,
+        decimate_function: DecimateFunction | None = None,
+    ) -> None:
+        self.frame_size = frame_size
+        self.screen_coverage = screen_coverage
+        self.texel_density = texel_density
+        self.min_texture_size = min_texture_size
+        self.max_triangles = max_triangles
+        self.decimate_function = decimate_function
+
+        self.disk_cache = DiskCache(cache_directory, max_cache_bytes, name="GLB")
+        self._single_flight: SingleFlight[str] = SingleFlight()
+
+        if not HAS_PILLOW:
+            logger.warning("Pillow is not installed, GLB textures are not downscaled")
+
+    def texture_budget(self, json_data: dict[str, Any]) -> int:
+        """
+        Largest texture side worth keeping for a composition.
+
+        The product spans `screen_coverage` of the frame's long side, and
+        `texel_density` texels per screen pixel leave room for the parts of a
+        texture wrapped around the product and for filtering. The budget is
+        rounded up to a power of two.
+        """
+        frame_size = float(self.frame_size)
+        quality = json_data.get("QUALITY") or {}
+        if quality.get("TIER", "FINAL") != "FINAL":
+            frame_size *= float(quality.get("RESOLUTION_PERCENTAGE", 100)) / 100
+
+        texels = frame_size * self.screen_coverage * self.texel_density
+        budget = int(2 ** math.ceil(math.log2(max(texels, 1.0))))
+        return max(self.min_texture_size, budget)
+
+    def optimize(self, glb_file_path: str, json_data: dict[str, Any]) -> str:
+        """
+        Return the path of a render-sized copy of a GLB file.
+
+        The original path is returned when nothing needs to change or the
+        file cannot be optimized. The inspector decides that from the file's
+        header, so files within budget are neither hashed nor read in full.
+        """
+        texture_budget = self.texture_budget(json_data)
+        try:
+            stats = inspect_glb(glb_file_path)
+        except GlbFileError as e:
+            logger.warning(f"Cannot optimize {glb_file_path}, using it as is: {e}")
+            return glb_file_path
+
+        needs_decimation = (
+            self.max_triangles > 0
+            and stats.triangle_count > self.max_triangles
+            and self.decimate_function is not None
+        )
+        needs_downscaling = HAS_PILLOW and stats.max_texture_size > texture_budget
+        if not needs_decimation and not needs_downscaling:
+            return glb_file_path
+
+        try:
+            key = (
+                f"{FileHandler.compute_file_hash(glb_file_path)}_{texture_budget}_"
+                f"{self.max_triangles}_v{OPTIMIZER_VERSION}"
+            )
+
+            cached_path = self.disk_cache.get(key)
+            if cached_path is not None:
+                return str(cached_path)
+
+            return self._single_flight.do(
+                key, lambda: self._optimize(glb_file_path, key, texture_budget)
+            )
+        except (
+            GlbFileError,
+            BlenderProcessError,
+            FileHandlerError,
+            OSError,
+            ValueError,
+            KeyError,
+            IndexError,
+            TypeError,
+        ) as e:
+            logger.warning(f"Cannot optimize {glb_file_path}, using it as is: {e!r}")
+            return glb_file_path
+
+    def _optimize(self, glb_file_path: str, key: str, texture_budget: int) -> str:
+        """Write the optimized file into the cache."""
+        target = self.disk_cache.path_for(key, ".glb")
+        decimated = target.with_name(f".{key}.decimated.glb")
+        staging = target.with_name(f".{target.name}.tmp")
+
+        try:
+            document = read_glb(glb_file_path)
+            changed = False
+
+            triangles = count_triangles(document.gltf)
+            if (
+                self.max_triangles > 0
+                and triangles > self.max_triangles
+                and self.decimate_function is not None
+            ):
+                ratio = self.max_triangles / triangles
+                logger.info(
+                    f"Decimating {glb_file_path}: {triangles} triangles, "
+                    f"ratio {ratio:.3f}"
+                )
+                self.decimate_function(Path(glb_file_path), decimated, ratio)
+                document = read_glb(decimated)
+                changed = True
+
+            if self._downscale_textures(document, texture_budget):
+                changed = True
+
+            if not changed:
+                return glb_file_path
+
+            write_glb(staging, document)
+            staging.replace(target)
+            self.disk_cache.register(key, target)
+            logger.info(
+                f"Optimized {glb_file_path}: "
+                f"{Path(glb_file_path).stat().st_size} -> {target.stat().st_size} bytes"
+            )
+            return str(target)
+        finally:
+            decimated.unlink(missing_ok=True)
+            staging.unlink(missing_ok=True)
+
+    def _downscale_textures(self, document: GlbDocument, texture_budget: int) -> bool:
+        """
+        Shrink embedded textures above the budget and repack the binary chunk.
+
+        Returns:
+            Whether any texture was replaced.
+        """
+        if not HAS_PILLOW:
+            return False
+
+        gltf = document.gltf
+        buffer_views = gltf.get("bufferViews", [])
+        replacements: dict[int, bytes] = {}
+
+        for image in gltf.get("images", []):
+            view_index = image.get("bufferView")
+            image_format = IMAGE_FORMATS.get(image.get("mimeType", ""))
+            if view_index is None or image_format is None:
+                continue
+
+            view = buffer_views[view_index]
+            if view.get("buffer", 0) != 0:
+                continue
+            offset = view.get("byteOffset", 0)
+            data = document.binary[offset : offset + view["byteLength"]]
+
+            resized = self._resize_image(data, image_format, texture_budget)
+            if resized is not None:
+                replacements[view_index] = resized
+
+        if not replacements:
+            return False
+
+        binary = bytearray()
+        for view_index, view in enumerate(buffer_views):
+            if view.get("buffer", 0) != 0:
+                continue
+            offset = view.get("byteOffset", 0)
+            data = replacements.get(
+                view_index, document.binary[offset : offset + view["byteLength"]]
+            )
+            binary += b"\0" * (-len(binary) % 4)
+            view["byteOffset"] = len(binary)
+            view["byteLength"] = len(data)
+            binary += data
+
+        gltf["buffers"][0]["byteLength"] = len(binary)
+        document.binary = bytes(binary)
+        return True
+
+    @staticmethod
+    def _resize_image(data: bytes, image_format: str, budget: int) -> bytes | None:
+        """
+        Encoded image scaled to fit the budget, or None if it already fits.
+
+        Raises:
+            ValueError: If the image is too large for Pillow to decode safely.
+        """
+        from PIL import Image
+
+        try:
+            image = Image.open(io.BytesIO(data))
+        except Image.DecompressionBombError as e:
+            raise ValueError(f"Texture too large to decode: {e}") from e
+
+        with image:
+            width, height = image.size
+            if max(width, height) <= budget:
+                return None
+
+            scale = budget / max(width, height)
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            resized = image.resize(size, Image.Resampling.LANCZOS)
+
+        output = io.BytesIO()
+        if image_format == "JPEG":
+            resized.convert("RGB").save(output, "JPEG", quality=JPEG_QUALITY)
+        else:
+            resized.save(output, "PNG")
+        logger.debug(f"Downscaled texture {width}x{height} -> {size[0]}x{size[1]}")
+        return output.getvalue()
@@ -0,0 +1,403 @@
+"""
+Render Job Manager Module
+
+This module runs renders in the background on a bounded set of worker threads.
+Callers get a job id right away and look up the job's status and result later,
+while the number of workers caps how many Blender processes run on the node at
+once. Queued jobs are ordered by their expected render time, so short renders
+do not wait behind long ones, and by how long they have waited, so long ones
+are not starved. With a job store, jobs and their state transitions are
+persisted, and finished jobs can still be looked up after a restart.
+"""
+
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from src.job_store import JobStore
+from src.metrics import RENDER_QUEUE_WAIT_SECONDS, composition_labels
+from src.render_progress import ProgressCallback, RenderProgress
+from utils.exceptions import RenderJobError
+from utils.logger import logger
+
+JobStatus = Literal["SUCCESS", "FAILED", "PENDING"]
+
+RenderFunction = Callable[
+    [str, dict[str, Any], str | None, ProgressCallback | None], str
+]
+
+
+@dataclass
+class RenderJob:
+    """State of a single submitted render."""
+
+    job_id: str
+    glb_file_path: str
+    json_data: dict[str, Any]
+    blend_file_path: str | None = None
+    status: JobStatus = "PENDING"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    output_path: str | None = None
+    error: str | None = None
+    dedupe_key: str | None = None
+    estimated_seconds: float | None = None
+    progress: RenderProgress = field(
+        default_factory=lambda: RenderProgress(phase="queued")
+    )
+    future: Future[str] | None = field(default=None, repr=False)
+
+
+# Predicts the wall time of a job in seconds
+CostFunction = Callable[[RenderJob], float]
+
+
+class RenderJobManager:
+    """
+    Runs renders on a bounded set of workers and tracks them by job id.
+
+    Finished jobs are kept for lookups until `max_finished_jobs` newer jobs
+    have finished. Submissions with the same dedupe key as a pending job are
+    attached to that job instead of taking another worker.
+
+    With a `cost_function`, queued jobs run in order of their expected render
+    time plus `aging` times their submission time: a job that waited a second
+    longer than another is worth `aging` seconds of render time less. Without
+    one, jobs run in submission order.
+
+    A `job_store` records every job. Failing to write to it is logged and does
+    not fail the render.
+    """
+
+    def __init__(
+        self,
+        render_function: RenderFunction,
+        max_concurrent_jobs: int,
+        max_finished_jobs: int,
+        cost_function: CostFunction | None = None,
+        aging: float = 1.0,
+        job_store: JobStore | None = None,
+    ) -> None:
+        cpu_count = os.cpu_count() or 1
+        self.max_concurrent_jobs = max(1, min(max_concurrent_jobs, cpu_count))
+        self.max_finished_jobs = max_finished_jobs
+        self.render_function = render_function
+        self.cost_function = cost_function
+        self.aging = aging
+        self.job_store = job_store
+
+        self._jobs: OrderedDict[str, RenderJob] = OrderedDict()
+        self._pending_by_key: dict[str, str] = {}
+        self._queue: list[tuple[float, int, RenderJob]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._job_queued = threading.Condition(self._lock)
+        self._shut_down = False
+        self._workers = [
+            threading.Thread(target=self._work, name=f"render-job_{index}", daemon=True)
+            for index in range(self.max_concurrent_jobs)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+        logger.info(
+            f"Render job manager running up to {self.max_concurrent_jobs} "
+            "concurrent jobs"
+        )
+
+    def submit(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+        dedupe_key: str | None = None,
+        job_id: str | None = None,
+    ) -> str:
+        """
+        Queue a render and return its job id without waiting for it.
+
+        If a pending job has the same `dedupe_key`, its id is returned instead.
+        A `job_id` resubmits a job recovered from the job store under its id.
+
+        Raises:
+            RenderJobError: If the manager was shut down.
+        """
+        job = RenderJob(
+            job_id=job_id or uuid.uuid4().hex,
+            glb_file_path=glb_file_path,
+            json_data=json_data,
+            blend_file_path=blend_file_path,
+            dedupe_key=dedupe_key,
+            future=Future(),
+        )
+        if self.cost_function is not None:
+            try:
+                job.estimated_seconds = self.cost_function(job)
+            except Exception as e:
+                logger.warning(f"Cannot estimate the cost of render job: {e}")
+        priority = (job.estimated_seconds or 0.0) + self.aging * job.submitted_at
+
+        with self._job_queued:
+            if self._shut_down:
+                raise RenderJobError("Render job manager is shut down", job.job_id)
+            if dedupe_key is not None and job_id is None:
+                pending_job_id = self._pending_by_key.get(dedupe_key)
+                if pending_job_id is not None:
+                    logger.info(
+                        f"Attaching duplicate submission to render job {pending_job_id}"
+                    )
+                    return pending_job_id
+                self._pending_by_key[dedupe_key] = job.job_id
+            self._jobs[job.job_id] = job
+            # Recorded before a worker can record the job's start
+            self._record(
+                job,
+                lambda job_store: job_store.record_submitted(
+                    job.job_id,
+                    glb_file_path,
+                    json_data,
+                    blend_file_path,
+                    dedupe_key,
+                    job.submitted_at,
+                ),
+            )
+            heapq.heappush(self._queue, (priority, next(self._sequence), job))
+            self._job_queued.notify()
+
+        if job.estimated_seconds is not None:
+            logger.info(
+                f"Render job {job.job_id} submitted, "
+                f"expected to take {job.estimated_seconds:.0f}s"
+            )
+        else:
+            logger.info(f"Render job {job.job_id} submitted")
+        return job.job_id
+
+    def get_job(self, job_id: str) -> RenderJob:
+        """
+        Look up a job by id.
+
+        Jobs finished before a restart are looked up in the job store.
+
+        Raises:
+            RenderJobError: If the job is unknown or was already forgotten.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            job = self._load_finished_job(job_id)
+        if job is None:
+            raise RenderJobError(f"Unknown render job: {job_id}", job_id)
+        return job
+
+    def status(self, job_id: str) -> JobStatus:
+        """Get the current status of a job."""
+        return self.get_job(job_id).status
+
+    def result(self, job_id: str, timeout: float | None = None) -> str:
+        """
+        Wait for a job and return the rendered video path.
+
+        Raises:
+            RenderJobError: If the job is unknown or does not finish in time.
+            BlenderProcessError: If the render failed.
+        """
+        job = self.get_job(job_id)
+        if job.future is None:
+            raise RenderJobError(f"Render job {job_id} was never started", job_id)
+
+        try:
+            return job.future.result(timeout=timeout)
+        except TimeoutError as e:
+            raise RenderJobError(
+                f"Render job {job_id} did not finish within {timeout}s", job_id
+            ) from e
+
+    def estimate_eta(self, job_id: str) -> float | None:
+        """
+        Seconds until a pending job is expected to finish.
+
+        The queue ahead of a job is played out on the workers with the expected
+        render times, starting from what is left of the running jobs.
+
+        Returns:
+            None if the job is finished or its cost was not estimated.
+        """
+        job = self.get_job(job_id)
+        now = time.time()
+        with self._lock:
+            if job.status != "PENDING" or job.estimated_seconds is None:
+                return None
+            if job.started_at is not None:
+                return max(0.0, job.estimated_seconds - (now - job.started_at))
+
+            worker_free_at = [
+                max(0.0, (other.estimated_seconds or 0.0) - (now - other.started_at))
+                for other in self._jobs.values()
+                if other.status == "PENDING" and other.started_at is not None
+            ]
+            ahead = []
+            for _, _, other in sorted(self._queue):
+                if other is job:
+                    break
+                ahead.append(other.estimated_seconds or 0.0)
+
+        worker_free_at = worker_free_at[: self.max_concurrent_jobs]
+        worker_free_at += [0.0] * (self.max_concurrent_jobs - len(worker_free_at))
+        heapq.heapify(worker_free_at)
+        for seconds in ahead:
+            heapq.heappush(worker_free_at, heapq.heappop(worker_free_at) + seconds)
+        return worker_free_at[0] + job.estimated_seconds
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and optionally wait for queued and running ones.
+
+        Queued jobs are cancelled when not waiting.
+        """
+        with self._job_queued:
+            self._shut_down = True
+            if not wait:
+                for _, _, job in self._queue:
+                    if job.future is not None:
+                        job.future.cancel()
+                self._queue.clear()
+            self._job_queued.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def _work(self) -> None:
+        """Run queued jobs in priority order until shut down."""
+        while True:
+            with self._job_queued:
+                while not self._queue and not self._shut_down:
+                    self._job_queued.wait()
+                if not self._queue:
+                    return
+                _, _, job = heapq.heappop(self._queue)
+
+            future = job.future
+            if future is None or not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._run(job))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _run(self, job: RenderJob) -> str:
+        """Execute a job on a worker thread and record its outcome."""
+        job.started_at = time.time()
+        started_at = job.started_at
+        self._record(
+            job, lambda job_store: job_store.record_started(job.job_id, started_at)
+        )
+        RENDER_QUEUE_WAIT_SECONDS.observe(
+            job.started_at - job.submitted_at, **composition_labels(job.json_data)
+        )
+        logger.info(
+            f"Render job {job.job_id} started after "
+            f"{job.started_at - job.submitted_at:.2f}s in queue"
+        )
+
+        try:
+            output_path = self.render_function(
+                job.glb_file_path,
+                job.json_data,
+                job.blend_file_path,
+                lambda progress: setattr(job, "progress", progress),
+            )
+        except Exception as e:
+            job.error = str(e)
+            job.status = "FAILED"
+            logger.error(f"Render job {job.job_id} failed: {e}")
+            self._record(
+                job,
+                lambda job_store: job_store.record_finished(
+                    job.job_id, "FAILED", error=job.error
+                ),
+            )
+            raise
+        else:
+            job.output_path = output_path
+            job.progress = RenderProgress(phase="done")
+            job.status = "SUCCESS"
+            logger.info(f"Render job {job.job_id} finished: {output_path}")
+            self._record(
+                job,
+                lambda job_store: job_store.record_finished(
+                    job.job_id, "SUCCESS", output_path=output_path
+                ),
+            )
+            return output_path
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                if job.dedupe_key is not None:
+                    self._pending_by_key.pop(job.dedupe_key, None)
+            self._forget_old_jobs()
+
+    def _forget_old_jobs(self) -> None:
+        """Drop the oldest finished jobs beyond the retention limit."""
+        with self._lock:
+            finished = [
+                job_id for job_id, job in self._jobs.items() if job.status != "PENDING"
+            ]
+            for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+                del self._jobs[job_id]
+
+    def _record(self, job: RenderJob, write: Callable[[JobStore], None]) -> None:
+        """Write to the job store, logging instead of failing the job."""
+        if self.job_store is None:
+            return
+        try:
+            write(self.job_store)
+        except sqlite3.Error as e:
+            logger.warning(f"Cannot record render job {job.job_id}: {e}")
+
+    def _load_finished_job(self, job_id: str) -> RenderJob | None:
+        """Rebuild a job finished before a restart from the job store."""
+        if self.job_store is None:
+            return None
+        try:
+            stored = self.job_store.get(job_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Cannot look up render job {job_id}: {e}")
+            return None
+        if stored is None or stored.status not in ("SUCCESS", "FAILED"):
+            return None
+
+        future: Future[str] = Future()
+        if stored.status == "SUCCESS" and stored.output_path is not None:
+            future.set_result(stored.output_path)
+        else:
+            future.set_exception(
+                RenderJobError(f"Render job {job_id} failed: {stored.error}", job_id)
+            )
+        return RenderJob(
+            job_id=stored.job_id,
+            glb_file_path=stored.glb_file_path,
+            json_data=stored.json_data,
+            blend_file_path=stored.blend_file_path,
+            status="SUCCESS" if stored.status == "SUCCESS" else "FAILED",
+            submitted_at=stored.submitted_at,
+            started_at=stored.started_at,
+            finished_at=stored.finished_at,
+            output_path=stored.output_path,
+            error=stored.error,
+            dedupe_key=stored.dedupe_key,
+            progress=RenderProgress(
+                phase="done" if stored.status == "SUCCESS" else "failed"
+            ),
+            future=future,
+        )
@@ -0,0 +1,401 @@
+"""
+Job Store Module
+
+This module keeps render jobs in a SQLite database so they survive a restart
+of the service. Every job is stored with its composition, input hash, output
+path and the history of its state transitions. Renders in progress also
+record the Blender processes and temporary files they own, together with the
+identity of the service process that owns them.
+
+After a restart, everything owned by a service process that no longer runs is
+orphaned: `orphaned_processes`, `orphaned_renders` and `interrupted_jobs` list
+it for the renderer to kill, clean up and requeue. Finished jobs and their
+transitions are deleted once they are past the retention count or age.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal
+
+from src.sqlite_database import SqliteDatabase
+from utils.logger import logger
+
+StoredJobStatus = Literal["QUEUED", "RUNNING", "SUCCESS", "FAILED"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    dedupe_key TEXT,
+    glb_file_path TEXT NOT NULL,
+    json_data TEXT NOT NULL,
+    blend_file_path TEXT,
+    status TEXT NOT NULL,
+    owner_pid INTEGER NOT NULL,
+    owner_started INTEGER,
+    recoveries INTEGER NOT NULL DEFAULT 0,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    output_path TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status);
+CREATE INDEX IF NOT EXISTS jobs_by_finished ON jobs (finished_at)
+    WHERE finished_at IS NOT NULL;
+CREATE TABLE IF NOT EXISTS job_transitions (
+    job_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    at REAL NOT NULL,
+    detail TEXT
+);
+CREATE INDEX IF NOT EXISTS job_transitions_by_job ON job_transitions (job_id);
+CREATE TABLE IF NOT EXISTS processes (
+    pid INTEGER PRIMARY KEY,
+    started INTEGER,
+    owner_pid INTEGER NOT NULL,
+    owner_started INTEGER,
+    registered_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS renders (
+    render_key TEXT PRIMARY KEY,
+    temp_paths TEXT NOT NULL,
+    owner_pid INTEGER NOT NULL,
+    owner_started INTEGER,
+    started_at REAL NOT NULL
+);
+"""
+
+
+def process_start_ticks(pid: int) -> int | None:
+    """
+    Start time of a process in clock ticks since boot, or None if it is gone.
+
+    Together with the pid, it identifies a process even after the pid was
+    reused. Without /proc, only whether the pid is in use can be told, and 0
+    stands in for the start time.
+    """
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text()
+    except FileNotFoundError:
+        if Path("/proc/self/stat").exists():
+            return None
+    except OSError:
+        return None
+    else:
+        try:
+            return int(stat.rsplit(")", 1)[1].split()[19])
+        except (ValueError, IndexError):
+            return 0
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return None
+    except PermissionError:
+        pass
+    return 0
+
+
+@dataclass(frozen=True)
+class StoredJob:
+    """A render job as recorded in the job store."""
+
+    job_id: str
+    dedupe_key: str | None
+    glb_file_path: str
+    json_data: dict[str, Any]
+    blend_file_path: str | None
+    status: StoredJobStatus
+    recoveries: int
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    output_path: str | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class OrphanedRender:
+    """Temporary files of a render whose service process is gone."""
+
+    render_key: str
+    temp_paths: list[str]
+
+
+class JobStore:
+    """
+    Durable record of render jobs, their processes and temporary files.
+
+    Only the newest `max_finished_jobs` finished jobs, finished within
+    `max_age_seconds`, are kept (0 disables a limit).
+    """
+
+    def __init__(
+        self,
+        database_path: str | Path,
+        max_finished_jobs: int = 0,
+        max_age_seconds: float = 0,
+    ) -> None:
+        self.database = SqliteDatabase(database_path, SCHEMA)
+        self.owner_pid = os.getpid()
+        self.owner_started = process_start_ticks(self.owner_pid)
+        self.max_finished_jobs = max_finished_jobs
+        self.max_age_seconds = max_age_seconds
+        pruned = self.prune()
+        if pruned:
+            logger.info(f"Deleted {pruned} finished render jobs from the job store")
+
+    def record_submitted(
+        self,
+        job_id: str,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None,
+        dedupe_key: str | None,
+        submitted_at: float,
+    ) -> None:
+        """Record a queued job, taking over the job if it was recovered."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (job_id, dedupe_key, glb_file_path, json_data, "
+                "blend_file_path, status, owner_pid, owner_started, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, 'QUEUED', ?, ?, ?) "
+                "ON CONFLICT (job_id) DO UPDATE SET status = 'QUEUED', "
+                "owner_pid = excluded.owner_pid, "
+                "owner_started = excluded.owner_started, "
+                "started_at = NULL, finished_at = NULL",
+                (
+                    job_id,
+                    dedupe_key,
+                    glb_file_path,
+                    json.dumps(json_data),
+                    blend_file_path,
+                    self.owner_pid,
+                    self.owner_started,
+                    submitted_at,
+                ),
+            )
+            self._transition(connection, job_id, "QUEUED")
+
+    def record_started(self, job_id: str, started_at: float) -> None:
+        """Record that a job started rendering."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = 'RUNNING', started_at = ? WHERE job_id = ?",
+                (started_at, job_id),
+            )
+            self._transition(connection, job_id, "RUNNING")
+
+    def record_finished(
+        self,
+        job_id: str,
+        status: Literal["SUCCESS", "FAILED"],
+        output_path: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        """Record the outcome of a job."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, output_path = ?, "
+                "error = ? WHERE job_id = ?",
+                (status, time.time(), output_path, error, job_id),
+            )
+            self._transition(connection, job_id, status, error)
+            self._prune(connection)
+
+    def prune(self) -> int:
+        """Delete finished jobs past the retention limits and count them."""
+        with self.database.transaction() as connection:
+            return self._prune(connection)
+
+    def record_interrupted(self, job_id: str) -> None:
+        """Count a recovery of a job interrupted by a restart."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET recoveries = recoveries + 1 WHERE job_id = ?",
+                (job_id,),
+            )
+            self._transition(connection, job_id, "INTERRUPTED")
+
+    def get(self, job_id: str) -> StoredJob | None:
+        """Look up a job by id."""
+        row = (
+            self.database.connection()
+            .execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,))
+            .fetchone()
+        )
+        return self._job(row) if row is not None else None
+
+    def transitions(self, job_id: str) -> list[tuple[str, float, str | None]]:
+        """State transitions of a job, oldest first."""
+        rows = self.database.connection().execute(
+            "SELECT status, at, detail FROM job_transitions WHERE job_id = ? "
+            "ORDER BY at, rowid",
+            (job_id,),
+        )
+        return [(row["status"], row["at"], row["detail"]) for row in rows]
+
+    def interrupted_jobs(self) -> list[StoredJob]:
+        """Unfinished jobs of service processes that no longer run."""
+        rows = self.database.connection().execute(
+            "SELECT * FROM jobs WHERE status IN ('QUEUED', 'RUNNING') "
+            "ORDER BY submitted_at"
+        )
+        return [
+            self._job(row)
+            for row in rows
+            if self._is_orphaned(row["owner_pid"], row["owner_started"])
+        ]
+
+    def register_process(self, pid: int) -> None:
+        """Record a Blender process started by this service process."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO processes (pid, started, owner_pid, "
+                "owner_started, registered_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    pid,
+                    process_start_ticks(pid),
+                    self.owner_pid,
+                    self.owner_started,
+                    time.time(),
+                ),
+            )
+
+    def forget_process(self, pid: int) -> None:
+        """Forget a Blender process that exited."""
+        with self.database.transaction() as connection:
+            connection.execute("DELETE FROM processes WHERE pid = ?", (pid,))
+
+    def orphaned_processes(self) -> list[tuple[int, int | None]]:
+        """
+        Pids and start times of recorded processes whose owner is gone.
+
+        The records are removed; the processes may or may not still run.
+        """
+        with self.database.transaction() as connection:
+            rows = connection.execute("SELECT * FROM processes").fetchall()
+            orphaned = [
+                row
+                for row in rows
+                if self._is_orphaned(row["owner_pid"], row["owner_started"])
+            ]
+            connection.executemany(
+                "DELETE FROM processes WHERE pid = ?",
+                [(row["pid"],) for row in orphaned],
+            )
+        return [(row["pid"], row["started"]) for row in orphaned]
+
+    def register_render(self, render_key: str, temp_paths: list[str]) -> None:
+        """Record the temporary files of a render started by this process."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO renders (render_key, temp_paths, owner_pid, "
+                "owner_started, started_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    render_key,
+                    json.dumps(temp_paths),
+                    self.owner_pid,
+                    self.owner_started,
+                    time.time(),
+                ),
+            )
+
+    def forget_render(self, render_key: str) -> None:
+        """Forget a render that finished or failed."""
+        with self.database.transaction() as connection:
+            connection.execute(
+                "DELETE FROM renders WHERE render_key = ?", (render_key,)
+            )
+
+    def orphaned_renders(self) -> list[OrphanedRender]:
+        """
+        Renders whose owner is gone. The records are removed.
+        """
+        with self.database.transaction() as connection:
+            rows = connection.execute("SELECT * FROM renders").fetchall()
+            orphaned = [
+                row
+                for row in rows
+                if self._is_orphaned(row["owner_pid"], row["owner_started"])
+            ]
+            connection.executemany(
+                "DELETE FROM renders WHERE render_key = ?",
+                [(row["render_key"],) for row in orphaned],
+            )
+        return [
+            OrphanedRender(row["render_key"], json.loads(row["temp_paths"]))
+            for row in orphaned
+        ]
+
+    def _prune(self, connection: sqlite3.Connection) -> int:
+        """Delete finished jobs past the retention limits, inside a transaction."""
+        cutoffs = []
+        if self.max_age_seconds > 0:
+            cutoffs.append(time.time() - self.max_age_seconds)
+        if self.max_finished_jobs > 0:
+            row = connection.execute(
+                "SELECT finished_at FROM jobs WHERE finished_at IS NOT NULL "
+                "ORDER BY finished_at DESC LIMIT 1 OFFSET ?",
+                (self.max_finished_jobs - 1,),
+            ).fetchone()
+            if row is not None:
+                cutoffs.append(row["finished_at"])
+        if not cutoffs:
+            return 0
+
+        expired = [
+            (row["job_id"],)
+            for row in connection.execute(
+                "SELECT job_id FROM jobs WHERE finished_at IS NOT NULL "
+                "AND finished_at < ?",
+                (max(cutoffs),),
+            )
+        ]
+        connection.executemany("DELETE FROM job_transitions WHERE job_id = ?", expired)
+        connection.executemany("DELETE FROM jobs WHERE job_id = ?", expired)
+        return len(expired)
+
+    def _is_orphaned(self, owner_pid: int, owner_started: int | None) -> bool:
+        """Whether the service process that recorded a row no longer runs."""
+        if owner_pid == self.owner_pid:
+            # Containers restart the service under the same pid
+            return owner_started != self.owner_started
+        started = process_start_ticks(owner_pid)
+        return started is None or started != owner_started
+
+    @staticmethod
+    def _transition(
+        connection: sqlite3.Connection,
+        job_id: str,
+        status: str,
+        detail: str | None = None,
+    ) -> None:
+        """Append to the state history of a job."""
+        connection.execute(
+            "INSERT INTO job_transitions (job_id, status, at, detail) "
+            "VALUES (?, ?, ?, ?)",
+            (job_id, status, time.time(), detail),
+        )
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> StoredJob:
+        """Build a job from its row."""
+        return StoredJob(
+            job_id=row["job_id"],
+            dedupe_key=row["dedupe_key"],
+            glb_file_path=row["glb_file_path"],
+            json_data=json.loads(row["json_data"]),
+            blend_file_path=row["blend_file_path"],
+            status=row["status"],
+            recoveries=row["recoveries"],
+            submitted_at=row["submitted_at"],
+            started_at=row["started_at"],
+            finished_at=row["finished_at"],
+            output_path=row["output_path"],
+            error=row["error"],
+        )
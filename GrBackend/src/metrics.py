@@ -0,0 +1,349 @@
+"""
+Metrics Module
+
+This module collects render pipeline metrics and serves them in the
+Prometheus text exposition format from a small local HTTP endpoint. Counters,
+gauges and histograms carry labels such as the movement and VFX preset, so
+dashboards can break latency percentiles down by preset.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from utils.logger import logger
+
+LabelValues = tuple[str, ...]
+
+DURATION_BUCKETS = (
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+    300.0,
+    600.0,
+    1200.0,
+    1800.0,
+    3600.0,
+)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines in a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    """Render a label set as `{name="value",...}`."""
+    pairs = [
+        f'{name}="{_escape_label_value(value)}"'
+        for name, value in zip(names, values, strict=True)
+    ]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value the way Prometheus expects."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class _Metric(ABC):
+    """Base class of labelled metrics."""
+
+    metric_type = ""
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        """Order label values by the declared label names."""
+        if set(labels) != set(self.label_names):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.label_names}, "
+                f"got {tuple(labels)}"
+            )
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def expose(self) -> list[str]:
+        """Lines of the metric in the text exposition format."""
+        return [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+            *self._samples(),
+        ]
+
+    @abstractmethod
+    def _samples(self) -> list[str]:
+        """Sample lines of the metric, one per label set and series."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, label_names: Iterable[str] = ()
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the count of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, or is read from a callback on scrape."""
+
+    metric_type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        function: Callable[[], float] | None = None,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.function = function
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Increase the value of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Decrease the value of a label set."""
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> list[str]:
+        if self.function is not None:
+            try:
+                return [f"{self.name} {_format_value(self.function())}"]
+            except Exception as e:
+                logger.warning(f"Cannot collect metric {self.name}: {e}")
+                return []
+
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets."""
+
+    metric_type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    counts[index] += 1
+                    break
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def _samples(self) -> list[str]:
+        with self._lock:
+            counts = {key: list(value) for key, value in self._counts.items()}
+            sums = dict(self._sums)
+
+        lines = []
+        bucket_label_names = (*self.label_names, "le")
+        for key, bucket_counts in sorted(counts.items()):
+            cumulative = 0
+            for upper_bound, count in zip(self.buckets, bucket_counts, strict=True):
+                cumulative += count
+                labels = _format_labels(
+                    bucket_label_names, (*key, _format_value(upper_bound))
+                )
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """A named collection of metrics."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register[M: _Metric](self, metric: M) -> M:
+        """Add a metric, replacing a previous one with the same name."""
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def expose(self) -> str:
+        """All metrics in the text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [line for metric in metrics for line in metric.expose()]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+RENDER_QUEUE_WAIT_SECONDS = REGISTRY.register(
+    Histogram(
+        "productvideo_render_queue_wait_seconds",
+        "Time render jobs waited before a worker picked them up.",
+        ("movement", "vfx"),
+    )
+)
+RENDER_PHASE_SECONDS = REGISTRY.register(
+    Histogram(
+        "productvideo_render_phase_seconds",
+        "Duration of render phases, from Blender start-up to post-processing.",
+        ("phase", "movement", "vfx"),
+    )
+)
+RENDER_DURATION_SECONDS = REGISTRY.register(
+    Histogram(
+        "productvideo_render_duration_seconds",
+        "Total duration of renders that ran Blender.",
+        ("movement", "vfx", "status"),
+    )
+)
+RENDER_JOBS_IN_FLIGHT = REGISTRY.register(
+    Gauge("productvideo_render_jobs_in_flight", "Renders currently running Blender.")
+)
+RENDER_FAILURES_TOTAL = REGISTRY.register(
+    Counter(
+        "productvideo_render_failures_total",
+        "Failed renders by Blender return code and error type.",
+        ("return_code", "error"),
+    )
+)
+
+
+def composition_labels(json_data: dict[str, Any]) -> dict[str, str]:
+    """Movement and VFX preset labels of a composition."""
+    return {
+        "movement": str(json_data.get("MOVEMENT", {}).get("NAME") or "unknown"),
+        "vfx": str(json_data.get("VFX_SHOT", {}).get("NAME") or "unknown"),
+    }
+
+
+class PhaseTimer:
+    """
+    Times the phases of one render and records them in a histogram.
+
+    Phases are named after the progress phases of the render, so "starting"
+    covers Blender start-up and "post_process" the work after Blender exits.
+    """
+
+    def __init__(self, histogram: Histogram, labels: dict[str, str]) -> None:
+        self.histogram = histogram
+        self.labels = labels
+        self.phase: str | None = None
+        self._phase_started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def enter(self, phase: str | None) -> None:
+        """Close the current phase and start timing the next one."""
+        with self._lock:
+            if phase == self.phase:
+                return
+            now = time.monotonic()
+            if self.phase is not None:
+                self.histogram.observe(
+                    now - self._phase_started_at, phase=self.phase, **self.labels
+                )
+            self.phase = phase
+            self._phase_started_at = now
+
+    def finish(self) -> None:
+        """Close the current phase."""
+        self.enter(None)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the registry on /metrics."""
+
+    registry = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.expose().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep scrapes out of the application log."""
+
+
+def start_metrics_server(
+    host: str, port: int, registry: MetricsRegistry = REGISTRY
+) -> ThreadingHTTPServer:
+    """
+    Serve the registry from a background thread.
+    """
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    ).start()
+    logger.info(f"📈 Metrics available at http://{host}:{server.server_port}/metrics")
+    return server
@@ -0,0 +1,152 @@
+"""
+Render Agent Module
+
+This module runs a render node. The agent pulls jobs from a shared render
+queue, renders them with the local `BlenderRenderer` and copies the videos to
+shared storage, so render capacity grows by starting agents on more machines
+without changing the web tier. While a job renders, a heartbeat thread renews
+its lease; a job whose agent dies is requeued when the lease runs out.
+"""
+
+import os
+import shutil
+import socket
+import threading
+import time
+from pathlib import Path
+
+from src.blender_renderer import BlenderRenderer
+from src.render_queue import QueuedRenderJob, RenderQueue
+from utils.logger import logger
+
+
+class RenderWorkerAgent:
+    """
+    Claims render jobs from a queue and renders them one at a time.
+    """
+
+    def __init__(
+        self,
+        render_queue: RenderQueue,
+        blender_renderer: BlenderRenderer,
+        storage_directory: str | Path,
+        worker_id: str | None = None,
+        lease_seconds: float = 60.0,
+        heartbeat_seconds: float = 15.0,
+        poll_seconds: float = 2.0,
+    ) -> None:
+        self.render_queue = render_queue
+        self.blender_renderer = blender_renderer
+        self.storage_directory = Path(storage_directory)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.poll_seconds = poll_seconds
+
+        self._stop_event = threading.Event()
+        self.storage_directory.mkdir(parents=True, exist_ok=True)
+
+    def run(self, max_jobs: int | None = None) -> int:
+        """
+        Render queued jobs until stopped or `max_jobs` jobs were taken.
+
+        Returns:
+            Number of jobs taken.
+        """
+        logger.info(
+            f"Render worker {self.worker_id} polling the queue every "
+            f"{self.poll_seconds}s, writing videos to {self.storage_directory}"
+        )
+        jobs_taken = 0
+        while not self._stop_event.is_set():
+            if max_jobs is not None and jobs_taken >= max_jobs:
+                break
+            if self.run_once():
+                jobs_taken += 1
+            else:
+                self._stop_event.wait(self.poll_seconds)
+        logger.info(f"Render worker {self.worker_id} stopped after {jobs_taken} jobs")
+        return jobs_taken
+
+    def run_once(self) -> bool:
+        """
+        Claim and render one job.
+
+        Returns:
+            Whether a job was claimed.
+        """
+        job = self.render_queue.claim(self.worker_id, self.lease_seconds)
+        if job is None:
+            return False
+        self._process(job)
+        return True
+
+    def stop(self) -> None:
+        """Stop after the job in progress."""
+        self._stop_event.set()
+
+    def _process(self, job: QueuedRenderJob) -> None:
+        """Render a claimed job under a renewed lease and report the outcome."""
+        lease_lost = threading.Event()
+        rendered = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(job.job_id, rendered, lease_lost),
+            name=f"render-heartbeat_{job.job_id}",
+            daemon=True,
+        )
+        heartbeat.start()
+        started_at = time.monotonic()
+
+        try:
+            video_path = self.blender_renderer.render_video_from_glb(
+                job.glb_file_path, job.json_data, job.blend_file_path
+            )
+            output_path = self._store(job.job_id, video_path)
+        except Exception as e:
+            rendered.set()
+            heartbeat.join()
+            logger.error(f"Render job {job.job_id} failed: {e}")
+            self.render_queue.fail(job.job_id, self.worker_id, str(e))
+            return
+
+        rendered.set()
+        heartbeat.join()
+        if lease_lost.is_set():
+            logger.warning(
+                f"Render job {job.job_id} finished after its lease was lost, "
+                "another worker owns it now"
+            )
+        if self.render_queue.complete(job.job_id, self.worker_id, str(output_path)):
+            logger.info(
+                f"Render job {job.job_id} finished in "
+                f"{time.monotonic() - started_at:.1f}s: {output_path}"
+            )
+
+    def _heartbeat(
+        self, job_id: str, rendered: threading.Event, lease_lost: threading.Event
+    ) -> None:
+        """Renew the lease of a job until it is rendered or the lease is lost."""
+        while not rendered.wait(self.heartbeat_seconds):
+            try:
+                renewed = self.render_queue.heartbeat(
+                    job_id, self.worker_id, self.lease_seconds
+                )
+            except Exception as e:
+                logger.warning(f"Cannot renew the lease of render job {job_id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Lost the lease of render job {job_id}")
+                lease_lost.set()
+                return
+
+    def _store(self, job_id: str, video_path: str) -> Path:
+        """Copy a rendered video to shared storage under the job id."""
+        target = self.storage_directory / f"{job_id}{Path(video_path).suffix}"
+        staging = target.with_name(f".{target.name}.tmp")
+        try:
+            shutil.copyfile(video_path, staging)
+            staging.replace(target)
+        finally:
+            staging.unlink(missing_ok=True)
+        return target
@@ -0,0 +1,133 @@
+"""
+Render Cache Module
+
+This module caches rendered videos by the content of everything that
+determines them: the GLB bytes, the canonical composition JSON, the base
+.blend file and the versions of `process.py` and the Blender add-on. A repeated
+render of the same product with the same settings is served from disk instead
+of running Blender again.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from src.disk_cache import DiskCache
+from src.file_handler import FileHandler
+from utils.logger import logger
+
+CODE_FILE_SUFFIXES = (".py", ".json")
+
+
+def canonical_json(json_data: dict[str, Any]) -> str:
+    """Serialize composition data independently of key order and spacing."""
+    return json.dumps(
+        json_data, sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def build_render_key(
+    glb_file_path: str,
+    json_data: dict[str, Any],
+    blend_file_path: str | None,
+    code_version: str = "",
+) -> str:
+    """
+    Build a content hash identifying a render.
+
+    The base .blend file is identified by its size and modification time so
+    the key does not require hashing the whole file on every render.
+    """
+    digest = hashlib.sha256()
+    digest.update(FileHandler.compute_file_hash(glb_file_path).encode())
+    digest.update(canonical_json(json_data).encode())
+
+    if blend_file_path:
+        blend_stat = os.stat(blend_file_path)
+        digest.update(f"{blend_stat.st_size}:{blend_stat.st_mtime_ns}".encode())
+
+    digest.update(code_version.encode())
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    Content-addressed cache of rendered videos with size-bounded LRU eviction.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int,
+        script_file_path: str | None,
+        addon_directory: str | Path | None,
+    ) -> None:
+        self.disk_cache = DiskCache(directory, max_bytes, name="Render")
+        self.code_version = self._compute_code_version(
+            script_file_path, addon_directory
+        )
+
+    def build_key(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None,
+    ) -> str:
+        """
+        Build the cache key of a render, including the render code version.
+        """
+        return build_render_key(
+            glb_file_path, json_data, blend_file_path, self.code_version
+        )
+
+    def get(self, key: str) -> str | None:
+        """Return the cached video for a key, if any."""
+        path = self.disk_cache.get(key)
+        if path is None:
+            logger.debug(f"Render cache miss for {key}")
+            return None
+        logger.info(f"⚡ Render cache hit for {key}")
+        return str(path)
+
+    def put(self, key: str, video_path: str) -> None:
+        """Store a rendered video under a key."""
+        try:
+            self.disk_cache.put(key, video_path)
+        except OSError as e:
+            logger.warning(f"Cannot cache rendered video {video_path}: {e}")
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters and disk usage of the cache."""
+        return self.disk_cache.stats()
+
+    @staticmethod
+    def _compute_code_version(
+        script_file_path: str | None, addon_directory: str | Path | None
+    ) -> str:
+        """
+        Hash the render script and the add-on sources into a single version.
+        """
+        digest = hashlib.sha256()
+
+        code_files: list[Path] = []
+        if script_file_path:
+            code_files.append(Path(script_file_path))
+        if addon_directory and Path(addon_directory).is_dir():
+            code_files.extend(
+                sorted(
+                    path
+                    for path in Path(addon_directory).rglob("*")
+                    if path.suffix in CODE_FILE_SUFFIXES
+                    and "__pycache__" not in path.parts
+                )
+            )
+
+        for path in code_files:
+            try:
+                digest.update(path.read_bytes())
+            except OSError as e:
+                logger.warning(f"Cannot read {path} for the render cache key: {e}")
+
+        return digest.hexdigest()
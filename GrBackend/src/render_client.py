@@ -0,0 +1,120 @@
+"""
+Render Client Module
+
+This module lets the web tier render through the shared render queue instead
+of running Blender itself. It offers the job interface of `BlenderRenderer`
+(submit, status, progress, result), so the UI does not care where a video is
+rendered. Uploaded GLB files are copied to shared storage first, because the
+render nodes cannot see the web tier's temporary upload files; the videos the
+agents copy to shared storage are served from there.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any
+
+from src.file_handler import FileHandler
+from src.job_manager import JobStatus
+from src.render_progress import RenderProgress
+from src.render_queue import RenderQueue
+from utils.exceptions import BlenderProcessError
+from utils.logger import logger
+
+# Previews are claimed before final renders queued at the same time
+PREVIEW_PRIORITY = 0.0
+FINAL_PRIORITY = 1.0
+
+
+class QueueRenderClient:
+    """
+    Submits renders to a render queue and follows them until they finish.
+    """
+
+    def __init__(
+        self,
+        render_queue: RenderQueue,
+        upload_directory: str | Path,
+        poll_seconds: float = 1.0,
+    ) -> None:
+        self.render_queue = render_queue
+        self.upload_directory = Path(upload_directory)
+        self.poll_seconds = poll_seconds
+
+    def submit_render(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+    ) -> str:
+        """
+        Queue a render for the render nodes and return its job id.
+
+        Raises:
+            BlenderProcessError: If the GLB file is missing or the data invalid.
+        """
+        if not glb_file_path or not Path(glb_file_path).exists():
+            raise BlenderProcessError(f"GLB file not found: {glb_file_path}")
+        if not json_data or not isinstance(json_data, dict):
+            raise BlenderProcessError("Invalid JSON data provided")
+
+        tier = (json_data.get("QUALITY") or {}).get("TIER", "FINAL")
+        return self.render_queue.enqueue(
+            str(self._share_upload(Path(glb_file_path))),
+            json_data,
+            blend_file_path,
+            priority=PREVIEW_PRIORITY if tier == "PREVIEW" else FINAL_PRIORITY,
+        )
+
+    def get_job_status(self, job_id: str) -> JobStatus:
+        """
+        Get the status of a queued render.
+        """
+        status = self.render_queue.get(job_id).status
+        if status == "SUCCESS" or status == "FAILED":
+            return status
+        return "PENDING"
+
+    def get_job_progress(self, job_id: str) -> RenderProgress:
+        """
+        Get the progress of a queued render as far as the queue knows it.
+        """
+        job = self.render_queue.get(job_id)
+        if job.status == "QUEUED":
+            return RenderProgress(phase="queued")
+        if job.status == "RUNNING":
+            return RenderProgress(phase="render")
+        return RenderProgress(phase="done")
+
+    def get_job_result(self, job_id: str, timeout: float | None = None) -> str:
+        """
+        Wait for a queued render and return the video path on shared storage.
+
+        Raises:
+            RenderJobError: If the job is unknown or does not finish in time.
+            BlenderProcessError: If the render failed.
+        """
+        job = self.render_queue.wait(job_id, timeout, self.poll_seconds)
+        if job.status == "FAILED" or job.output_path is None:
+            raise BlenderProcessError(f"Render job {job_id} failed: {job.error}")
+        return job.output_path
+
+    def _share_upload(self, glb_path: Path) -> Path:
+        """Copy an uploaded GLB file to shared storage, named by its content."""
+        target = (
+            self.upload_directory / f"{FileHandler.compute_file_hash(glb_path)}.glb"
+        )
+        if target.exists():
+            # Reused uploads count as new for the storage janitor's age limit
+            os.utime(target)
+            return target
+
+        self.upload_directory.mkdir(parents=True, exist_ok=True)
+        staging = target.with_name(f".{target.name}.tmp")
+        try:
+            shutil.copyfile(glb_path, staging)
+            staging.replace(target)
+        finally:
+            staging.unlink(missing_ok=True)
+        logger.info(f"Copied upload {glb_path} to shared storage: {target}")
+        return target
@@ -0,0 +1,185 @@
+"""
+Render Cost Module
+
+This module predicts how long a render will take, so short renders can be
+scheduled ahead of long ones and users can be shown an ETA. The prediction
+starts from a simple model of Blender start-up, GLB import and per-frame
+render time scaled by the quality tier, and is refined per movement, VFX and
+quality tier by the durations of finished renders. The learned state is kept
+in a small JSON file so it survives restarts.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.glb_inspector import GlbStats
+from utils.logger import logger
+
+MIN_CORRECTION = 0.05
+MAX_CORRECTION = 20.0
+
+
+@dataclass(frozen=True)
+class CostFeatures:
+    """What the cost of a render is predicted from."""
+
+    movement: str
+    vfx: str
+    tier: str
+    file_mb: float
+    triangles: int
+    frame_step: int
+    pixel_factor: float
+
+    @property
+    def key(self) -> str:
+        """Key of the learned corrections of renders like this one."""
+        return f"{self.movement}|{self.vfx}|{self.tier}"
+
+    @property
+    def composition_key(self) -> str:
+        """Key of the learned frame count of the composition."""
+        return f"{self.movement}|{self.vfx}"
+
+
+class RenderCostModel:
+    """
+    Predicts render wall time and learns from observed durations.
+    """
+
+    def __init__(
+        self,
+        overhead_seconds: float,
+        import_seconds_per_mb: float,
+        frame_seconds: float,
+        default_frames: int,
+        frame_seconds_per_million_triangles: float = 0.2,
+        learning_rate: float = 0.3,
+        state_path: str | Path | None = None,
+    ) -> None:
+        self.overhead_seconds = overhead_seconds
+        self.import_seconds_per_mb = import_seconds_per_mb
+        self.frame_seconds = frame_seconds
+        self.default_frames = default_frames
+        self.frame_seconds_per_million_triangles = frame_seconds_per_million_triangles
+        self.learning_rate = learning_rate
+        self.state_path = Path(state_path) if state_path else None
+
+        self._corrections: dict[str, float] = {}
+        self._frames: dict[str, float] = {}
+        self._global_correction = 1.0
+        self._lock = threading.Lock()
+        self._load()
+
+    def features(
+        self, json_data: dict[str, Any], glb_stats: GlbStats | None = None
+    ) -> CostFeatures:
+        """Extract the cost features of a composition and its GLB file."""
+        quality = json_data.get("QUALITY") or {}
+        tier = str(quality.get("TIER", "FINAL"))
+        frame_step = 1
+        pixel_factor = 1.0
+        if tier != "FINAL":
+            frame_step = max(1, int(quality.get("FRAME_STEP", 1)))
+            pixel_factor = (float(quality.get("RESOLUTION_PERCENTAGE", 100)) / 100) ** 2
+
+        return CostFeatures(
+            movement=str(json_data.get("MOVEMENT", {}).get("NAME") or "unknown"),
+            vfx=str(json_data.get("VFX_SHOT", {}).get("NAME") or "unknown"),
+            tier=tier,
+            file_mb=glb_stats.file_bytes / 1024 / 1024 if glb_stats else 0.0,
+            triangles=glb_stats.triangle_count if glb_stats else 0,
+            frame_step=frame_step,
+            pixel_factor=pixel_factor,
+        )
+
+    def estimate(self, features: CostFeatures) -> float:
+        """Predicted wall time of a render in seconds."""
+        with self._lock:
+            correction = self._corrections.get(features.key, self._global_correction)
+            frames = self._frames.get(features.composition_key, self.default_frames)
+        return self._base_estimate(features, frames) * correction
+
+    def observe(
+        self, features: CostFeatures, seconds: float, frames: int | None = None
+    ) -> None:
+        """
+        Refine the model with the duration of a finished render.
+
+        Args:
+            features: Features the render was estimated from.
+            seconds: Observed wall time of the render.
+            frames: Number of frames rendered, if known.
+        """
+        with self._lock:
+            if frames:
+                self._frames[features.composition_key] = self._blend(
+                    self._frames.get(features.composition_key),
+                    frames * features.frame_step,
+                )
+            base = self._base_estimate(
+                features,
+                self._frames.get(features.composition_key, self.default_frames),
+            )
+            ratio = min(MAX_CORRECTION, max(MIN_CORRECTION, seconds / base))
+            correction = self._blend(self._corrections.get(features.key), ratio)
+            self._corrections[features.key] = correction
+            self._global_correction = self._blend(self._global_correction, ratio)
+            self._save()
+
+        logger.debug(
+            f"Render cost of {features.key}: {seconds:.1f}s observed, "
+            f"{base:.1f}s modelled, correction now {correction:.2f}"
+        )
+
+    def _base_estimate(self, features: CostFeatures, frames: float) -> float:
+        """Uncorrected prediction of the model."""
+        frame_seconds = (
+            self.frame_seconds
+            + features.triangles / 1e6 * self.frame_seconds_per_million_triangles
+        ) * features.pixel_factor
+        return (
+            self.overhead_seconds
+            + features.file_mb * self.import_seconds_per_mb
+            + frames / features.frame_step * frame_seconds
+        )
+
+    def _blend(self, previous: float | None, value: float) -> float:
+        """Exponentially weighted moving average step."""
+        if previous is None:
+            return value
+        return previous + self.learning_rate * (value - previous)
+
+    def _load(self) -> None:
+        """Restore the learned state from the state file, if any."""
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            state = json.loads(self.state_path.read_text())
+            self._corrections = {
+                key: float(value) for key, value in state["corrections"].items()
+            }
+            self._frames = {key: float(value) for key, value in state["frames"].items()}
+            self._global_correction = float(state["global_correction"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Cannot load render cost model {self.state_path}: {e}")
+
+    def _save(self) -> None:
+        """Write the learned state to the state file, holding the lock."""
+        if self.state_path is None:
+            return
+        state = {
+            "corrections": self._corrections,
+            "frames": self._frames,
+            "global_correction": self._global_correction,
+        }
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            staging = self.state_path.with_name(f".{self.state_path.name}.tmp")
+            staging.write_text(json.dumps(state, indent=2, sort_keys=True))
+            staging.replace(self.state_path)
+        except OSError as e:
+            logger.warning(f"Cannot save render cost model {self.state_path}: {e}")
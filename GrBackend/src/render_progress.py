@@ -0,0 +1,169 @@
+"""
+Render Progress Module
+
+This module turns Blender output into typed progress events. It understands
+the phase and scene_info events printed by `process.py` and the per-frame
+status lines Cycles and Eevee print while rendering, and estimates the time
+left from the frames rendered so far.
+"""
+
+import re
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from typing import Any
+
+from src.blender_events import BlenderEvent, parse_blender_event
+
+FRAME_PATTERN = re.compile(r"^Fra:(\d+)\b")
+REMAINING_PATTERN = re.compile(r"Remaining:\s*(\d+(?::\d+)*(?:\.\d+)?)")
+SAMPLE_PATTERNS = (
+    re.compile(r"\bSample (\d+)/(\d+)"),
+    re.compile(r"\bRendering (\d+) / (\d+) samples"),
+)
+
+PHASE_LABELS = {
+    "queued": "Waiting in queue",
+    "optimize_glb": "Optimizing product",
+    "starting": "Starting Blender",
+    "import_animation": "Loading composition",
+    "import_object": "Importing product",
+    "apply_movement": "Applying movement",
+    "apply_vfx": "Applying VFX",
+    "render": "Rendering",
+    "post_process": "Finishing video",
+    "done": "Done",
+}
+
+
+@dataclass(frozen=True)
+class RenderProgress:
+    """A snapshot of how far a render has come."""
+
+    phase: str
+    frame: int | None = None
+    total_frames: int | None = None
+    sample: int | None = None
+    total_samples: int | None = None
+    eta_seconds: float | None = None
+
+    def describe(self) -> str:
+        """Human-readable one-line summary for the UI."""
+        text = PHASE_LABELS.get(self.phase, self.phase.replace("_", " ").title())
+
+        if self.frame is not None and self.total_frames:
+            text += f" · frame {self.frame}/{self.total_frames}"
+        if self.sample is not None and self.total_samples:
+            text += f" · sample {self.sample}/{self.total_samples}"
+        if self.eta_seconds is not None:
+            minutes, seconds = divmod(int(self.eta_seconds), 60)
+            text += (
+                f" · ETA {minutes}m {seconds:02d}s" if minutes else f" · ETA {seconds}s"
+            )
+
+        return text
+
+
+ProgressCallback = Callable[[RenderProgress], None]
+
+
+class RenderProgressParser:
+    """
+    Feeds on Blender output lines and reports progress whenever it changes.
+    """
+
+    def __init__(self) -> None:
+        self.progress = RenderProgress(phase="starting")
+        self._frame_start: int | None = None
+        self._frame_step = 1
+        self._render_started_at: float | None = None
+
+    def feed(self, line: str) -> RenderProgress | None:
+        """
+        Parse one line of output.
+
+        Returns:
+            The new progress if the line changed it, otherwise None.
+        """
+        event = parse_blender_event(line)
+        if event is not None:
+            return self._handle_event(event)
+
+        frame_match = FRAME_PATTERN.match(line)
+        if frame_match:
+            return self._handle_frame_line(int(frame_match.group(1)), line)
+
+        return None
+
+    def _handle_event(self, event: BlenderEvent) -> RenderProgress | None:
+        """Apply a `process.py` event."""
+        if event["event"] == "phase":
+            if event["phase"] == "render":
+                self._render_started_at = time.monotonic()
+            return self._update(phase=event["phase"], sample=None, total_samples=None)
+
+        if event["event"] == "scene_info":
+            self._frame_start = int(event["frame_start"])
+            self._frame_step = max(1, int(event.get("frame_step", 1)))
+            total_frames = (
+                int(event["frame_end"]) - self._frame_start
+            ) // self._frame_step + 1
+            return self._update(total_frames=total_frames)
+
+        return None
+
+    def _handle_frame_line(self, frame: int, line: str) -> RenderProgress | None:
+        """Apply a Cycles/Eevee per-frame status line."""
+        frame_number = frame
+        if self._frame_start is not None:
+            frame_number = (frame - self._frame_start) // self._frame_step + 1
+
+        sample = total_samples = None
+        for pattern in SAMPLE_PATTERNS:
+            sample_match = pattern.search(line)
+            if sample_match:
+                sample, total_samples = map(int, sample_match.groups())
+                break
+
+        return self._update(
+            phase="render",
+            frame=frame_number,
+            sample=sample,
+            total_samples=total_samples,
+            eta_seconds=self._estimate_eta(frame_number, line),
+        )
+
+    def _estimate_eta(self, frame_number: int, line: str) -> float | None:
+        """
+        Extrapolate the time left from the average time of finished frames,
+        falling back to Blender's own estimate for the current frame.
+        """
+        total_frames = self.progress.total_frames
+        frames_done = frame_number - 1
+
+        if self._render_started_at is not None and total_frames and frames_done > 0:
+            elapsed = time.monotonic() - self._render_started_at
+            return elapsed / frames_done * (total_frames - frames_done)
+
+        remaining_match = REMAINING_PATTERN.search(line)
+        if remaining_match:
+            current_frame_left = parse_duration(remaining_match.group(1))
+            return current_frame_left * max(1, (total_frames or 1) - frames_done)
+
+        return self.progress.eta_seconds
+
+    def _update(self, **changes: Any) -> RenderProgress | None:
+        """Replace fields of the current progress, reporting only real changes."""
+        progress = replace(self.progress, **changes)
+        if progress == self.progress:
+            return None
+        self.progress = progress
+        return progress
+
+
+def parse_duration(text: str) -> float:
+    """Parse Blender's "[HH:]MM:SS.ss" durations into seconds."""
+    seconds = 0.0
+    for part in text.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
@@ -0,0 +1,35 @@
+"""
+Render Quality Module
+
+This module adds the quality tier to composition data. A preview renders at a
+reduced resolution percentage, sample count and frame step, which
+`process.py` applies after the composition is imported; the final tier leaves
+the composition untouched so it renders with the base file's settings.
+"""
+
+from typing import Any, Literal
+
+from src.config import (
+    RENDER_PREVIEW_FRAME_STEP,
+    RENDER_PREVIEW_RESOLUTION_PERCENTAGE,
+    RENDER_PREVIEW_SAMPLES,
+)
+
+RenderQuality = Literal["PREVIEW", "FINAL"]
+
+
+def with_render_quality(
+    json_data: dict[str, Any], quality: RenderQuality
+) -> dict[str, Any]:
+    """
+    Return a copy of the composition data rendering at the given quality.
+    """
+    json_data = {key: value for key, value in json_data.items() if key != "QUALITY"}
+    if quality == "PREVIEW":
+        json_data["QUALITY"] = {
+            "TIER": "PREVIEW",
+            "RESOLUTION_PERCENTAGE": RENDER_PREVIEW_RESOLUTION_PERCENTAGE,
+            "SAMPLES": RENDER_PREVIEW_SAMPLES,
+            "FRAME_STEP": RENDER_PREVIEW_FRAME_STEP,
+        }
+    return json_data
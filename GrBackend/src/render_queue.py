@@ -0,0 +1,380 @@
+"""
+Render Queue Module
+
+This module is the shared queue between the web tier and render worker
+agents. The web tier enqueues render jobs; agents on any node that sees the
+queue and the shared storage claim them under a lease, renew the lease while
+they render and report the result. A job whose lease runs out, because its
+worker died or lost the storage, goes back to the queue for another worker
+until it has been attempted `max_attempts` times. Finished jobs are deleted
+once they are past the retention count or age.
+
+`RenderQueue` is the interface agents and producers use. `SqliteRenderQueue`
+implements it on a SQLite database in WAL mode, which serves a single node or
+nodes sharing a file system with working locks; other backends only need to
+implement the same methods.
+"""
+
+import json
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Literal, Protocol
+
+from src.sqlite_database import SqliteDatabase
+from utils.exceptions import RenderJobError
+from utils.logger import logger
+
+QueueStatus = Literal["QUEUED", "RUNNING", "SUCCESS", "FAILED"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS render_jobs (
+    job_id TEXT PRIMARY KEY,
+    glb_file_path TEXT NOT NULL,
+    json_data TEXT NOT NULL,
+    blend_file_path TEXT,
+    priority REAL NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires_at REAL,
+    submitted_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    output_path TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS render_jobs_by_status
+    ON render_jobs (status, priority, submitted_at);
+CREATE INDEX IF NOT EXISTS render_jobs_by_finished ON render_jobs (finished_at)
+    WHERE finished_at IS NOT NULL;
+"""
+
+
+@dataclass(frozen=True)
+class QueuedRenderJob:
+    """A render job as stored in the queue."""
+
+    job_id: str
+    glb_file_path: str
+    json_data: dict[str, Any]
+    blend_file_path: str | None
+    priority: float
+    status: QueueStatus
+    attempts: int
+    worker_id: str | None
+    lease_expires_at: float | None
+    submitted_at: float
+    started_at: float | None = None
+    finished_at: float | None = None
+    output_path: str | None = None
+    error: str | None = None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job reached a final status."""
+        return self.status in ("SUCCESS", "FAILED")
+
+
+class RenderQueue(Protocol):
+    """
+    A queue of render jobs claimed by workers under a lease.
+
+    Lower priorities are claimed first, then older jobs. Operations taking a
+    `worker_id` only apply while that worker holds the job's lease and return
+    whether they did.
+    """
+
+    def enqueue(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+        priority: float = 0.0,
+    ) -> str:
+        """Add a job to the queue and return its id."""
+        ...
+
+    def claim(self, worker_id: str, lease_seconds: float) -> QueuedRenderJob | None:
+        """Lease the next queued job to a worker, if there is one."""
+        ...
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a worker's lease on a job."""
+        ...
+
+    def complete(self, job_id: str, worker_id: str, output_path: str) -> bool:
+        """Record the output of a job."""
+        ...
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Record that a job failed."""
+        ...
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Give a job back to the queue without counting the attempt."""
+        ...
+
+    def prune(self) -> int:
+        """Delete finished jobs past the retention limits and count them."""
+        ...
+
+    def requeue_expired(self) -> int:
+        """Return jobs with expired leases to the queue and count them."""
+        ...
+
+    def get(self, job_id: str) -> QueuedRenderJob:
+        """Look up a job by id."""
+        ...
+
+    def wait(
+        self, job_id: str, timeout: float | None = None, poll_seconds: float = 1.0
+    ) -> QueuedRenderJob:
+        """Poll a job until it is finished."""
+        ...
+
+
+class SqliteRenderQueue:
+    """
+    Render queue stored in a SQLite database in WAL mode.
+
+    Claims run in an immediate transaction, so two workers never lease the
+    same job. Only the newest `max_finished_jobs` finished jobs, finished
+    within `max_age_seconds`, are kept (0 disables a limit).
+    """
+
+    def __init__(
+        self,
+        database_path: str | Path,
+        max_attempts: int = 3,
+        busy_timeout_seconds: float = 30.0,
+        max_finished_jobs: int = 0,
+        max_age_seconds: float = 0,
+    ) -> None:
+        self.max_attempts = max_attempts
+        self.max_finished_jobs = max_finished_jobs
+        self.max_age_seconds = max_age_seconds
+        self.database = SqliteDatabase(database_path, SCHEMA, busy_timeout_seconds)
+        pruned = self.prune()
+        if pruned:
+            logger.info(f"Deleted {pruned} finished render jobs from the render queue")
+
+    def enqueue(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+        priority: float = 0.0,
+    ) -> str:
+        """Add a job to the queue and return its id."""
+        job_id = uuid.uuid4().hex
+        with self.database.transaction() as connection:
+            connection.execute(
+                "INSERT INTO render_jobs (job_id, glb_file_path, json_data, "
+                "blend_file_path, priority, status, submitted_at) "
+                "VALUES (?, ?, ?, ?, ?, 'QUEUED', ?)",
+                (
+                    job_id,
+                    glb_file_path,
+                    json.dumps(json_data),
+                    blend_file_path,
+                    priority,
+                    time.time(),
+                ),
+            )
+        logger.info(f"Queued render job {job_id}")
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: float) -> QueuedRenderJob | None:
+        """Lease the next queued job to a worker, if there is one."""
+        now = time.time()
+        with self.database.transaction() as connection:
+            self._requeue_expired(connection, now)
+            row = connection.execute(
+                "SELECT job_id FROM render_jobs WHERE status = 'QUEUED' "
+                "ORDER BY priority, submitted_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE render_jobs SET status = 'RUNNING', worker_id = ?, "
+                "lease_expires_at = ?, attempts = attempts + 1, started_at = ? "
+                "WHERE job_id = ?",
+                (worker_id, now + lease_seconds, now, row["job_id"]),
+            )
+            job = self._get(connection, row["job_id"])
+        logger.info(
+            f"Worker {worker_id} claimed render job {job.job_id} "
+            f"(attempt {job.attempts})"
+        )
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float) -> bool:
+        """Extend a worker's lease on a job."""
+        with self.database.transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE render_jobs SET lease_expires_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'RUNNING'",
+                (time.time() + lease_seconds, job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, output_path: str) -> bool:
+        """Record the output of a job."""
+        return self._finish(job_id, worker_id, "SUCCESS", output_path=output_path)
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """Record that a job failed."""
+        return self._finish(job_id, worker_id, "FAILED", error=error)
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """Give a job back to the queue without counting the attempt."""
+        with self.database.transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE render_jobs SET status = 'QUEUED', worker_id = NULL, "
+                "lease_expires_at = NULL, attempts = MAX(0, attempts - 1) "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'RUNNING'",
+                (job_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def prune(self) -> int:
+        """Delete finished jobs past the retention limits and count them."""
+        with self.database.transaction() as connection:
+            return self._prune(connection)
+
+    def requeue_expired(self) -> int:
+        """Return jobs with expired leases to the queue and count them."""
+        with self.database.transaction() as connection:
+            return self._requeue_expired(connection, time.time())
+
+    def get(self, job_id: str) -> QueuedRenderJob:
+        """
+        Look up a job by id.
+
+        Raises:
+            RenderJobError: If the job is unknown.
+        """
+        return self._get(self.database.connection(), job_id)
+
+    def wait(
+        self, job_id: str, timeout: float | None = None, poll_seconds: float = 1.0
+    ) -> QueuedRenderJob:
+        """
+        Poll a job until it is finished.
+
+        Raises:
+            RenderJobError: If the job is unknown or does not finish in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            if job.finished:
+                return job
+            if deadline is not None and time.monotonic() >= deadline:
+                raise RenderJobError(
+                    f"Render job {job_id} did not finish within {timeout}s", job_id
+                )
+            time.sleep(poll_seconds)
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs by status."""
+        rows = self.database.connection().execute(
+            "SELECT status, COUNT(*) AS count FROM render_jobs GROUP BY status"
+        )
+        return {row["status"]: row["count"] for row in rows}
+
+    def _finish(
+        self,
+        job_id: str,
+        worker_id: str,
+        status: QueueStatus,
+        output_path: str | None = None,
+        error: str | None = None,
+    ) -> bool:
+        """Move a leased job to a final status."""
+        with self.database.transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE render_jobs SET status = ?, output_path = ?, error = ?, "
+                "finished_at = ?, lease_expires_at = NULL "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'RUNNING'",
+                (status, output_path, error, time.time(), job_id, worker_id),
+            )
+            self._prune(connection)
+        if cursor.rowcount != 1:
+            logger.warning(
+                f"Worker {worker_id} no longer holds render job {job_id}, "
+                f"dropping its {status} result"
+            )
+            return False
+        return True
+
+    def _requeue_expired(self, connection: sqlite3.Connection, now: float) -> int:
+        """Requeue or fail the jobs whose lease expired, inside a transaction."""
+        expired = connection.execute(
+            "SELECT job_id, worker_id, attempts FROM render_jobs "
+            "WHERE status = 'RUNNING' AND lease_expires_at < ?",
+            (now,),
+        ).fetchall()
+        for row in expired:
+            if row["attempts"] >= self.max_attempts:
+                connection.execute(
+                    "UPDATE render_jobs SET status = 'FAILED', error = ?, "
+                    "finished_at = ?, lease_expires_at = NULL WHERE job_id = ?",
+                    (
+                        f"Lease expired after {row['attempts']} attempts",
+                        now,
+                        row["job_id"],
+                    ),
+                )
+                logger.error(
+                    f"Render job {row['job_id']} failed: lease of worker "
+                    f"{row['worker_id']} expired on the last attempt"
+                )
+            else:
+                connection.execute(
+                    "UPDATE render_jobs SET status = 'QUEUED', worker_id = NULL, "
+                    "lease_expires_at = NULL WHERE job_id = ?",
+                    (row["job_id"],),
+                )
+                logger.warning(
+                    f"Requeued render job {row['job_id']}: lease of worker "
+                    f"{row['worker_id']} expired"
+                )
+        return len(expired)
+
+    def _prune(self, connection: sqlite3.Connection) -> int:
+        """Delete finished jobs past the retention limits, inside a transaction."""
+        cutoffs = []
+        if self.max_age_seconds > 0:
+            cutoffs.append(time.time() - self.max_age_seconds)
+        if self.max_finished_jobs > 0:
+            row = connection.execute(
+                "SELECT finished_at FROM render_jobs WHERE finished_at IS NOT NULL "
+                "ORDER BY finished_at DESC LIMIT 1 OFFSET ?",
+                (self.max_finished_jobs - 1,),
+            ).fetchone()
+            if row is not None:
+                cutoffs.append(row["finished_at"])
+        if not cutoffs:
+            return 0
+
+        cursor = connection.execute(
+            "DELETE FROM render_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+            (max(cutoffs),),
+        )
+        return cursor.rowcount
+
+    @staticmethod
+    def _get(connection: sqlite3.Connection, job_id: str) -> QueuedRenderJob:
+        """Read a job row."""
+        row = connection.execute(
+            "SELECT * FROM render_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            raise RenderJobError(f"Unknown render job: {job_id}", job_id)
+        values = dict(row)
+        values["json_data"] = json.loads(values["json_data"])
+        return QueuedRenderJob(**values)
@@ -0,0 +1,143 @@
+"""
+Render Timeline Module
+
+This module collects the timing events `process.py` prints during a render
+into a per-job timeline: the wall time and peak memory of every phase and the
+scene evaluation and render time of every frame. It shows whether a slow job
+was slow at import, at scene evaluation or at a particular frame.
+"""
+
+import threading
+from collections.abc import Generator, Iterable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from src.blender_events import BlenderEvent, parse_blender_event
+
+
+@dataclass(frozen=True)
+class PhaseTiming:
+    """Wall time and peak memory of one phase of a Blender run."""
+
+    phase: str
+    seconds: float
+    peak_memory_bytes: int | None = None
+
+
+@dataclass(frozen=True)
+class FrameTiming:
+    """Scene evaluation and render time of one frame."""
+
+    frame: int
+    seconds: float
+    evaluation_seconds: float | None = None
+    peak_memory_bytes: int | None = None
+
+
+@dataclass
+class RenderTimeline:
+    """
+    Timing events of one render, which may span several Blender runs.
+    """
+
+    phases: list[PhaseTiming] = field(default_factory=list)
+    frames: list[FrameTiming] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def feed(self, line: str) -> None:
+        """Record a line of Blender output if it is a timing event."""
+        event = parse_blender_event(line)
+        if event is not None:
+            self._handle_event(event)
+
+    def record(self, lines: Iterable[str]) -> Generator[str, None, None]:
+        """
+        Pass output lines through while recording their timing events.
+
+        Closing the returned generator closes the wrapped output as well.
+        """
+        try:
+            for line in lines:
+                self.feed(line)
+                yield line
+        finally:
+            if isinstance(lines, Generator):
+                lines.close()
+
+    def slowest_frames(self, count: int = 3) -> list[FrameTiming]:
+        """The frames that took longest to render."""
+        with self._lock:
+            frames = list(self.frames)
+        return sorted(frames, key=lambda frame: frame.seconds, reverse=True)[:count]
+
+    def peak_memory_bytes(self) -> int | None:
+        """Highest peak memory reported by any phase or frame."""
+        with self._lock:
+            timings: list[PhaseTiming | FrameTiming] = [*self.phases, *self.frames]
+        peaks = [
+            timing.peak_memory_bytes
+            for timing in timings
+            if timing.peak_memory_bytes is not None
+        ]
+        return max(peaks, default=None)
+
+    def as_dict(self) -> dict[str, Any]:
+        """The timeline as JSON serializable data."""
+        with self._lock:
+            return {
+                "phases": [asdict(phase) for phase in self.phases],
+                "frames": [
+                    asdict(frame)
+                    for frame in sorted(self.frames, key=lambda frame: frame.frame)
+                ],
+            }
+
+    def summary(self) -> str:
+        """One-line summary for the log."""
+        with self._lock:
+            phase_seconds: dict[str, float] = {}
+            for phase in self.phases:
+                phase_seconds[phase.phase] = (
+                    phase_seconds.get(phase.phase, 0.0) + phase.seconds
+                )
+            frames = list(self.frames)
+
+        parts = [f"{phase} {seconds:.1f}s" for phase, seconds in phase_seconds.items()]
+        if frames:
+            average = sum(frame.seconds for frame in frames) / len(frames)
+            slowest = max(frames, key=lambda frame: frame.seconds)
+            parts.append(
+                f"{len(frames)} frames avg {average:.2f}s, "
+                f"slowest frame {slowest.frame} {slowest.seconds:.2f}s"
+            )
+        peak = self.peak_memory_bytes()
+        if peak is not None:
+            parts.append(f"peak memory {peak / 1024 / 1024:.0f} MB")
+        return ", ".join(parts) if parts else "no timing events"
+
+    def _handle_event(self, event: BlenderEvent) -> None:
+        """Apply a phase_timing or frame_timing event."""
+        if event["event"] == "phase_timing":
+            phase_timing = PhaseTiming(
+                phase=str(event["phase"]),
+                seconds=float(event["seconds"]),
+                peak_memory_bytes=event.get("peak_memory_bytes"),
+            )
+            with self._lock:
+                self.phases.append(phase_timing)
+        elif event["event"] == "frame_timing":
+            evaluation_seconds = event.get("evaluation_seconds")
+            frame_timing = FrameTiming(
+                frame=int(event["frame"]),
+                seconds=float(event["seconds"]),
+                evaluation_seconds=(
+                    float(evaluation_seconds)
+                    if evaluation_seconds is not None
+                    else None
+                ),
+                peak_memory_bytes=event.get("peak_memory_bytes"),
+            )
+            with self._lock:
+                self.frames.append(frame_timing)
@@ -0,0 +1,95 @@
+"""
+Render Watchdog Module
+
+This module bounds how long a Blender process may run. A watchdog enforces a
+total wall-clock budget and a stall timeout that trips when Blender prints
+nothing for too long, and remembers the phase reported by `process.py` so the
+resulting error says where the render got stuck. Offending processes are
+killed together with their process group, so Blender's child processes do
+not outlive it.
+"""
+
+import os
+import signal
+import subprocess
+import time
+
+from src.blender_events import parse_blender_event
+from utils.exceptions import BlenderProcessTimeoutError
+from utils.logger import logger
+
+
+class RenderWatchdog:
+    """
+    Tracks the time budget and output activity of one Blender run.
+
+    A timeout of 0 or None disables the corresponding check.
+    """
+
+    def __init__(
+        self, total_timeout: float | None, stall_timeout: float | None
+    ) -> None:
+        self.total_timeout = total_timeout or None
+        self.stall_timeout = stall_timeout or None
+        self.phase = "starting"
+        self.started_at = time.monotonic()
+        self.last_output_at = self.started_at
+
+    def feed(self, line: str) -> None:
+        """Record output activity and the phase it reports."""
+        self.last_output_at = time.monotonic()
+        event = parse_blender_event(line)
+        if event is not None and event["event"] == "phase":
+            self.phase = event["phase"]
+
+    def time_left(self) -> float | None:
+        """Seconds until the next deadline, or None without deadlines."""
+        deadlines = []
+        if self.total_timeout is not None:
+            deadlines.append(self.started_at + self.total_timeout)
+        if self.stall_timeout is not None:
+            deadlines.append(self.last_output_at + self.stall_timeout)
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - time.monotonic())
+
+    def check(self) -> None:
+        """
+        Raise if a deadline has passed.
+
+        Raises:
+            BlenderProcessTimeoutError: With the phase the render was in.
+        """
+        now = time.monotonic()
+        if (
+            self.total_timeout is not None
+            and now - self.started_at >= self.total_timeout
+        ):
+            raise BlenderProcessTimeoutError(
+                f"Blender exceeded the {self.total_timeout:g}s render budget "
+                f"during phase '{self.phase}'",
+                self.phase,
+            )
+        if (
+            self.stall_timeout is not None
+            and now - self.last_output_at >= self.stall_timeout
+        ):
+            raise BlenderProcessTimeoutError(
+                f"Blender printed nothing for {self.stall_timeout:g}s "
+                f"during phase '{self.phase}'",
+                self.phase,
+            )
+
+
+def kill_process_group(process: subprocess.Popen[str]) -> None:
+    """
+    Kill a process started with `start_new_session=True` and its children.
+    """
+    if process.poll() is not None:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (OSError, AttributeError) as e:
+        logger.warning(f"Cannot kill process group {process.pid}: {e}")
+        process.kill()
+    process.wait()
@@ -0,0 +1,217 @@
+"""
+Resource Profile Module
+
+This module governs the CPU, thread and memory usage of Blender processes.
+Every concurrent render runs in a numbered slot; the slot determines the CPU
+set the process is pinned to, so N renders on a node get disjoint cores
+instead of fighting over all of them. Warm workers reserve their slots for as
+long as they live, so short Blender runs never share their cores. Limits are
+applied to the process right after it starts, which keeps `subprocess` free of
+`preexec_fn` in this multi-threaded server.
+"""
+
+import os
+import queue
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from utils.logger import logger
+
+if sys.platform != "win32":
+    import resource
+
+MemoryLimitMode = Literal["rlimit", "cgroup"]
+
+
+@dataclass(frozen=True)
+class ResourceProfile:
+    """Resource limits applied to one Blender process."""
+
+    slot: int
+    threads: int = 0
+    cpus: tuple[int, ...] | None = None
+    memory_limit_bytes: int | None = None
+    nice: int = 0
+    cgroup_path: Path | None = None
+
+    def blender_args(self) -> list[str]:
+        """Command line arguments limiting Blender's render threads."""
+        return ["--threads", str(self.threads)] if self.threads > 0 else []
+
+    def apply(self, pid: int) -> None:
+        """
+        Apply the profile to a freshly started process.
+
+        The process runs unrestricted for the moment between its start and
+        this call. Blender is still loading then, so the window only matters
+        for memory: whatever it allocated up to here is not held back, but it
+        cannot grow past the limit afterwards. The CPU set is applied to every
+        thread that already exists, since threads only inherit it when they
+        are created.
+
+        A limit that cannot be applied is logged and skipped rather than
+        failing the render.
+        """
+        if self.cpus:
+            try:
+                for thread_id in _thread_ids(pid):
+                    os.sched_setaffinity(thread_id, self.cpus)
+            except (OSError, AttributeError) as e:
+                logger.warning(f"Cannot pin process {pid} to CPUs {self.cpus}: {e}")
+
+        if self.nice:
+            try:
+                os.setpriority(os.PRIO_PROCESS, pid, self.nice)
+            except (OSError, AttributeError) as e:
+                logger.warning(f"Cannot set nice level of process {pid}: {e}")
+
+        if self.memory_limit_bytes is None:
+            return
+
+        if self.cgroup_path is not None:
+            try:
+                (self.cgroup_path / "cgroup.procs").write_text(str(pid))
+                return
+            except OSError as e:
+                logger.warning(
+                    f"Cannot move process {pid} into {self.cgroup_path}, "
+                    f"falling back to RLIMIT_AS: {e}"
+                )
+
+        if sys.platform == "win32":
+            logger.warning(f"Memory limits are not supported here, process {pid}")
+            return
+
+        try:
+            resource.prlimit(
+                pid,
+                resource.RLIMIT_AS,
+                (self.memory_limit_bytes, self.memory_limit_bytes),
+            )
+        except (OSError, ValueError, AttributeError) as e:
+            logger.warning(f"Cannot limit memory of process {pid}: {e}")
+
+
+class ResourceGovernor:
+    """
+    Hands out resource slots to Blender processes.
+
+    Acquiring a slot blocks while all slots are in use, which caps the number
+    of Blender processes packed onto the node.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        threads: int = 0,
+        pin_cpus: bool = False,
+        memory_limit_mb: int = 0,
+        memory_limit_mode: MemoryLimitMode = "rlimit",
+        cgroup_root: str | Path | None = None,
+        nice: int = 0,
+    ) -> None:
+        if slots < 1:
+            raise ValueError("Resource slot count must be at least 1")
+
+        self.slots = slots
+        self.threads = threads
+        self.pin_cpus = pin_cpus
+        self.memory_limit_bytes = (
+            memory_limit_mb * 1024 * 1024 if memory_limit_mb > 0 else None
+        )
+        self.memory_limit_mode = memory_limit_mode
+        self.cgroup_root = Path(cgroup_root) if cgroup_root else None
+        self.nice = nice
+
+        self._profiles = [self._build_profile(slot) for slot in range(slots)]
+        self._free_slots: queue.Queue[int] = queue.Queue()
+        for slot in range(slots):
+            self._free_slots.put(slot)
+
+    def reserve(self, count: int) -> list[ResourceProfile]:
+        """
+        Take slots out of circulation for long-lived processes.
+
+        Raises:
+            ValueError: If no slot would be left for `acquire`.
+        """
+        if count >= self.slots:
+            raise ValueError(
+                f"Cannot reserve {count} of {self.slots} resource slots, "
+                "short Blender runs need at least one"
+            )
+        return [self._profiles[self._free_slots.get()] for _ in range(count)]
+
+    @contextmanager
+    def acquire(self) -> Iterator[ResourceProfile]:
+        """Reserve a free slot for the duration of a Blender process."""
+        slot = self._free_slots.get()
+        try:
+            yield self._profiles[slot]
+        finally:
+            self._free_slots.put(slot)
+
+    def _build_profile(self, slot: int) -> ResourceProfile:
+        """Derive the CPU set, thread count and memory cap of a slot."""
+        cpus = self._cpus_for(slot) if self.pin_cpus else None
+        threads = self.threads
+        if threads <= 0 and cpus:
+            threads = len(cpus)
+
+        cgroup_path = None
+        if self.memory_limit_bytes is not None and self.memory_limit_mode == "cgroup":
+            cgroup_path = self._prepare_cgroup(slot)
+
+        profile = ResourceProfile(
+            slot=slot,
+            threads=threads,
+            cpus=cpus,
+            memory_limit_bytes=self.memory_limit_bytes,
+            nice=self.nice,
+            cgroup_path=cgroup_path,
+        )
+        logger.debug(f"Resource profile of slot {slot}: {profile}")
+        return profile
+
+    def _cpus_for(self, slot: int) -> tuple[int, ...]:
+        """Split the CPUs available to the server evenly between slots."""
+        try:
+            available = sorted(os.sched_getaffinity(0))
+        except AttributeError:
+            available = list(range(os.cpu_count() or 1))
+        per_slot = max(1, len(available) // self.slots)
+        start = (slot * per_slot) % len(available)
+        return tuple(available[start : start + per_slot])
+
+    def _prepare_cgroup(self, slot: int) -> Path | None:
+        """
+        Create the cgroup v2 directory of a slot and set its memory cap.
+
+        The cgroup root has to be delegated to the server's user.
+        """
+        if self.cgroup_root is None:
+            logger.warning("No cgroup root configured, using RLIMIT_AS instead")
+            return None
+
+        cgroup_path = self.cgroup_root / f"blender-slot-{slot}"
+        try:
+            cgroup_path.mkdir(parents=True, exist_ok=True)
+            (cgroup_path / "memory.max").write_text(str(self.memory_limit_bytes))
+        except OSError as e:
+            logger.warning(
+                f"Cannot set up cgroup {cgroup_path}, using RLIMIT_AS instead: {e}"
+            )
+            return None
+        return cgroup_path
+
+
+def _thread_ids(pid: int) -> list[int]:
+    """The ids of all threads of a process, or just the process id."""
+    try:
+        return [int(task.name) for task in Path(f"/proc/{pid}/task").iterdir()]
+    except (OSError, ValueError):
+        return [pid]
@@ -0,0 +1,74 @@
+"""
+Single Flight Module
+
+This module coalesces concurrent calls that share a key: the first caller runs
+the work, and callers arriving while it is in flight wait for it and receive
+the same result or exception.
+"""
+
+import threading
+from collections.abc import Callable
+
+from utils.logger import logger
+
+
+class _Call[T]:
+    """An in-flight call and its eventual outcome."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: T | None = None
+        self.error: BaseException | None = None
+        self.waiters = 0
+
+
+class SingleFlight[T]:
+    """
+    Runs at most one call per key at a time and shares its outcome.
+    """
+
+    def __init__(self) -> None:
+        self.coalesced = 0
+        self._calls: dict[str, _Call[T]] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: str, function: Callable[[], T]) -> T:
+        """
+        Run `function` unless a call with the same key is already in flight,
+        in which case wait for that call instead.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+
+        if is_leader:
+            try:
+                result = function()
+                call.result = result
+                return result
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+                if call.waiters:
+                    logger.info(f"Shared result of {key} with {call.waiters} callers")
+
+        logger.info(f"Joining in-flight call for {key}")
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result  # type: ignore[return-value]
+
+    def in_flight(self) -> int:
+        """Number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
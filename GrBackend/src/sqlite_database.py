@@ -0,0 +1,58 @@
+"""
+SQLite Database Module
+
+This module opens the SQLite databases the service keeps its durable state
+in. Databases run in WAL mode, so readers do not block the writer, and every
+thread gets its own connection. Writes go through immediate transactions,
+which take the write lock up front instead of failing halfway through.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+
+class SqliteDatabase:
+    """
+    A SQLite database file with per-thread connections.
+    """
+
+    def __init__(
+        self, database_path: str | Path, schema: str, busy_timeout_seconds: float = 30.0
+    ) -> None:
+        self.database_path = Path(database_path)
+        self.busy_timeout_seconds = busy_timeout_seconds
+        self._local = threading.local()
+
+        self.database_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection().executescript(schema)
+
+    def connection(self) -> sqlite3.Connection:
+        """The connection of the calling thread."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.database_path,
+                timeout=self.busy_timeout_seconds,
+                isolation_level=None,
+            )
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Run statements in an immediate transaction of the calling thread."""
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
@@ -0,0 +1,210 @@
+"""
+Temp Janitor Module
+
+This module keeps the renderer's temporary directory within a byte quota and
+a maximum file age. Entries are removed oldest first by a background thread,
+a bounded batch per sweep, so a large backlog is worked off incrementally
+instead of in one long pause. Paths that in-flight renders still use are
+pinned and never removed. The same janitor keeps the render queue's shared
+uploads and videos in check.
+"""
+
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from utils.logger import logger
+
+
+@dataclass
+class _Entry:
+    """A top-level file or directory of the managed directory."""
+
+    path: Path
+    size: int
+    modified_at: float
+
+
+class TempDirectoryJanitor:
+    """
+    Enforces a byte quota and a maximum age on a temporary directory.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int,
+        max_age_seconds: float,
+        interval_seconds: float = 60.0,
+        batch_size: int = 100,
+        name: str = "Temp",
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.name = name
+
+        self.evicted_files = 0
+        self.evicted_bytes = 0
+        self.last_sweep_at: float | None = None
+        self._last_usage = (0, 0)
+        self._pins: Counter[Path] = Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Start sweeping in a background thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name.lower()}-janitor", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"{self.name} janitor watching {self.directory}")
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @contextmanager
+    def pinned(self, *paths: str | Path) -> Iterator[None]:
+        """Protect paths from eviction while the block runs."""
+        resolved = [Path(path).resolve() for path in paths]
+        with self._lock:
+            self._pins.update(resolved)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._pins.subtract(resolved)
+                self._pins = +self._pins
+
+    def sweep(self) -> int:
+        """
+        Remove expired entries, then the oldest ones until under quota.
+
+        At most `batch_size` entries are removed per call.
+
+        Returns:
+            The number of entries removed.
+        """
+        entries = sorted(self._scan(), key=lambda entry: entry.modified_at)
+        total_bytes = sum(entry.size for entry in entries)
+        expire_before = time.time() - self.max_age_seconds
+        removed = 0
+
+        for entry in entries:
+            if removed >= self.batch_size:
+                break
+            if entry.modified_at >= expire_before and total_bytes <= self.max_bytes:
+                break
+            if self._is_pinned(entry.path):
+                continue
+            if self._remove(entry):
+                total_bytes -= entry.size
+                removed += 1
+
+        with self._lock:
+            self._last_usage = (len(entries) - removed, total_bytes)
+            self.last_sweep_at = time.time()
+        if removed:
+            logger.info(
+                f"{self.name} janitor removed {removed} entries, "
+                f"{total_bytes / 1024 / 1024:.1f} MB in use"
+            )
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        """Usage as of the last sweep and eviction counters."""
+        with self._lock:
+            entries, used_bytes = self._last_usage
+            return {
+                "entries": entries,
+                "bytes": used_bytes,
+                "max_bytes": self.max_bytes,
+                "max_age_seconds": self.max_age_seconds,
+                "pinned": len(self._pins),
+                "evicted_files": self.evicted_files,
+                "evicted_bytes": self.evicted_bytes,
+                "last_sweep_at": self.last_sweep_at,
+            }
+
+    def _run(self) -> None:
+        """Sweep periodically, right away again while a backlog remains."""
+        while not self._stop.is_set():
+            try:
+                removed = self.sweep()
+            except Exception as e:
+                logger.error(f"{self.name} janitor sweep failed: {e}")
+                removed = 0
+            self._stop.wait(0 if removed >= self.batch_size else self.interval_seconds)
+
+    def _scan(self) -> list[_Entry]:
+        """List the top-level entries with their total size."""
+        if not self.directory.is_dir():
+            return []
+
+        entries = []
+        with os.scandir(self.directory) as iterator:
+            for dir_entry in iterator:
+                try:
+                    stat = dir_entry.stat(follow_symlinks=False)
+                    size = (
+                        self._directory_size(Path(dir_entry.path))
+                        if dir_entry.is_dir(follow_symlinks=False)
+                        else stat.st_size
+                    )
+                except OSError:
+                    continue
+                entries.append(_Entry(Path(dir_entry.path), size, stat.st_mtime))
+        return entries
+
+    @staticmethod
+    def _directory_size(directory: Path) -> int:
+        """Total size of the files below a directory."""
+        size = 0
+        for path in directory.rglob("*"):
+            try:
+                if path.is_file():
+                    size += path.stat().st_size
+            except OSError:
+                continue
+        return size
+
+    def _is_pinned(self, path: Path) -> bool:
+        """Check whether a path or anything inside it is pinned."""
+        path = path.resolve()
+        with self._lock:
+            return any(pin == path or path in pin.parents for pin in self._pins)
+
+    def _remove(self, entry: _Entry) -> bool:
+        """Delete an entry, returning whether it was removed."""
+        try:
+            if entry.path.is_dir() and not entry.path.is_symlink():
+                shutil.rmtree(entry.path)
+            else:
+                entry.path.unlink()
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.warning(f"{self.name} janitor cannot remove {entry.path}: {e}")
+            return False
+
+        with self._lock:
+            self.evicted_files += 1
+            self.evicted_bytes += entry.size
+        return True
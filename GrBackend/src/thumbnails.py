@@ -0,0 +1,200 @@
+"""
+Thumbnails Module
+
+This module provides the preset thumbnails of the gallery without network
+requests. A preset shows its preview image if one was rendered for it, and a
+generated placeholder with its caption otherwise. Images are downscaled to
+the thumbnail size once and kept encoded in memory together with an ETag
+derived from their content, so they can be served with conditional requests
+and written to disk under content-hashed names for Gradio.
+"""
+
+import functools
+import hashlib
+import importlib.util
+import io
+import struct
+import threading
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+
+from utils.color_utils import ColorUtils
+from utils.logger import logger
+
+# Pillow comes with Gradio; without it placeholders are plain
+HAS_PILLOW = importlib.util.find_spec("PIL") is not None
+
+PREVIEW_SUFFIXES = (".jpg", ".jpeg", ".png", ".webp")
+MEDIA_TYPES = {"JPEG": "image/jpeg", "PNG": "image/png"}
+JPEG_QUALITY = 85
+PLACEHOLDER_BACKGROUND = "#2d3748"
+PLACEHOLDER_FOREGROUND = "#ffffff"
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    """An encoded thumbnail image."""
+
+    data: bytes
+    media_type: str
+
+    @functools.cached_property
+    def etag(self) -> str:
+        """Content hash identifying this version of the image."""
+        return hashlib.sha256(self.data).hexdigest()[:32]
+
+    @property
+    def file_name(self) -> str:
+        """Content-hashed file name of the image."""
+        suffix = ".jpg" if self.media_type == "image/jpeg" else ".png"
+        return f"{self.etag}{suffix}"
+
+
+def encode_png(width: int, height: int, rgb: bytes) -> bytes:
+    """Encode 8-bit RGB pixels, row by row, as a PNG image."""
+
+    def chunk(chunk_type: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + chunk_type
+            + data
+            + struct.pack(">I", zlib.crc32(chunk_type + data))
+        )
+
+    stride = width * 3
+    scanlines = b"".join(
+        b"\x00" + rgb[row * stride : (row + 1) * stride] for row in range(height)
+    )
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(scanlines, 9))
+        + chunk(b"IEND", b"")
+    )
+
+
+def render_placeholder(
+    caption: str,
+    size: int,
+    background: str = PLACEHOLDER_BACKGROUND,
+    foreground: str = PLACEHOLDER_FOREGROUND,
+) -> Thumbnail:
+    """
+    Draw a square placeholder with one word of the caption per line.
+
+    Without Pillow the placeholder is a plain square; the gallery shows the
+    caption below it anyway.
+    """
+    if not HAS_PILLOW:
+        pixel = bytes.fromhex(ColorUtils.to_hex(background)[1:])
+        return Thumbnail(encode_png(size, size, pixel * size * size), "image/png")
+
+    from PIL import Image, ImageDraw, ImageFont
+
+    image = Image.new("RGB", (size, size), background)
+    draw = ImageDraw.Draw(image)
+    try:
+        font = ImageFont.load_default(size=max(size // 8, 10))
+    except TypeError:  # Pillow < 10.1 only has the bitmap font
+        font = ImageFont.load_default()
+    draw.multiline_text(
+        (size / 2, size / 2),
+        "\n".join(caption.split()),
+        fill=foreground,
+        font=font,
+        anchor="mm",
+        align="center",
+    )
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG", optimize=True)
+    return Thumbnail(buffer.getvalue(), "image/png")
+
+
+def load_preview(image_path: Path, size: int) -> Thumbnail:
+    """
+    Load a preview image, downscaled to fit the thumbnail size.
+
+    Raises:
+        OSError: If the image cannot be read.
+    """
+    data = image_path.read_bytes()
+    if not HAS_PILLOW:
+        media_type = "image/png" if image_path.suffix == ".png" else "image/jpeg"
+        return Thumbnail(data, media_type)
+
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        if max(image.size) <= size and image.format in MEDIA_TYPES:
+            return Thumbnail(data, MEDIA_TYPES[image.format])
+        image.thumbnail((size, size), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        if image.mode in ("RGBA", "LA", "P"):
+            image.save(buffer, format="PNG", optimize=True)
+            return Thumbnail(buffer.getvalue(), "image/png")
+        image.convert("RGB").save(
+            buffer, format="JPEG", quality=JPEG_QUALITY, optimize=True
+        )
+        return Thumbnail(buffer.getvalue(), "image/jpeg")
+
+
+class ThumbnailStore:
+    """
+    In-memory thumbnails of the presets, keyed by preset code.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        preview_directories: list[str | Path],
+        size: int,
+    ) -> None:
+        self.directory = Path(directory)
+        self.preview_directories = [Path(path) for path in preview_directories]
+        self.size = size
+        self._thumbnails: dict[str, Thumbnail] = {}
+        self._by_file_name: dict[str, Thumbnail] = {}
+        self._lock = threading.Lock()
+
+    def get(self, code: str, caption: str) -> Thumbnail:
+        """The thumbnail of a preset, loading or drawing it the first time."""
+        with self._lock:
+            thumbnail = self._thumbnails.get(code)
+        if thumbnail is not None:
+            return thumbnail
+
+        thumbnail = self._load(code, caption)
+        with self._lock:
+            thumbnail = self._thumbnails.setdefault(code, thumbnail)
+            self._by_file_name[thumbnail.file_name] = thumbnail
+        return thumbnail
+
+    def find(self, file_name: str) -> Thumbnail | None:
+        """Look up a thumbnail by its content-hashed file name."""
+        with self._lock:
+            return self._by_file_name.get(file_name)
+
+    def path(self, code: str, caption: str) -> Path:
+        """A file holding the thumbnail of a preset, for Gradio to serve."""
+        thumbnail = self.get(code, caption)
+        file_path = self.directory / thumbnail.file_name
+        if not file_path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            staging = file_path.with_name(f".{file_path.name}.tmp")
+            staging.write_bytes(thumbnail.data)
+            staging.replace(file_path)
+        return file_path
+
+    def _load(self, code: str, caption: str) -> Thumbnail:
+        """Load the preview of a preset, or draw a placeholder without one."""
+        for preview_directory in self.preview_directories:
+            for suffix in PREVIEW_SUFFIXES:
+                preview_path = preview_directory / f"{code}{suffix}"
+                if not preview_path.is_file():
+                    continue
+                try:
+                    return load_preview(preview_path, self.size)
+                except OSError as e:
+                    logger.warning(f"Cannot load preview {preview_path}: {e}")
+        return render_placeholder(caption, self.size)
@@ -0,0 +1,233 @@
+"""
+Video Delivery Module
+
+This module turns the video Blender writes into files fit for the browser.
+Every step of a rendition ladder is encoded with ffmpeg into an H.264 MP4
+with the moov atom at the front, so playback starts before the download
+finishes, at the ladder step's CRF, preset and maximum height. Files are named
+after the hash of the source video and the encoding settings, so a name never
+refers to different content and can be cached by browsers and CDNs forever.
+Encoding runs in the background with a bounded number of ffmpeg processes, so
+a finished render is shown before its renditions exist.
+"""
+
+import functools
+import hashlib
+import re
+import subprocess
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.disk_cache import DiskCache
+from src.file_handler import FileHandler
+from src.single_flight import SingleFlight
+from utils.exceptions import BlenderProcessError
+from utils.logger import logger
+
+# Bump when the encoding changes, so older files are not reused
+DELIVERY_VERSION = 1
+
+RENDITION_NAME_PATTERN = re.compile(r"^[A-Za-z0-9-]+$")
+SOURCE_HASH_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class Rendition:
+    """A step of the encoding ladder."""
+
+    name: str
+    crf: int
+    preset: str
+    max_height: int | None = None
+
+
+@dataclass(frozen=True)
+class DeliveredVideo:
+    """The delivery files of one rendered video, best rendition first."""
+
+    renditions: dict[str, Path]
+
+    @property
+    def primary(self) -> Path:
+        """The highest quality rendition."""
+        return next(iter(self.renditions.values()))
+
+
+def parse_ladder(spec: str) -> list[Rendition]:
+    """
+    Parse a ladder such as "1080p:20:medium:1080,540p:26:veryfast:540".
+
+    Each step is `name:crf:preset[:max_height]`; without a maximum height the
+    rendition keeps the source resolution.
+
+    Raises:
+        ValueError: If a step is malformed.
+    """
+    ladder = []
+    for step in filter(None, (part.strip() for part in spec.split(","))):
+        fields = step.split(":")
+        if len(fields) not in (3, 4) or not RENDITION_NAME_PATTERN.match(fields[0]):
+            raise ValueError(f"Invalid delivery ladder step: {step!r}")
+        ladder.append(
+            Rendition(
+                name=fields[0],
+                crf=int(fields[1]),
+                preset=fields[2],
+                max_height=int(fields[3]) if len(fields) == 4 else None,
+            )
+        )
+    if not ladder:
+        raise ValueError("The delivery ladder is empty")
+    return ladder
+
+
+class VideoDelivery:
+    """
+    Encodes rendered videos into cached, web-optimized MP4 renditions.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int,
+        ladder: list[Rendition],
+        ffmpeg_app: str,
+        max_concurrent_encodes: int = 1,
+    ) -> None:
+        self.ladder = ladder
+        self.ffmpeg_app = ffmpeg_app
+        max_concurrent_encodes = max(1, max_concurrent_encodes)
+        # Bounds the ffmpeg processes of background and direct callers alike
+        self._encode_slots = threading.BoundedSemaphore(max_concurrent_encodes)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_encodes, thread_name_prefix="delivery"
+        )
+        self.disk_cache = DiskCache(directory, max_bytes, name="Delivery")
+        self._single_flight: SingleFlight[Path] = SingleFlight()
+        self._source_hashes: dict[tuple[str, int, int], str] = {}
+        self._source_hashes_lock = threading.Lock()
+
+    @property
+    def directory(self) -> Path:
+        """Directory the delivery files are stored in."""
+        return self.disk_cache.directory
+
+    def prepare(self, video_path: str | Path) -> DeliveredVideo:
+        """
+        Get the delivery files of a video, encoding the missing renditions.
+
+        Raises:
+            BlenderProcessError: If ffmpeg fails.
+        """
+        source_hash = self._source_hash(Path(video_path))
+        renditions = {}
+        for rendition in self.ladder:
+            key = self._key(source_hash, rendition)
+            cached_path = self.disk_cache.get(key)
+            if cached_path is None:
+                cached_path = self._single_flight.do(
+                    key,
+                    functools.partial(self._encode, Path(video_path), key, rendition),
+                )
+            renditions[rendition.name] = cached_path
+        return DeliveredVideo(renditions)
+
+    def submit(self, video_path: str | Path) -> Future[DeliveredVideo]:
+        """Prepare the delivery files of a video in the background."""
+        return self._executor.submit(self.prepare, video_path)
+
+    def shutdown(self) -> None:
+        """Cancel queued background encodes; running ones finish on their own."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _key(source_hash: str, rendition: Rendition) -> str:
+        """Cache key and file name stem of a rendition of a source video."""
+        digest = hashlib.sha256(
+            f"{source_hash}:{rendition}:{DELIVERY_VERSION}".encode()
+        ).hexdigest()
+        return f"{digest[:32]}_{rendition.name}"
+
+    def _source_hash(self, video_path: Path) -> str:
+        """Content hash of a source video, remembered per file version."""
+        file_stat = video_path.stat()
+        key = (str(video_path.resolve()), file_stat.st_size, file_stat.st_mtime_ns)
+        with self._source_hashes_lock:
+            source_hash = self._source_hashes.get(key)
+        if source_hash is None:
+            source_hash = FileHandler.compute_file_hash(video_path)
+            with self._source_hashes_lock:
+                self._source_hashes[key] = source_hash
+                while len(self._source_hashes) > SOURCE_HASH_CACHE_SIZE:
+                    del self._source_hashes[next(iter(self._source_hashes))]
+        return source_hash
+
+    def _encode(self, video_path: Path, key: str, rendition: Rendition) -> Path:
+        """Encode one rendition into the cache."""
+        target = self.disk_cache.path_for(key, ".mp4")
+        staging = target.with_name(f".{target.stem}.tmp.mp4")
+        video_filters = ["format=yuv420p"]
+        if rendition.max_height is not None:
+            # Never upscale; H.264 needs even dimensions
+            video_filters.insert(
+                0, f"scale=-2:'min({rendition.max_height},trunc(ih/2)*2)'"
+            )
+
+        command = [
+            self.ffmpeg_app,
+            "-y",
+            "-loglevel",
+            "error",
+            "-i",
+            str(video_path),
+            "-map",
+            "0:v:0",
+            "-map",
+            "0:a:0?",
+            "-vf",
+            ",".join(video_filters),
+            "-c:v",
+            "libx264",
+            "-preset",
+            rendition.preset,
+            "-crf",
+            str(rendition.crf),
+            "-profile:v",
+            "high",
+            "-c:a",
+            "aac",
+            "-b:a",
+            "128k",
+            "-movflags",
+            "+faststart",
+            str(staging),
+        ]
+        logger.debug(f"Command: {' '.join(command)}")
+
+        try:
+            try:
+                with self._encode_slots:
+                    completed = subprocess.run(
+                        command, capture_output=True, text=True, check=False
+                    )
+            except FileNotFoundError as e:
+                raise BlenderProcessError(
+                    f"ffmpeg executable not found: {self.ffmpeg_app}"
+                ) from e
+            if completed.returncode != 0:
+                raise BlenderProcessError(
+                    f"Delivery encoding failed: {completed.stderr.strip()}",
+                    completed.returncode,
+                )
+            staging.replace(target)
+        finally:
+            staging.unlink(missing_ok=True)
+
+        self.disk_cache.register(key, target)
+        logger.info(
+            f"Encoded {rendition.name} rendition of {video_path}: "
+            f"{video_path.stat().st_size} -> {target.stat().st_size} bytes"
+        )
+        return target
@@ -0,0 +1,180 @@
+"""
+Video Server Module
+
+This module serves delivery videos over HTTP. Byte ranges are supported, so
+players can start from the front of the file and seek without downloading
+the rest, and files are sent with the kernel's sendfile. Delivery file names
+are content-hashed, so responses are marked immutable and carry the name as
+their ETag. Preset thumbnails are served from memory on /thumbnails/.
+"""
+
+import re
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from src.thumbnails import ThumbnailStore
+from utils.logger import logger
+
+VIDEO_PATH_PATTERN = re.compile(r"^/videos/([0-9a-f]{32}_[A-Za-z0-9-]+\.mp4)$")
+THUMBNAIL_PATH_PATTERN = re.compile(r"^/thumbnails/([0-9a-f]{32}\.(?:png|jpg))$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    First and last byte of a single-range Range header.
+
+    Returns:
+        None if the header is not a satisfiable single byte range; no range
+        of an empty file is.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None or match.groups() == ("", "") or size == 0:
+        return None
+    first, last = match.groups()
+    if first == "":
+        length = int(last)
+        if length == 0:
+            return None
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+class _VideoHandler(BaseHTTPRequestHandler):
+    """
+    Serves files of the delivery directory on /videos/<name> and thumbnails
+    on /thumbnails/<name>.
+    """
+
+    directory: Path | None = None
+    thumbnails: ThumbnailStore | None = None
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._serve(send_body=True)
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        self._serve(send_body=False)
+
+    def _serve(self, send_body: bool) -> None:
+        """Answer a GET or HEAD request."""
+        request_path = self.path.split("?")[0]
+        thumbnail_match = THUMBNAIL_PATH_PATTERN.match(request_path)
+        if thumbnail_match is not None:
+            self._serve_thumbnail(thumbnail_match.group(1), send_body)
+            return
+
+        match = VIDEO_PATH_PATTERN.match(request_path)
+        if match is None or self.directory is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+        file_path = self.directory / match.group(1)
+        try:
+            video_file = open(file_path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        with video_file:
+            size = file_path.stat().st_size
+            etag = f'"{file_path.stem}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self._send_cache_headers(etag)
+                self.end_headers()
+                return
+
+            start, end = 0, size - 1
+            status = HTTPStatus.OK
+            range_header = self.headers.get("Range")
+            if_range = self.headers.get("If-Range")
+            if range_header is not None and if_range in (None, etag):
+                byte_range = parse_range(range_header, size)
+                if byte_range is None:
+                    self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                start, end = byte_range
+                status = HTTPStatus.PARTIAL_CONTENT
+
+            self.send_response(status)
+            self.send_header("Content-Type", "video/mp4")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Accept-Ranges", "bytes")
+            if status == HTTPStatus.PARTIAL_CONTENT:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self._send_cache_headers(etag)
+            self.end_headers()
+
+            if send_body and end >= start:
+                try:
+                    self.connection.sendfile(video_file, start, end - start + 1)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The player moved on to another range
+
+    def _serve_thumbnail(self, file_name: str, send_body: bool) -> None:
+        """Answer a request for a thumbnail from memory."""
+        thumbnail = self.thumbnails.find(file_name) if self.thumbnails else None
+        if thumbnail is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        etag = f'"{thumbnail.etag}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self._send_cache_headers(etag)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", thumbnail.media_type)
+        self.send_header("Content-Length", str(len(thumbnail.data)))
+        self._send_cache_headers(etag)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(thumbnail.data)
+
+    def _send_cache_headers(self, etag: str) -> None:
+        """Mark the response as cacheable forever."""
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", CACHE_CONTROL)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """Keep range requests out of the application log."""
+
+
+def start_video_server(
+    host: str,
+    port: int,
+    directory: str | Path | None,
+    thumbnails: ThumbnailStore | None = None,
+) -> ThreadingHTTPServer:
+    """
+    Serve a delivery directory and preset thumbnails from a background thread.
+    """
+    handler = type(
+        "VideoHandler",
+        (_VideoHandler,),
+        {
+            "directory": Path(directory) if directory is not None else None,
+            "thumbnails": thumbnails,
+        },
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="video-server", daemon=True
+    ).start()
+    logger.info(
+        f"🎞️ Videos and thumbnails served at http://{host}:{server.server_port}/"
+    )
+    return server
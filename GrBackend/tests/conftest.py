@@ -0,0 +1,34 @@
+"""
+Shared test fixtures.
+"""
+
+import json
+import struct
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+GlbFactory = Callable[..., Path]
+
+
+@pytest.fixture
+def make_glb(tmp_path: Path) -> GlbFactory:
+    """Write a GLB file with the given JSON chunk and binary chunk."""
+
+    def write(gltf: Any = None, binary: bytes = b"", name: str = "product.glb") -> Path:
+        if gltf is None:
+            gltf = {"asset": {"version": "2.0"}}
+        json_chunk = json.dumps(gltf).encode()
+        json_chunk += b" " * (-len(json_chunk) % 4)
+        chunks = struct.pack("<II", len(json_chunk), 0x4E4F534A) + json_chunk
+        if binary:
+            binary += b"\0" * (-len(binary) % 4)
+            chunks += struct.pack("<II", len(binary), 0x004E4942) + binary
+
+        path = tmp_path / name
+        path.write_bytes(struct.pack("<4sII", b"glTF", 2, 12 + len(chunks)) + chunks)
+        return path
+
+    return write
@@ -0,0 +1,85 @@
+"""
+Tests of the blend manifest store and composition checks.
+"""
+
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from src.blend_manifest import BlendManifest, BlendManifestStore
+
+MANIFEST = {
+    "actions": {"ORBIT": [1, 120]},
+    "collections": ["SNOW"],
+    "materials": ["GRADIENT"],
+    "scene": {"frame_start": 1, "frame_end": 120, "fps": 30},
+    "maps": {
+        "MOVEMENT_ACTION_MAP": {"ORBIT": {"camera": "ORBIT"}},
+        "VFX_COLLECTION_MAP": {"VFX_SNOW": "SNOW", "None": ""},
+    },
+}
+
+
+class SlowExtractor:
+    """Writes the manifest once released, like a Blender run would."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, blend_path: Path, output_path: Path) -> None:
+        self.calls += 1
+        self.release.wait(5)
+        output_path.write_text(json.dumps(MANIFEST))
+
+
+def wait_for_manifest(
+    store: BlendManifestStore, blend_file: Path
+) -> BlendManifest | None:
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        manifest = store.get_if_ready(blend_file)
+        if manifest is not None:
+            return manifest
+        time.sleep(0.01)
+    return None
+
+
+def test_manifest_is_extracted_in_the_background(tmp_path: Path) -> None:
+    blend_file = tmp_path / "base.blend"
+    blend_file.write_bytes(b"BLENDER")
+    extractor = SlowExtractor()
+    store = BlendManifestStore(tmp_path / "manifests", extractor)
+
+    store.prefetch(blend_file)
+    assert store.get_if_ready(blend_file) is None
+    extractor.release.set()
+
+    assert wait_for_manifest(store, blend_file) is not None
+    assert extractor.calls == 1
+
+
+def test_unreadable_file_is_a_failed_extraction(tmp_path: Path) -> None:
+    # A directory passes stat() but cannot be hashed
+    store = BlendManifestStore(tmp_path / "manifests", SlowExtractor())
+
+    with pytest.raises(ValueError, match="Cannot hash"):
+        store.get(tmp_path)
+    with pytest.raises(ValueError, match="Cannot hash"):
+        store.get_if_ready(tmp_path)
+
+
+def test_compositions_without_names_are_reported() -> None:
+    manifest = BlendManifest.from_json(MANIFEST)
+
+    assert (
+        manifest.validate({"MOVEMENT": {"NAME": "ORBIT"}, "VFX_SHOT": {"NAME": "None"}})
+        == []
+    )
+    assert manifest.validate({}) == [
+        "Movement '' is not in the add-on's maps",
+        "VFX shot '' is not in the add-on's maps",
+    ]
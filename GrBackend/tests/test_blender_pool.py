@@ -0,0 +1,65 @@
+"""
+Tests of the warm worker pool against the benchmarks' fake Blender.
+"""
+
+import sys
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from src.blender_pool import BlenderWorkerPool
+from src.render_watchdog import RenderWatchdog
+from src.resource_profile import ResourceProfile
+
+FAKE_BLENDER = Path(__file__).parents[1] / "benchmarks" / "fake_blender.py"
+
+
+def worker_command(resource_profile: ResourceProfile | None) -> list[str]:
+    return [sys.executable, str(FAKE_BLENDER), "--", "--function=serve"]
+
+
+@pytest.fixture
+def worker_pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[BlenderWorkerPool]:
+    # A render takes about 1 s and prints a line every 50 ms
+    monkeypatch.setenv("FAKE_BLENDER_STARTUP_SECONDS", "0")
+    monkeypatch.setenv("FAKE_BLENDER_FRAMES", "20")
+    monkeypatch.setenv("FAKE_BLENDER_FRAME_SECONDS", "0.05")
+    worker_pool = BlenderWorkerPool(
+        size=1,
+        command_factory=worker_command,
+        max_jobs_per_worker=10,
+        max_rss_bytes=1024**3,
+        start_timeout=10,
+        ping_timeout=5,
+    )
+    worker_pool.start()
+    yield worker_pool
+    worker_pool.shutdown()
+
+
+def test_waiting_for_a_worker_does_not_count_as_a_stall(
+    worker_pool: BlenderWorkerPool, tmp_path: Path
+) -> None:
+    glb_file = tmp_path / "product.glb"
+    glb_file.write_bytes(b"glTF")
+    json_file = tmp_path / "composition.json"
+    json_file.write_text("{}")
+
+    def render(index: int) -> int:
+        job = {
+            "glb_file_path": str(glb_file),
+            "json_file_path": str(json_file),
+            "out_file_path": str(tmp_path / f"{index}.mov"),
+        }
+        lines = worker_pool.render(job, lambda: RenderWatchdog(30, 0.5))
+        return sum(1 for line in lines if line.startswith("Fra:"))
+
+    worker_pid = worker_pool._workers[0].pid
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        frames = list(executor.map(render, range(2)))
+
+    assert frames == [20, 20]
+    # The queued job neither timed out nor got the worker restarted
+    assert worker_pool._workers[0].pid == worker_pid
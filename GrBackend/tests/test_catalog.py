@@ -0,0 +1,85 @@
+"""
+Tests of catalog manifest validation.
+"""
+
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from src.blender_renderer import BlenderRenderer
+from src.catalog import validate_manifest
+from src.composition import CompositionBuilder
+from tests.conftest import GlbFactory
+from utils.exceptions import CompositionError, ManifestError
+
+
+def manifest_row(glb_file_path: Path, **fields: Any) -> dict[str, Any]:
+    return {
+        "glb_file_path": str(glb_file_path),
+        "movement": "Product 360",
+        "vfx": "Snow",
+        "color": "#ffffff",
+        **fields,
+    }
+
+
+class RejectingRenderer:
+    """Stands in for a renderer whose .blend file lacks every preset."""
+
+    def validate_composition(
+        self,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+        wait_for_manifest: bool = False,
+    ) -> None:
+        raise CompositionError("Movement is not in the add-on's maps")
+
+
+def test_valid_rows_become_items(make_glb: GlbFactory) -> None:
+    glb_file = make_glb()
+
+    items = validate_manifest(
+        [manifest_row(glb_file, id=None), manifest_row(glb_file, id=7)],
+        CompositionBuilder(),
+        "PREVIEW",
+    )
+
+    assert [item.item_id for item in items] == ["product_1", "7"]
+    assert items[0].composition["QUALITY"]["TIER"] == "PREVIEW"
+
+
+def test_every_invalid_row_is_listed(make_glb: GlbFactory) -> None:
+    glb_file = make_glb()
+
+    with pytest.raises(ManifestError) as error:
+        validate_manifest(
+            [
+                ["not", "an", "object"],
+                "text",
+                manifest_row(glb_file, movement=None),
+                manifest_row(glb_file, vfx="Fireworks"),
+                manifest_row(glb_file.with_name("missing.glb")),
+            ],
+            CompositionBuilder(),
+        )
+
+    errors = error.value.errors
+    assert errors[0] == "Row 1: expected an object, got list"
+    assert errors[1] == "Row 2: expected an object, got str"
+    assert errors[2] == "Row 3: missing movement"
+    assert errors[3] == "Row 4: Unknown VFX preset: 'Fireworks'"
+    assert errors[4].startswith("Row 5: GLB file not found")
+
+
+def test_compositions_are_checked_against_the_blend_file(
+    make_glb: GlbFactory,
+) -> None:
+    with pytest.raises(ManifestError) as error:
+        validate_manifest(
+            [manifest_row(make_glb())],
+            CompositionBuilder(),
+            blender_renderer=cast(BlenderRenderer, RejectingRenderer()),
+        )
+
+    assert error.value.errors == ["Row 1: Movement is not in the add-on's maps"]
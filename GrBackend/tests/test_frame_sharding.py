@@ -0,0 +1,132 @@
+"""
+Tests of how frame ranges are split into shards.
+"""
+
+import threading
+import time
+from collections.abc import Generator
+
+import pytest
+
+from src.frame_sharding import FrameShard, FrameShardScheduler
+from utils.exceptions import BlenderProcessError
+
+
+def render_frames(first_frame: int, last_frame: int) -> Generator[str, None, None]:
+    for frame in range(first_frame, last_frame + 1):
+        yield f"Fra:{frame} Mem:10.00M | Rendering"
+
+
+def take_shards(scheduler: FrameShardScheduler) -> list[FrameShard]:
+    shards = []
+    while (shard := scheduler._next_shard()) is not None:
+        shards.append(shard)
+    return shards
+
+
+def test_chunks_shrink_and_cover_every_frame_once() -> None:
+    frames = list(range(1, 101))
+    scheduler = FrameShardScheduler(frames, 2, 5, render_frames)
+
+    # Nothing runs, so once every frame is handed out the shards get split;
+    # mark them finished as they are handed out to see the plain chunks
+    shards = []
+    while (shard := scheduler._next_shard()) is not None:
+        shard.finished = True
+        shards.append(shard)
+
+    sizes = [shard.last_index - shard.first_index + 1 for shard in shards]
+    assert sizes[0] == 25
+    assert sizes == sorted(sizes, reverse=True)
+    assert min(sizes[:-1]) >= 5
+    assert [shard.first_index for shard in shards] == [
+        0,
+        *(shard.last_index + 1 for shard in shards[:-1]),
+    ]
+    assert shards[-1].last_index == len(frames) - 1
+
+
+def test_idle_workers_take_the_upper_half_of_the_slowest_shard() -> None:
+    frames = list(range(1, 11))
+    scheduler = FrameShardScheduler(frames, 2, 10, render_frames)
+    straggler = scheduler._next_shard()
+    assert straggler is not None
+    scheduler._record_frame(straggler, 3)
+
+    helper = scheduler._next_shard()
+
+    assert helper is not None
+    # Frames 4-10 are left, the helper takes 8-10 and the straggler keeps 4-7
+    assert (helper.first_index, helper.last_index) == (7, 9)
+    assert straggler.last_index == 6
+    assert straggler.remaining_frames() == 4
+
+
+def test_shards_are_split_until_single_frames_remain() -> None:
+    frames = list(range(1, 11))
+    scheduler = FrameShardScheduler(frames, 2, 10, render_frames)
+
+    shards = take_shards(scheduler)
+
+    owned = sorted(
+        index
+        for shard in shards
+        for index in range(shard.first_index, shard.last_index + 1)
+    )
+    assert owned == list(range(len(frames)))
+    assert len(shards) == len(frames)
+    assert all(shard.remaining_frames() == 1 for shard in shards)
+
+
+def test_finished_shards_are_not_split() -> None:
+    scheduler = FrameShardScheduler(list(range(1, 11)), 2, 10, render_frames)
+    shard = scheduler._next_shard()
+    assert shard is not None
+    shard.finished = True
+
+    assert scheduler._next_shard() is None
+
+
+def test_run_renders_every_frame() -> None:
+    frames = list(range(1, 61, 2))
+    rendered: list[int] = []
+    lock = threading.Lock()
+
+    def run_shard(first_frame: int, last_frame: int) -> Generator[str, None, None]:
+        for frame in frames:
+            if first_frame <= frame <= last_frame:
+                with lock:
+                    rendered.append(frame)
+                yield f"Fra:{frame}"
+
+    progress: list[tuple[int, int]] = []
+    FrameShardScheduler(
+        frames, 3, 2, run_shard, on_frame=lambda *args: progress.append(args)
+    ).run()
+
+    assert set(rendered) == set(frames)
+    assert max(progress) == (len(frames), len(frames))
+
+
+def test_failed_shard_stops_the_other_shards() -> None:
+    stopped: list[int] = []
+
+    def run_shard(first_frame: int, last_frame: int) -> Generator[str, None, None]:
+        if first_frame == 1:
+            time.sleep(0.05)
+            raise BlenderProcessError("Blender crashed")
+        deadline = time.monotonic() + 5
+        try:
+            while time.monotonic() < deadline:
+                yield f"Fra:{first_frame}"
+                time.sleep(0.01)
+        finally:
+            stopped.append(first_frame)
+
+    scheduler = FrameShardScheduler(list(range(1, 11)), 2, 5, run_shard)
+    started_at = time.monotonic()
+    with pytest.raises(BlenderProcessError, match="Blender crashed"):
+        scheduler.run()
+
+    assert stopped == [6]
+    assert time.monotonic() - started_at < 2
@@ -0,0 +1,93 @@
+"""
+Tests of GLB validation and content counts.
+"""
+
+import struct
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.glb_inspector import inspect_glb
+from tests.conftest import GlbFactory
+from utils.exceptions import GlbFileError
+
+TRIANGLE_GLTF = {
+    "asset": {"version": "2.0"},
+    "buffers": [{"byteLength": 48}],
+    "bufferViews": [
+        {"buffer": 0, "byteLength": 36},
+        {"buffer": 0, "byteOffset": 36, "byteLength": 12},
+    ],
+    "accessors": [
+        {"bufferView": 0, "count": 3, "componentType": 5126, "type": "VEC3"},
+        {"bufferView": 1, "count": 6, "componentType": 5123, "type": "SCALAR"},
+    ],
+    "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1}]}],
+    "nodes": [{"mesh": 0}, {"mesh": 0}],
+}
+
+
+def with_gltf(**changes: Any) -> dict[str, Any]:
+    return {**TRIANGLE_GLTF, **changes}
+
+
+def test_counts_the_contents(make_glb: GlbFactory) -> None:
+    stats = inspect_glb(make_glb(TRIANGLE_GLTF, b"\0" * 48))
+
+    assert stats.mesh_count == 1
+    assert stats.vertex_count == 3
+    assert stats.index_count == 6
+    # Both nodes draw the mesh's two triangles
+    assert stats.triangle_count == 4
+    assert stats.buffer_bytes == 48
+
+
+@pytest.mark.parametrize(
+    ("gltf", "message"),
+    [
+        ({"asset": {"version": "1.0"}}, "not glTF 2.0"),
+        (["not", "an", "object"], "not an object"),
+        (with_gltf(buffers=[{"byteLength": 4096}]), "larger than the binary chunk"),
+        (with_gltf(nodes=[{"mesh": 3}]), "missing mesh"),
+        (
+            with_gltf(bufferViews=[{"buffer": 1, "byteLength": 4}]),
+            "missing buffer",
+        ),
+        (
+            with_gltf(accessors=[{"bufferView": 0, "count": "abc"}] * 2),
+            "Malformed GLB file",
+        ),
+        (with_gltf(meshes=[{"primitives": [{"attributes": 5}]}]), "Malformed"),
+        (with_gltf(images=[{"bufferView": 7}]), "missing buffer view"),
+    ],
+)
+def test_rejects_malformed_json(make_glb: GlbFactory, gltf: Any, message: str) -> None:
+    with pytest.raises(GlbFileError, match=message):
+        inspect_glb(make_glb(gltf, b"\0" * 48))
+
+
+def test_rejects_malformed_containers(make_glb: GlbFactory, tmp_path: Path) -> None:
+    valid = make_glb(TRIANGLE_GLTF, b"\0" * 48).read_bytes()
+    header, rest = valid[:12], valid[12:]
+    json_length = struct.unpack_from("<I", rest)[0]
+
+    cases = {
+        "too short": b"glTF",
+        "Not a GLB": b"GLTF" + valid[4:],
+        "version 1": header[:4] + struct.pack("<I", 1) + header[8:] + rest,
+        "declares": valid + b"\0\0\0\0",
+        "not JSON": header + rest[:4] + struct.pack("<I", 0x004E4942) + rest[8:],
+        "runs past": header + struct.pack("<I", json_length + 1000) + rest[4:],
+        "Invalid GLB JSON": header + rest[:8] + b"}" + rest[9:],
+    }
+    for message, data in cases.items():
+        path = tmp_path / "broken.glb"
+        path.write_bytes(data)
+        with pytest.raises(GlbFileError, match=message):
+            inspect_glb(path)
+
+
+def test_missing_file_is_a_glb_error(tmp_path: Path) -> None:
+    with pytest.raises(GlbFileError, match="Cannot read"):
+        inspect_glb(tmp_path / "missing.glb")
@@ -0,0 +1,81 @@
+"""
+Tests of texture downscaling and the fallbacks of the GLB optimizer.
+"""
+
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from src.file_handler import FileHandler
+from src.glb_inspector import inspect_glb
+from src.glb_optimizer import GlbOptimizer
+from tests.conftest import GlbFactory
+from utils.exceptions import FileHandlerError
+
+
+@pytest.fixture
+def optimizer(tmp_path: Path) -> GlbOptimizer:
+    return GlbOptimizer(
+        tmp_path / "cache",
+        max_cache_bytes=10 * 1024 * 1024,
+        frame_size=256,
+        screen_coverage=1.0,
+        texel_density=1.0,
+        min_texture_size=64,
+    )
+
+
+@pytest.fixture
+def textured_glb(make_glb: GlbFactory) -> Path:
+    """A GLB file with a 512x512 PNG texture."""
+    png = io.BytesIO()
+    Image.new("RGB", (512, 512), "red").save(png, "PNG")
+    texture = png.getvalue()
+    return make_glb(
+        {
+            "asset": {"version": "2.0"},
+            "buffers": [{"byteLength": len(texture)}],
+            "bufferViews": [{"buffer": 0, "byteLength": len(texture)}],
+            "images": [{"bufferView": 0, "mimeType": "image/png"}],
+        },
+        texture,
+    )
+
+
+def test_large_textures_are_downscaled(
+    optimizer: GlbOptimizer, textured_glb: Path
+) -> None:
+    optimized = optimizer.optimize(str(textured_glb), {})
+
+    assert optimized != str(textured_glb)
+    assert inspect_glb(optimized).max_texture_size == 256
+    assert inspect_glb(textured_glb).max_texture_size == 512
+
+
+def test_textures_within_budget_are_kept(
+    optimizer: GlbOptimizer, textured_glb: Path
+) -> None:
+    optimizer.frame_size = 512
+
+    assert optimizer.optimize(str(textured_glb), {}) == str(textured_glb)
+
+
+def test_decompression_bombs_leave_the_file_as_is(
+    optimizer: GlbOptimizer, textured_glb: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+
+    assert optimizer.optimize(str(textured_glb), {}) == str(textured_glb)
+
+
+def test_unreadable_files_are_used_as_is(
+    optimizer: GlbOptimizer, textured_glb: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def fail(file_path: str | Path) -> str:
+        raise FileHandlerError("Cannot hash file", str(file_path))
+
+    monkeypatch.setattr(FileHandler, "compute_file_hash", fail)
+
+    assert optimizer.optimize(str(textured_glb), {}) == str(textured_glb)
@@ -0,0 +1,133 @@
+"""
+Tests of the render job manager's scheduling and ETA estimates.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import pytest
+
+from src.job_manager import RenderJob, RenderJobManager
+from src.render_progress import ProgressCallback
+
+
+class BlockingRenderer:
+    """Render function that records the order of renders and blocks the first."""
+
+    def __init__(self) -> None:
+        self.order: list[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None,
+        progress_callback: ProgressCallback | None,
+    ) -> str:
+        self.order.append(json_data["name"])
+        if json_data["name"] == "blocker":
+            self.started.set()
+            self.release.wait(10)
+        return f"{json_data['name']}.mov"
+
+
+def estimated_cost(job: RenderJob) -> float:
+    return float(job.json_data["cost"])
+
+
+@pytest.fixture
+def renderer() -> Iterator[BlockingRenderer]:
+    renderer = BlockingRenderer()
+    yield renderer
+    renderer.release.set()
+
+
+def start_manager(renderer: BlockingRenderer, aging: float) -> RenderJobManager:
+    """A single-worker manager whose worker is busy with a blocking job."""
+    manager = RenderJobManager(
+        renderer,
+        max_concurrent_jobs=1,
+        max_finished_jobs=10,
+        cost_function=estimated_cost,
+        aging=aging,
+    )
+    manager.submit("product.glb", {"name": "blocker", "cost": 10})
+    assert renderer.started.wait(5)
+    return manager
+
+
+def submit_spaced(manager: RenderJobManager, *jobs: tuple[str, float]) -> list[str]:
+    """Submit jobs a little apart, so their submission times differ."""
+    job_ids = []
+    for name, cost in jobs:
+        job_ids.append(manager.submit("product.glb", {"name": name, "cost": cost}))
+        time.sleep(0.02)
+    return job_ids
+
+
+def test_cheaper_jobs_run_first(renderer: BlockingRenderer) -> None:
+    manager = start_manager(renderer, aging=1.0)
+    job_ids = submit_spaced(manager, ("slow", 100), ("medium", 50), ("fast", 5))
+
+    renderer.release.set()
+    for job_id in job_ids:
+        manager.result(job_id, timeout=5)
+    manager.shutdown()
+
+    assert renderer.order == ["blocker", "fast", "medium", "slow"]
+
+
+def test_aging_lets_waiting_jobs_overtake(renderer: BlockingRenderer) -> None:
+    # 20 ms of waiting is worth 1000 s of render time
+    manager = start_manager(renderer, aging=50_000.0)
+    job_ids = submit_spaced(manager, ("slow", 100), ("fast", 5))
+
+    renderer.release.set()
+    for job_id in job_ids:
+        manager.result(job_id, timeout=5)
+    manager.shutdown()
+
+    assert renderer.order == ["blocker", "slow", "fast"]
+
+
+def test_duplicate_submissions_join_the_pending_job(
+    renderer: BlockingRenderer,
+) -> None:
+    manager = start_manager(renderer, aging=1.0)
+    first = manager.submit("product.glb", {"name": "a", "cost": 1}, dedupe_key="k")
+    second = manager.submit("product.glb", {"name": "a", "cost": 1}, dedupe_key="k")
+
+    renderer.release.set()
+    assert manager.result(first, timeout=5) == "a.mov"
+    manager.shutdown()
+
+    assert first == second
+    assert renderer.order == ["blocker", "a"]
+
+
+def test_eta_plays_out_the_queue_ahead(renderer: BlockingRenderer) -> None:
+    manager = start_manager(renderer, aging=1.0)
+    first, second = submit_spaced(manager, ("first", 5), ("second", 7))
+
+    # The blocker has about 10 s left, then the jobs run one after the other
+    assert manager.estimate_eta(first) == pytest.approx(15, abs=0.5)
+    assert manager.estimate_eta(second) == pytest.approx(22, abs=0.5)
+
+    renderer.release.set()
+    manager.result(second, timeout=5)
+    manager.shutdown()
+    assert manager.estimate_eta(second) is None
+
+
+def test_eta_is_unknown_without_a_cost(renderer: BlockingRenderer) -> None:
+    manager = RenderJobManager(renderer, max_concurrent_jobs=1, max_finished_jobs=10)
+    job_id = manager.submit("product.glb", {"name": "blocker"})
+    assert renderer.started.wait(5)
+
+    assert manager.estimate_eta(job_id) is None
+    renderer.release.set()
+    manager.shutdown()
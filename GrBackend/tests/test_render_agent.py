@@ -0,0 +1,102 @@
+"""
+Tests of the render agent's job handling against a real queue.
+"""
+
+import time
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+from src.blender_renderer import BlenderRenderer
+from src.render_agent import RenderWorkerAgent
+from src.render_queue import SqliteRenderQueue
+from utils.exceptions import BlenderProcessError
+
+
+class FakeRenderer:
+    """Writes a video file after a delay, or fails."""
+
+    def __init__(self, directory: Path, delay: float = 0.0, fail: bool = False):
+        self.directory = directory
+        self.delay = delay
+        self.fail = fail
+
+    def render_video_from_glb(
+        self,
+        glb_file_path: str,
+        json_data: dict[str, Any],
+        blend_file_path: str | None = None,
+    ) -> str:
+        time.sleep(self.delay)
+        if self.fail:
+            raise BlenderProcessError("Blender crashed")
+        video_path = self.directory / "render.mov"
+        video_path.write_bytes(b"video")
+        return str(video_path)
+
+
+def make_agent(
+    tmp_path: Path,
+    render_queue: SqliteRenderQueue,
+    renderer: FakeRenderer,
+    **kwargs: Any,
+) -> RenderWorkerAgent:
+    return RenderWorkerAgent(
+        render_queue,
+        cast(BlenderRenderer, renderer),
+        tmp_path / "storage",
+        worker_id="agent",
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def render_queue(tmp_path: Path) -> SqliteRenderQueue:
+    return SqliteRenderQueue(tmp_path / "queue.db", max_attempts=2)
+
+
+def test_agent_stores_the_video_and_completes_the_job(
+    tmp_path: Path, render_queue: SqliteRenderQueue
+) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+    agent = make_agent(tmp_path, render_queue, FakeRenderer(tmp_path))
+
+    assert agent.run(max_jobs=1) == 1
+
+    job = render_queue.get(job_id)
+    assert job.status == "SUCCESS"
+    assert job.output_path == str(tmp_path / "storage" / f"{job_id}.mov")
+    assert Path(job.output_path).read_bytes() == b"video"
+
+
+def test_agent_reports_failed_renders(
+    tmp_path: Path, render_queue: SqliteRenderQueue
+) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+    agent = make_agent(tmp_path, render_queue, FakeRenderer(tmp_path, fail=True))
+
+    assert agent.run_once()
+
+    job = render_queue.get(job_id)
+    assert job.status == "FAILED"
+    assert job.error == "Blender crashed"
+
+
+def test_heartbeat_keeps_long_renders_leased(
+    tmp_path: Path, render_queue: SqliteRenderQueue
+) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+    agent = make_agent(
+        tmp_path,
+        render_queue,
+        FakeRenderer(tmp_path, delay=0.5),
+        lease_seconds=0.2,
+        heartbeat_seconds=0.05,
+    )
+
+    assert agent.run_once()
+
+    job = render_queue.get(job_id)
+    assert job.status == "SUCCESS"
+    assert job.attempts == 1
@@ -0,0 +1,127 @@
+"""
+Tests of the render queue's leases, requeueing and attempt limit.
+"""
+
+import time
+from pathlib import Path
+
+import pytest
+
+from src.render_queue import SqliteRenderQueue
+from utils.exceptions import RenderJobError
+
+
+@pytest.fixture
+def render_queue(tmp_path: Path) -> SqliteRenderQueue:
+    return SqliteRenderQueue(tmp_path / "queue.db", max_attempts=2)
+
+
+def test_jobs_are_claimed_by_priority_then_age(
+    render_queue: SqliteRenderQueue,
+) -> None:
+    older = render_queue.enqueue("a.glb", {}, priority=1.0)
+    urgent = render_queue.enqueue("b.glb", {}, priority=0.0)
+    newer = render_queue.enqueue("c.glb", {}, priority=1.0)
+
+    claimed = [render_queue.claim("worker", 60) for _ in range(4)]
+
+    assert [job.job_id if job else None for job in claimed] == [
+        urgent,
+        older,
+        newer,
+        None,
+    ]
+
+
+def test_expired_lease_is_requeued_for_another_worker(
+    render_queue: SqliteRenderQueue,
+) -> None:
+    job_id = render_queue.enqueue("a.glb", {"MOVEMENT": {"NAME": "spin"}})
+    assert render_queue.claim("dead", 0.05) is not None
+    assert render_queue.claim("live", 60) is None
+
+    time.sleep(0.1)
+    job = render_queue.claim("live", 60)
+
+    assert job is not None
+    assert job.job_id == job_id
+    assert job.attempts == 2
+    assert job.json_data == {"MOVEMENT": {"NAME": "spin"}}
+    # The dead worker lost the job and cannot report on it any more
+    assert not render_queue.heartbeat(job_id, "dead", 60)
+    assert not render_queue.complete(job_id, "dead", "dead.mov")
+    assert render_queue.complete(job_id, "live", "live.mov")
+    assert render_queue.get(job_id).output_path == "live.mov"
+
+
+def test_heartbeat_keeps_the_lease(render_queue: SqliteRenderQueue) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+    render_queue.claim("worker", 0.1)
+
+    for _ in range(3):
+        time.sleep(0.05)
+        assert render_queue.heartbeat(job_id, "worker", 0.1)
+
+    assert render_queue.requeue_expired() == 0
+    assert render_queue.get(job_id).status == "RUNNING"
+
+
+def test_job_fails_after_max_attempts(render_queue: SqliteRenderQueue) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+    for worker_id in ("first", "second"):
+        assert render_queue.claim(worker_id, 0.01) is not None
+        time.sleep(0.05)
+
+    assert render_queue.requeue_expired() == 1
+    job = render_queue.get(job_id)
+    assert job.status == "FAILED"
+    assert job.error == "Lease expired after 2 attempts"
+    assert render_queue.claim("third", 60) is None
+
+
+def test_release_does_not_count_the_attempt(render_queue: SqliteRenderQueue) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+    render_queue.claim("worker", 60)
+
+    assert render_queue.release(job_id, "worker")
+
+    job = render_queue.get(job_id)
+    assert job.status == "QUEUED"
+    assert job.attempts == 0
+
+
+def test_wait_times_out_on_unfinished_jobs(render_queue: SqliteRenderQueue) -> None:
+    job_id = render_queue.enqueue("a.glb", {})
+
+    with pytest.raises(RenderJobError):
+        render_queue.wait(job_id, timeout=0.05, poll_seconds=0.01)
+
+
+def test_finished_jobs_past_the_retention_count_are_deleted(
+    tmp_path: Path,
+) -> None:
+    render_queue = SqliteRenderQueue(tmp_path / "queue.db", max_finished_jobs=2)
+    job_ids = [render_queue.enqueue(f"{index}.glb", {}) for index in range(4)]
+    for job_id in job_ids[:3]:
+        render_queue.claim("worker", 60)
+        render_queue.complete(job_id, "worker", f"{job_id}.mov")
+        time.sleep(0.01)
+
+    assert render_queue.counts() == {"SUCCESS": 2, "QUEUED": 1}
+    with pytest.raises(RenderJobError):
+        render_queue.get(job_ids[0])
+
+
+def test_finished_jobs_past_the_retention_age_are_deleted(tmp_path: Path) -> None:
+    database_path = tmp_path / "queue.db"
+    render_queue = SqliteRenderQueue(database_path)
+    finished = render_queue.enqueue("a.glb", {})
+    render_queue.claim("worker", 60)
+    render_queue.fail(finished, "worker", "Blender crashed")
+    queued = render_queue.enqueue("b.glb", {})
+    time.sleep(0.05)
+
+    render_queue = SqliteRenderQueue(database_path, max_age_seconds=0.01)
+
+    assert render_queue.counts() == {"QUEUED": 1}
+    assert render_queue.get(queued).status == "QUEUED"
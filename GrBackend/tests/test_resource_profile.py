@@ -0,0 +1,37 @@
+"""
+Tests of how resource slots are handed out.
+"""
+
+import pytest
+
+from src.resource_profile import ResourceGovernor
+
+
+def test_reserved_slots_are_not_acquired() -> None:
+    governor = ResourceGovernor(slots=3)
+
+    reserved = governor.reserve(2)
+    with governor.acquire() as profile:
+        acquired = profile.slot
+
+    assert sorted(profile.slot for profile in reserved) == [0, 1]
+    assert acquired == 2
+
+
+def test_one_slot_stays_free_for_short_runs() -> None:
+    governor = ResourceGovernor(slots=2)
+
+    with pytest.raises(ValueError):
+        governor.reserve(2)
+
+
+def test_pinned_slots_get_disjoint_cpus(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(8)))
+    governor = ResourceGovernor(slots=4, pin_cpus=True)
+
+    profiles = governor.reserve(3)
+    with governor.acquire() as profile:
+        profiles.append(profile)
+
+    assert [profile.cpus for profile in profiles] == [(0, 1), (2, 3), (4, 5), (6, 7)]
+    assert all(profile.blender_args() == ["--threads", "2"] for profile in profiles)
@@ -0,0 +1,53 @@
+"""
+Tests of Range header parsing of the video server.
+"""
+
+import pytest
+
+from src.video_server import parse_range
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=0-99", (0, 99)),
+        ("bytes=100-", (100, 999)),
+        ("bytes=900-5000", (900, 999)),
+        (" bytes=0-0 ", (0, 0)),
+    ],
+)
+def test_explicit_ranges(header: str, expected: tuple[int, int]) -> None:
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("bytes=-100", (900, 999)),
+        ("bytes=-1", (999, 999)),
+        # A suffix longer than the file selects all of it
+        ("bytes=-5000", (0, 999)),
+    ],
+)
+def test_suffix_ranges(header: str, expected: tuple[int, int]) -> None:
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    ["bytes=1000-", "bytes=1000-1999", "bytes=5000-", "bytes=500-100", "bytes=-0"],
+)
+def test_unsatisfiable_ranges(header: str) -> None:
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize(
+    "header", ["bytes=-", "bytes=0-99,200-299", "items=0-99", "bytes=a-b", ""]
+)
+def test_malformed_ranges(header: str) -> None:
+    assert parse_range(header, 1000) is None
+
+
+@pytest.mark.parametrize("header", ["bytes=0-", "bytes=0-0", "bytes=-100"])
+def test_no_range_of_an_empty_file(header: str) -> None:
+    assert parse_range(header, 0) is None
@@ -12,3 +12,48 @@ class FileHandlerError(Exception):
     def __init__(self, message: str, file_path: str | None = None) -> None:
         super().__init__(message)
         self.file_path = file_path
+
+
+class RenderJobError(Exception):
+    """Custom exception for render job lookups and results."""
+
+    def __init__(self, message: str, job_id: str | None = None) -> None:
+        super().__init__(message)
+        self.job_id = job_id
+
+
+class BlenderProcessTimeoutError(BlenderProcessError):
+    """Raised when the watchdog kills a Blender process that ran too long or stalled."""
+
+    def __init__(
+        self,
+        message: str,
+        phase: str | None = None,
+        return_code: int | None = None,
+    ) -> None:
+        super().__init__(message, return_code)
+        self.phase = phase
+
+
+class ManifestError(Exception):
+    """Custom exception for invalid catalog manifests."""
+
+    def __init__(self, message: str, errors: list[str] | None = None) -> None:
+        super().__init__(message)
+        self.errors = errors or []
+
+
+class GlbFileError(Exception):
+    """Custom exception for malformed GLB files."""
+
+    def __init__(self, message: str, file_path: str | None = None) -> None:
+        super().__init__(message)
+        self.file_path = file_path
+
+
+class CompositionError(Exception):
+    """Custom exception for compositions the base .blend file cannot render."""
+
+    def __init__(self, message: str, errors: list[str] | None = None) -> None:
+        super().__init__(message)
+        self.errors = errors or []
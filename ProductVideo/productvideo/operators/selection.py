@@ -5,6 +5,7 @@ import bpy
 from bpy.props import (
     BoolProperty,
     EnumProperty,
+    IntProperty,
     StringProperty,
 )
 from bpy.types import (
@@ -57,6 +58,12 @@ def shifBonestAnimationData(obj, selected_pose_bones, shift):
 
 # Use shared MOVEMENT_ACTION_MAP from properties/maps.json
 from productvideo.utils.FileHandler import readJsonData
+from productvideo.utils.import_cache import (
+    evict_import_cache,
+    import_cache_path,
+    load_cached_import,
+    write_cached_import,
+)
 
 MAPS_JSON_PATH = os.path.join(
     os.path.dirname(os.path.dirname(__file__)), "properties", "maps.json"
@@ -339,6 +346,17 @@ class ImportProductObject(Operator, ImportHelper):
         default="OPT_A",
     )
 
+    # Cache of normalized imports keyed by GLB content; empty disables it
+    cache_directory: StringProperty(
+        default="",
+        options={"HIDDEN"},
+    )
+
+    cache_max_mb: IntProperty(
+        default=0,
+        options={"HIDDEN"},
+    )
+
     def set_origin_to_geometry(self, obj):
         # Calculate the bounding box center
         bbox_center = (
@@ -361,6 +379,19 @@ class ImportProductObject(Operator, ImportHelper):
         obj.matrix_world = new_origin_matrix
 
     def execute(self, context):
+        cache_path = None
+        if self.cache_directory:
+            cache_path = import_cache_path(self.cache_directory, self.filepath)
+            cached = load_cached_import(cache_path, context.collection)
+            if cached is not None:
+                objects, active_object = cached
+                for obj in context.view_layer.objects:
+                    obj.select_set(obj in objects)
+                if active_object is not None:
+                    context.view_layer.objects.active = active_object
+                print(f"Product import cache hit: {cache_path}")
+                return {"FINISHED"}
+
         old_objs = set(context.scene.objects)
 
         # bpy.ops.import_scene.glb(filepath=self.filepath, directory='', use_manual_orientation=True, axis_forward='Y', axis_up='Z')
@@ -401,6 +432,15 @@ class ImportProductObject(Operator, ImportHelper):
 
                 obj.scale *= 0.1815 / max_dimension
 
+        if cache_path is not None:
+            active_object = context.view_layer.objects.active
+            write_cached_import(
+                cache_path,
+                imported_objs,
+                active_object if active_object in imported_objs else None,
+            )
+            evict_import_cache(self.cache_directory, self.cache_max_mb * 1024 * 1024)
+
         return {"FINISHED"}
 
 
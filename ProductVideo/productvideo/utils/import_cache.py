@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import os
+import time
+
+import bpy
+
+log = logging.getLogger(__name__)
+
+# Bump when the import normalization changes, so stale cache entries are ignored
+IMPORT_CACHE_VERSION = 1
+
+# Custom property marking the object that was active after the original import
+ACTIVE_OBJECT_PROPERTY = "productvideo_import_active"
+
+
+def import_cache_key(glb_file_path):
+    """Hash of the GLB contents, the Blender version and the cache format."""
+    digest = hashlib.sha256()
+    digest.update(f"{IMPORT_CACHE_VERSION}:{bpy.app.version_string}:".encode())
+    with open(glb_file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def import_cache_path(cache_directory, glb_file_path):
+    return os.path.join(cache_directory, f"{import_cache_key(glb_file_path)}.blend")
+
+
+def load_cached_import(cache_path, collection):
+    """
+    Appends the cached product objects into a collection.
+
+    Returns the appended objects and the one to make active, or None when the
+    cache entry is missing or unreadable.
+    """
+    if not os.path.isfile(cache_path):
+        return None
+
+    try:
+        with bpy.data.libraries.load(cache_path, link=False) as (data_from, data_to):
+            data_to.objects = list(data_from.objects)
+    except (OSError, RuntimeError) as e:
+        log.warning(f"Cannot load cached import {cache_path}: {e}")
+        return None
+
+    objects = [obj for obj in data_to.objects if obj is not None]
+    active_object = None
+    for obj in objects:
+        collection.objects.link(obj)
+        if obj.get(ACTIVE_OBJECT_PROPERTY):
+            active_object = obj
+            del obj[ACTIVE_OBJECT_PROPERTY]
+
+    # Mark the entry as recently used for LRU eviction
+    try:
+        os.utime(cache_path)
+    except OSError:
+        pass
+
+    return objects, active_object
+
+
+def write_cached_import(cache_path, objects, active_object):
+    """
+    Stores normalized product objects, with their meshes, materials and
+    images, as a .blend library.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    for image in _images_of(objects):
+        if image.source == "FILE" and image.packed_file is None and image.filepath:
+            try:
+                image.pack()
+            except RuntimeError as e:
+                log.warning(f"Cannot pack image {image.name}: {e}")
+
+    if active_object is not None:
+        active_object[ACTIVE_OBJECT_PROPERTY] = True
+
+    temp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        bpy.data.libraries.write(temp_path, set(objects), path_remap="ABSOLUTE")
+        os.replace(temp_path, cache_path)
+    except (OSError, RuntimeError) as e:
+        log.warning(f"Cannot write cached import {cache_path}: {e}")
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    finally:
+        if active_object is not None:
+            del active_object[ACTIVE_OBJECT_PROPERTY]
+
+
+def _images_of(objects):
+    """Images used by the materials of the objects."""
+    images = set()
+    for obj in objects:
+        for slot in obj.material_slots:
+            material = slot.material
+            if material is None or material.node_tree is None:
+                continue
+            for node in material.node_tree.nodes:
+                if node.type == "TEX_IMAGE" and node.image is not None:
+                    images.add(node.image)
+    return images
+
+
+def evict_import_cache(cache_directory, max_bytes):
+    """Removes the least recently used entries until the cache fits max_bytes."""
+    if max_bytes <= 0 or not os.path.isdir(cache_directory):
+        return
+
+    entries = []
+    for name in os.listdir(cache_directory):
+        path = os.path.join(cache_directory, name)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        if name.endswith(".tmp") and stat.st_mtime > time.time() - 3600:
+            continue  # still being written by another Blender process
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort()
+    total_bytes = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+        if total_bytes <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total_bytes -= size
+        except OSError:
+            continue
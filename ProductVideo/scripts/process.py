@@ -2,7 +2,10 @@
 
 import bpy
 import os
+import sys
 import json
+import time
+import traceback
 
 
 print("######## running invoke_images ##########")
@@ -52,7 +55,285 @@ def getSelfFilePath():
     return os.path.abspath(__file__)
 
 
-def image_render_process(glb_file_path,json_file_path, out_file_path):
+# Prefix of the machine-readable lines the backend picks out of Blender's stdout
+EVENT_PREFIX = "@@PRODUCTVIDEO"
+
+
+def emit_event(event, **payload):
+    """
+    Prints a single JSON event line for the backend and flushes stdout.
+
+    :param event: Name of the event
+    :param payload: Extra JSON serializable fields of the event
+    """
+    payload["event"] = event
+    print(f"{EVENT_PREFIX} {json.dumps(payload)}", flush=True)
+
+
+# Phase the current render is in and when it started, for phase_timing events
+_current_phase = {"name": None, "started_at": None}
+
+
+def peak_memory_bytes():
+    """
+    Peak resident memory of the Blender process so far.
+
+    :return: Bytes, or None where the platform cannot tell
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def enter_phase(phase):
+    """
+    Ends the current phase with a timing event and announces the next one.
+
+    :param phase: Name of the phase that starts now
+    """
+    end_phase()
+    _current_phase["name"] = phase
+    _current_phase["started_at"] = time.perf_counter()
+    emit_event("phase", phase=phase)
+
+
+def end_phase():
+    """
+    Reports the wall time and peak memory of the current phase, if any.
+    """
+    if _current_phase["name"] is None:
+        return
+
+    emit_event(
+        "phase_timing",
+        phase=_current_phase["name"],
+        seconds=round(time.perf_counter() - _current_phase["started_at"], 4),
+        peak_memory_bytes=peak_memory_bytes(),
+    )
+    _current_phase["name"] = None
+    _current_phase["started_at"] = None
+
+
+def make_frame_timing_handlers():
+    """
+    Builds render handlers that report how long every frame took.
+
+    The time from the frame change to render_pre is the scene evaluation of the
+    frame, the time from render_pre to render_post the render itself.
+
+    :return: A dict of handler list name to handler function
+    """
+    frame_times = {"changed_at": None, "render_started_at": None}
+
+    def on_frame_change(scene, *args):
+        frame_times["changed_at"] = time.perf_counter()
+
+    def on_render_pre(scene, *args):
+        frame_times["render_started_at"] = time.perf_counter()
+
+    def on_render_post(scene, *args):
+        render_started_at = frame_times["render_started_at"]
+        if render_started_at is None:
+            return
+
+        now = time.perf_counter()
+        changed_at = frame_times["changed_at"]
+        emit_event(
+            "frame_timing",
+            frame=scene.frame_current,
+            seconds=round(now - render_started_at, 4),
+            evaluation_seconds=(
+                round(render_started_at - changed_at, 4)
+                if changed_at is not None and changed_at <= render_started_at
+                else None
+            ),
+            peak_memory_bytes=peak_memory_bytes(),
+        )
+        frame_times["changed_at"] = None
+        frame_times["render_started_at"] = None
+
+    return {
+        "frame_change_pre": on_frame_change,
+        "render_pre": on_render_pre,
+        "render_post": on_render_post,
+    }
+
+
+def render_animation_with_frame_timing():
+    """
+    Renders the animation while reporting per-frame timing events.
+    """
+    handlers = make_frame_timing_handlers()
+    for name, handler in handlers.items():
+        getattr(bpy.app.handlers, name).append(handler)
+
+    try:
+        bpy.ops.render.render(animation=True, use_viewport=True)
+    finally:
+        for name, handler in handlers.items():
+            handler_list = getattr(bpy.app.handlers, name)
+            if handler in handler_list:
+                handler_list.remove(handler)
+
+
+def emit_scene_info(scene):
+    """
+    Reports the frame range and output settings the render will use.
+
+    :param scene: The scene about to be rendered
+    """
+    emit_event(
+        "scene_info",
+        frame_start=scene.frame_start,
+        frame_end=scene.frame_end,
+        frame_step=scene.frame_step,
+        fps=scene.render.fps / scene.render.fps_base,
+        resolution_x=scene.render.resolution_x,
+        resolution_y=scene.render.resolution_y,
+        resolution_percentage=scene.render.resolution_percentage,
+    )
+
+
+def configure_frame_shard(scene, frame_start, frame_end):
+    """
+    Restricts the render to a frame range written as a PNG image sequence.
+
+    Existing frames are skipped and frames in progress are claimed with empty
+    placeholder files, so several Blender processes can safely share a range.
+
+    :param scene: The scene about to be rendered
+    :param frame_start: First frame of the shard
+    :param frame_end: Last frame of the shard
+    """
+    scene.frame_start = frame_start
+    scene.frame_end = frame_end
+    scene.render.image_settings.file_format = "PNG"
+    scene.render.use_overwrite = False
+    scene.render.use_placeholder = True
+
+
+def apply_render_quality(scene, quality):
+    """
+    Lowers resolution, samples and frame rate for a preview quality tier.
+
+    Skipped frames are compensated by a lower frame rate, so a preview lasts
+    as long as the final video.
+
+    :param scene: The scene about to be rendered
+    :param quality: The QUALITY block of the composition JSON, None for final quality
+    """
+    if not quality or quality.get("TIER", "FINAL") == "FINAL":
+        return
+
+    if "RESOLUTION_PERCENTAGE" in quality:
+        scene.render.resolution_percentage = int(quality["RESOLUTION_PERCENTAGE"])
+
+    if "SAMPLES" in quality:
+        samples = int(quality["SAMPLES"])
+        if scene.render.engine == "CYCLES":
+            scene.cycles.samples = samples
+        else:
+            scene.eevee.taa_render_samples = samples
+
+    frame_step = int(quality.get("FRAME_STEP", 1))
+    if frame_step > 1:
+        scene.frame_step = frame_step
+        scene.render.fps = max(1, round(scene.render.fps / frame_step))
+
+
+def scene_info_process(json_file_path):
+    """
+    Reports the frame range and output settings of a composition without rendering.
+
+    :param json_file_path: The composition JSON file
+    """
+    productvideo_addon_properties = bpy.context.scene.productvideo_addon_properties
+
+    productvideo_addon_properties.JSON_IN_PATH = json_file_path
+
+    bpy.ops.productvideo.import_json_animation()
+
+    apply_render_quality(bpy.data.scenes["Scene"], (read_json_file(json_file_path) or {}).get("QUALITY"))
+
+    emit_scene_info(bpy.data.scenes["Scene"])
+
+
+def manifest_process(out_file_path):
+    """
+    Writes the actions, collections and materials of the open .blend file.
+
+    The backend checks compositions against this manifest before it starts
+    Blender for a render, so a preset that names a missing action or
+    collection fails at once instead of rendering without it.
+
+    :param out_file_path: Where to write the manifest JSON
+    """
+    try:
+        from productvideo.operators.selection import MOVEMENT_ACTION_MAP, VFX_COLLECTION_MAP
+        maps = {
+            "MOVEMENT_ACTION_MAP": MOVEMENT_ACTION_MAP,
+            "VFX_COLLECTION_MAP": VFX_COLLECTION_MAP,
+        }
+    except ImportError:
+        # Without the add-on only the contents of the file can be reported
+        maps = None
+
+    scene = bpy.data.scenes["Scene"]
+    manifest = {
+        "actions": {
+            action.name: [float(action.frame_range[0]), float(action.frame_range[1])]
+            for action in bpy.data.actions
+        },
+        "collections": sorted(collection.name for collection in bpy.data.collections),
+        "materials": sorted(material.name for material in bpy.data.materials),
+        "scene": {
+            "frame_start": scene.frame_start,
+            "frame_end": scene.frame_end,
+            "fps": scene.render.fps / scene.render.fps_base,
+        },
+        "maps": maps,
+    }
+
+    make_folder_for_file(out_file_path)
+    with open(out_file_path, "w") as manifest_file:
+        json.dump(manifest, manifest_file)
+
+    emit_event("manifest", path=out_file_path)
+
+
+def decimate_glb_process(glb_file_path, out_file_path, ratio):
+    """
+    Decimates every mesh of a GLB file and exports the result as a new GLB file.
+
+    :param glb_file_path: The GLB file to read, which is left untouched
+    :param out_file_path: Where to write the decimated GLB file
+    :param ratio: Share of the triangles to keep, between 0 and 1
+    """
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+
+    enter_phase("import_object")
+    bpy.ops.import_scene.gltf(filepath=glb_file_path)
+
+    enter_phase("decimate")
+    for obj in bpy.data.objects:
+        if obj.type != "MESH":
+            continue
+        modifier = obj.modifiers.new(name="ProductVideoDecimate", type="DECIMATE")
+        modifier.ratio = ratio
+
+    enter_phase("export_object")
+    bpy.ops.export_scene.gltf(filepath=out_file_path, export_format="GLB", export_apply=True)
+    end_phase()
+
+    emit_event("phase", phase="done")
+
+
+def image_render_process(glb_file_path,json_file_path, out_file_path, frame_start=None, frame_end=None, import_cache_dir=None, import_cache_max_mb=0):
     
     print(' --------- inside function ')
     
@@ -62,23 +343,112 @@ def image_render_process(glb_file_path,json_file_path, out_file_path):
 
     bpy.data.scenes["Scene"].render.filepath = out_file_path
     
-    bpy.ops.productvideo.import_json_animation()
-    
-    bpy.ops.object.import_productvideo_object(filepath=glb_file_path)
-    
-    bpy.ops.productvideo.apply_movement()
-    
-    bpy.ops.productvideo.apply_vfx_shot()
+    try:
+        enter_phase("import_animation")
+        bpy.ops.productvideo.import_json_animation()
+
+        enter_phase("import_object")
+        bpy.ops.object.import_productvideo_object(
+            filepath=glb_file_path,
+            cache_directory=import_cache_dir or "",
+            cache_max_mb=import_cache_max_mb or 0,
+        )
+
+        enter_phase("apply_movement")
+        bpy.ops.productvideo.apply_movement()
 
-    bpy.ops.render.render(animation=True, use_viewport=True)
+        enter_phase("apply_vfx")
+        bpy.ops.productvideo.apply_vfx_shot()
+
+        apply_render_quality(bpy.data.scenes["Scene"], (read_json_file(json_file_path) or {}).get("QUALITY"))
+
+        emit_scene_info(bpy.data.scenes["Scene"])
+
+        if frame_start is not None and frame_end is not None:
+            configure_frame_shard(bpy.data.scenes["Scene"], frame_start, frame_end)
+
+        enter_phase("render")
+        render_animation_with_frame_timing()
+    finally:
+        # A failed phase still reports how long it ran before failing
+        end_phase()
+
+    emit_event("phase", phase="done")
 
     file_store_path = glb_file_path.replace('.glb','.blend')
     
     # bpy.ops.wm.save_as_mainfile(filepath=file_store_path)
 
 
+def serve_process(blend_file_path, import_cache_dir=None, import_cache_max_mb=0):
+    """
+    Keeps Blender alive and renders jobs read from stdin, one JSON object per line.
+
+    Every job reloads the base .blend so it starts from the same clean scene,
+    but Blender start-up and add-on registration are paid only once.
+
+    Job lines look like:
+        {"command": "render", "job_id": "...", "glb_file_path": "...",
+         "json_file_path": "...", "out_file_path": "...", "blend_file_path": "...",
+         "frame_start": 1, "frame_end": 24}
+        {"command": "ping"}
+        {"command": "shutdown"}
+
+    :param blend_file_path: The base .blend file Blender was started with
+    :param import_cache_dir: Directory of cached product imports, None disables it
+    :param import_cache_max_mb: Size limit of the import cache in MB, 0 for none
+    """
+    scene_is_dirty = False
+
+    emit_event("ready", pid=os.getpid())
+
+    for raw_line in sys.stdin:
+        raw_line = raw_line.strip()
+        if not raw_line:
+            continue
+
+        try:
+            job = json.loads(raw_line)
+        except json.JSONDecodeError as e:
+            emit_event("job_done", job_id=None, status="FAILED", error=f"Invalid job line: {e}")
+            continue
+
+        command = job.get("command", "render")
+
+        if command == "ping":
+            emit_event("pong")
+            continue
+
+        if command == "shutdown":
+            break
+
+        job_id = job.get("job_id")
+        job_blend_file_path = job.get("blend_file_path") or blend_file_path
+
+        try:
+            if scene_is_dirty or job_blend_file_path != blend_file_path:
+                bpy.ops.wm.open_mainfile(filepath=job_blend_file_path, load_ui=False)
+            scene_is_dirty = True
+
+            image_render_process(
+                job["glb_file_path"],
+                job["json_file_path"],
+                job["out_file_path"],
+                frame_start=job.get("frame_start"),
+                frame_end=job.get("frame_end"),
+                import_cache_dir=import_cache_dir,
+                import_cache_max_mb=import_cache_max_mb,
+            )
+
+            emit_event("job_done", job_id=job_id, status="SUCCESS")
+        except Exception as e:
+            traceback.print_exc()
+            emit_event("job_done", job_id=job_id, status="FAILED", error=str(e))
+
+    print("######## worker shutting down ##########")
+
+
 def main():
-    import sys
     import argparse
 
     # asset_path = os.path.abspath('{}/BlenderNodes/Assets'.format(getTempDir()))
@@ -134,6 +504,41 @@ def main():
         required=False,
         help="image path out",
     )
+    parser.add_argument(
+        "--frame_start",
+        dest="frame_start",
+        type=int,
+        required=False,
+        help="first frame of a shard rendered as an image sequence",
+    )
+    parser.add_argument(
+        "--frame_end",
+        dest="frame_end",
+        type=int,
+        required=False,
+        help="last frame of a shard rendered as an image sequence",
+    )
+    parser.add_argument(
+        "--import_cache_dir",
+        dest="import_cache_dir",
+        required=False,
+        help="directory caching normalized product imports as .blend libraries",
+    )
+    parser.add_argument(
+        "--import_cache_max_mb",
+        dest="import_cache_max_mb",
+        type=int,
+        default=0,
+        required=False,
+        help="size limit of the import cache in MB, least recently used entries go first",
+    )
+    parser.add_argument(
+        "--decimate_ratio",
+        dest="decimate_ratio",
+        type=float,
+        required=False,
+        help="share of the triangles decimate_glb keeps",
+    )
     parser.add_argument(
         "-f",
         "--function",
@@ -166,7 +571,27 @@ def main():
 
 
     if args.function == "process":
-        image_render_process(args.glb_file_path,args.json_file_path, args.out_file_path)
+        image_render_process(
+            args.glb_file_path,
+            args.json_file_path,
+            args.out_file_path,
+            frame_start=args.frame_start,
+            frame_end=args.frame_end,
+            import_cache_dir=args.import_cache_dir,
+            import_cache_max_mb=args.import_cache_max_mb,
+        )
+
+    elif args.function == "decimate_glb":
+        decimate_glb_process(args.glb_file_path, args.out_file_path, args.decimate_ratio)
+
+    elif args.function == "scene_info":
+        scene_info_process(args.json_file_path)
+
+    elif args.function == "manifest":
+        manifest_process(args.out_file_path)
+
+    elif args.function == "serve":
+        serve_process(bpy.data.filepath, args.import_cache_dir, args.import_cache_max_mb)
 
 
 if __name__ == "__main__":